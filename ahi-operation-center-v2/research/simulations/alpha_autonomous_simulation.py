@@ -6,6 +6,8 @@ Restored from legacy archives.
 """
 from collections import deque
 
+import numpy as np
+
 
 class EntitySubstrate:
     def __init__(self):
@@ -24,3 +26,91 @@ class EntitySubstrate:
         self.noise_floor = max(0.0, (1.0 - self.integrity) * 0.5)
         self.degrees_of_freedom = int(self.base_degrees_of_freedom * effective)
         self.integrity_history.append(self.integrity)
+
+
+class SubstratePopulation:
+    """
+    N EntitySubstrate entities advanced together.
+
+    State lives in NumPy arrays (one element per entity) and every step
+    applies EntitySubstrate._update to all entities at once with the same
+    floating-point operations, so each entity matches its scalar twin.
+    integrity_history is a 2-D ring buffer (history x N) instead of N deques.
+    """
+
+    def __init__(self, n: int, integrity=1.0, capacity=10.0,
+                 base_degrees_of_freedom: int = 100, history: int = 100):
+        if n <= 0 or history <= 0:
+            raise ValueError("n and history must be > 0")
+        self.n = n
+        self.integrity = np.full(n, integrity, dtype=np.float64)
+        self.capacity = np.full(n, capacity, dtype=np.float64)
+        self.base_degrees_of_freedom = base_degrees_of_freedom
+        self.latency_ms = np.zeros(n, dtype=np.float64)
+        self.noise_floor = np.zeros(n, dtype=np.float64)
+        self.degrees_of_freedom = np.zeros(n, dtype=np.int64)
+
+        # Optimization: Row per step, so each step writes one contiguous row
+        self._history = np.zeros((history, n), dtype=np.float64)
+        self._cursor = 0
+        self.steps = 0
+        self._effective = np.empty(n, dtype=np.float64)
+
+    def step(self, integrity=None):
+        """
+        Advance every entity by one update.
+
+        Args:
+            integrity: Optional new integrity (scalar or length-N array) applied before the update
+        """
+        if integrity is not None:
+            self.integrity[:] = integrity
+
+        # Optimization: In-place ufuncs, no temporaries per step
+        effective = np.multiply(self.integrity, self.capacity, out=self._effective)
+        np.divide(10.0, np.maximum(effective, 0.1, out=self.latency_ms), out=self.latency_ms)
+        np.subtract(1.0, self.integrity, out=self.noise_floor)
+        np.multiply(self.noise_floor, 0.5, out=self.noise_floor)
+        np.maximum(self.noise_floor, 0.0, out=self.noise_floor)
+        # astype truncates toward zero, like int()
+        self.degrees_of_freedom[:] = (self.base_degrees_of_freedom * effective).astype(np.int64)
+
+        self._history[self._cursor] = self.integrity
+        self._cursor = (self._cursor + 1) % len(self._history)
+        self.steps += 1
+
+    def run(self, steps: int, integrity=None):
+        """
+        Advance all entities for several steps.
+
+        Args:
+            steps: Number of steps
+            integrity: Optional (steps, N) array of per-step integrity values
+        """
+        if integrity is not None and np.shape(integrity)[0] != steps:
+            raise ValueError("integrity must have one row per step")
+        for t in range(steps):
+            self.step(None if integrity is None else integrity[t])
+
+    def history(self) -> np.ndarray:
+        """Integrity history as a (min(steps, history), N) array, oldest row first."""
+        size = len(self._history)
+        if self.steps < size:
+            return self._history[:self.steps].copy()
+        return np.roll(self._history, -self._cursor, axis=0)
+
+    def integrity_history(self, i: int) -> np.ndarray:
+        """Chronological integrity history of entity i."""
+        return self.history()[:, i]
+
+    def entity(self, i: int) -> EntitySubstrate:
+        """Scalar EntitySubstrate snapshot of entity i."""
+        entity = EntitySubstrate()
+        entity.integrity = float(self.integrity[i])
+        entity.capacity = float(self.capacity[i])
+        entity.base_degrees_of_freedom = self.base_degrees_of_freedom
+        entity.latency_ms = float(self.latency_ms[i])
+        entity.noise_floor = float(self.noise_floor[i])
+        entity.degrees_of_freedom = int(self.degrees_of_freedom[i])
+        entity.integrity_history = deque(self.integrity_history(i).tolist(), maxlen=len(self._history))
+        return entity
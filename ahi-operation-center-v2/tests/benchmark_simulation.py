@@ -2,10 +2,13 @@ import time
 import sys
 import os
 
+import numpy as np
+
 # Add ahi-operation-center-v2 to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
-from research.simulations.alpha_autonomous_simulation import EntitySubstrate
+from research.simulations.alpha_autonomous_simulation import EntitySubstrate, SubstratePopulation
+
 
 def benchmark():
     entity = EntitySubstrate()
@@ -18,5 +21,21 @@ def benchmark():
     duration = end_time - start_time
     print(f"Time taken for 100,000 updates: {duration:.4f} seconds")
 
+
+def benchmark_population(n=10_000, steps=1_000):
+    population = SubstratePopulation(n)
+    integrity = np.linspace(1.0, 0.0, n)
+    start_time = time.perf_counter()
+
+    for _ in range(steps):
+        population.step(integrity)
+
+    duration = time.perf_counter() - start_time
+    entity_steps = n * steps
+    print(f"SubstratePopulation: {entity_steps:,} entity-steps ({n:,} x {steps:,}) in {duration:.4f} seconds "
+          f"({entity_steps / duration / 1e6:.1f}M entity-steps/s)")
+
+
 if __name__ == "__main__":
     benchmark()
+    benchmark_population()
@@ -0,0 +1,38 @@
+"""
+Tests for AHI Operation Center v2 - Vectorized substrate simulation
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add ahi-operation-center-v2 to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from research.simulations.alpha_autonomous_simulation import EntitySubstrate, SubstratePopulation  # noqa: E402
+
+
+class TestSubstratePopulation:
+    """Test suite for SubstratePopulation."""
+
+    @pytest.mark.parametrize("seed", [0, 1])
+    def test_population_matches_scalar(self, seed, n=50, steps=150):
+        """Every entity of the population matches its scalar twin exactly."""
+        rng = np.random.default_rng(seed)
+        integrity = rng.uniform(-0.2, 1.2, (steps, n))
+        population = SubstratePopulation(n)
+        entities = [EntitySubstrate() for _ in range(n)]
+
+        population.run(steps, integrity)
+        for t in range(steps):
+            for i, entity in enumerate(entities):
+                entity.integrity = float(integrity[t, i])
+                entity._update()
+
+        for i, entity in enumerate(entities):
+            twin = population.entity(i)
+            assert twin.latency_ms == entity.latency_ms
+            assert twin.noise_floor == entity.noise_floor
+            assert twin.degrees_of_freedom == entity.degrees_of_freedom
+            assert list(twin.integrity_history) == list(entity.integrity_history)
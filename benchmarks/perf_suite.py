@@ -0,0 +1,420 @@
+"""
+AHI Performance Suite
+Benchmarks for meba-core, sap-pilot-kit and the entity substrate
+
+Reúne en un solo script los micro-benchmarks de las rutas críticas
+(MEBACalculator, ICEWLogger y EntitySubstrate) a varios tamaños de
+datos, con estadísticas por operación, resultados en JSON y comparación
+contra una línea base guardada con tolerancia configurable.
+
+    python benchmarks/perf_suite.py
+    python benchmarks/perf_suite.py --quick -k icew
+    python benchmarks/perf_suite.py --json results.json
+    python benchmarks/perf_suite.py --compare benchmarks/baseline.json --tolerance 0.25
+
+The baseline is machine specific: regenerate it on the machine that runs
+the comparison with --json benchmarks/baseline.json.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import argparse
+import atexit
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Ensure we can import meba_core, sap_pilot_kit and the substrate simulation
+for path in (
+    os.path.join(ROOT, 'meba-core', 'src'),
+    os.path.join(ROOT, 'sap-pilot-kit', 'src'),
+    os.path.join(ROOT, 'ahi-operation-center-v2'),
+):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import numpy as np  # noqa: E402
+
+from meba_core.meba_metric import Interaction, MEBACalculator  # noqa: E402
+from research.simulations.alpha_autonomous_simulation import EntitySubstrate, SubstratePopulation  # noqa: E402
+from sap_pilot_kit.ice_w_logger import ICEWLogger  # noqa: E402
+
+RESULTS_VERSION = 1
+METRICS = ("min", "median", "mean")
+
+ARTIFACT_ID = "BENCH-001"
+SHA256 = "e3b0c44298fc1c149afbf4c8996fb924"
+
+
+class Case(NamedTuple):
+    """One benchmark at one data size."""
+    name: str                     # e.g. "icew.process_event[n=10000]"
+    group: str                    # e.g. "icew.process_event"
+    params: Dict[str, int]
+    items: int                    # Operations per timed round (stats are per operation)
+    setup: Callable[[], Any]      # Untimed; builds the state for one round
+    run: Callable[[Any], None]    # Timed; performs `items` operations on the state
+
+
+# group -> (parameter name, sizes, factory(size) -> (items, setup, run))
+BENCHMARKS: Dict[str, Tuple[str, Sequence[int], Callable]] = {}
+
+
+def benchmark(group: str, param: str, sizes: Sequence[int]):
+    """Register a benchmark factory, parametrized over data sizes (smallest first)."""
+    def register(factory):
+        BENCHMARKS[group] = (param, tuple(sizes), factory)
+        return factory
+    return register
+
+
+def collect(quick: bool = False, keyword: Optional[str] = None) -> List[Case]:
+    """
+    Expand the registered benchmarks into cases.
+
+    Args:
+        quick: Only the smallest data size of each benchmark
+        keyword: Keep cases whose name contains this substring
+    """
+    cases = []
+    for group, (param, sizes, factory) in BENCHMARKS.items():
+        for size in sizes[:1] if quick else sizes:
+            name = f"{group}[{param}={size}]"
+            if keyword and keyword not in name:
+                continue
+            items, setup, run = factory(size)
+            cases.append(Case(name, group, {param: size}, items, setup, run))
+    return cases
+
+
+# ---------------------------------------------------------------------------
+# Workloads
+# ---------------------------------------------------------------------------
+
+def generate_interactions(count: int, seed: int = 7) -> List[Interaction]:
+    rng = random.Random(seed)
+    return [Interaction(f"id-{k}", rng.uniform(-1.0, 1.0), rng.uniform(10.0, 300.0)) for k in range(count)]
+
+
+def generate_events(count: int, seed: int = 42) -> List[Dict[str, float]]:
+    """Stable traffic with mild noise and occasional instability bursts (as benchmark_icew.py)."""
+    rng = random.Random(seed)
+    events = []
+    for k in range(count):
+        base = 0.5 if (k // 500) % 10 == 9 else 0.95
+        events.append({
+            'semantic_stability': base + rng.uniform(-0.03, 0.03),
+            'output_stability': base + rng.uniform(-0.03, 0.03),
+            'constraint_compliance': min(1.0, base + rng.uniform(-0.03, 0.03)),
+            'decision_entropy': (1.0 - base) + rng.uniform(-0.03, 0.03)
+        })
+    return events
+
+
+def filled_logger(n: int) -> ICEWLogger:
+    """Logger holding n buffered telemetry records (no compaction)."""
+    logger = ICEWLogger(ARTIFACT_ID, SHA256)
+    logger.max_log_size = max(logger.max_log_size, n + 1)
+    logger.process_events(generate_events(n))
+    return logger
+
+
+@benchmark("meba.add_interaction", "n", (1_000, 10_000, 100_000))
+def bench_add_interaction(n):
+    interactions = generate_interactions(n)
+
+    def run(calc):
+        add = calc.add_interaction
+        for interaction in interactions:
+            add(interaction)
+    return n, MEBACalculator, run
+
+
+@benchmark("meba.calculate_score", "n", (1_000, 10_000, 100_000))
+def bench_calculate_score(n):
+    # n is the number of interactions already ingested; calls per round are fixed
+    calc = MEBACalculator()
+    for interaction in generate_interactions(n):
+        calc.add_interaction(interaction)
+    calls = 1_000
+
+    def run(calc):
+        score = calc.calculate_score
+        for _ in range(calls):
+            score()
+    return calls, lambda: calc, run
+
+
+@benchmark("icew.process_event", "n", (1_000, 10_000, 100_000))
+def bench_process_event(n):
+    events = generate_events(n)
+
+    def setup():
+        logger = ICEWLogger(ARTIFACT_ID, SHA256)
+        logger.max_log_size = max(logger.max_log_size, n + 1)
+        return logger
+
+    def run(logger):
+        process = logger.process_event
+        for metrics in events:
+            process(metrics)
+    return n, setup, run
+
+
+@benchmark("icew.process_events", "n", (1_000, 10_000, 100_000))
+def bench_process_events(n):
+    # Same workload as icew.process_event, ingested in one batch call
+    events = generate_events(n)
+    setup = bench_process_event(n)[1]
+    return n, setup, lambda logger: logger.process_events(events)
+
+
+@benchmark("icew.compact_logs", "log", (1_000, 10_000, 100_000))
+def bench_compact_logs(n):
+    # Each round compacts a fresh copy of a logger holding n records
+    snapshot = filled_logger(n).snapshot()
+    return 1, lambda: ICEWLogger.restore(snapshot), ICEWLogger._compact_logs
+
+
+@benchmark("icew.export_telemetry", "log", (1_000, 10_000, 100_000))
+def bench_export_telemetry(n):
+    logger = filled_logger(n)
+    fd, path = tempfile.mkstemp(prefix="ahi-bench-", suffix=".json")
+    os.close(fd)
+    atexit.register(os.remove, path)
+
+    def run(logger):
+        logger.export_telemetry(path)
+    return n, lambda: logger, run
+
+
+@benchmark("substrate.update", "steps", (10_000, 100_000))
+def bench_substrate_update(steps):
+    def run(entity):
+        update = entity._update
+        for _ in range(steps):
+            update()
+    return steps, EntitySubstrate, run
+
+
+@benchmark("substrate.population_step", "n", (1_000, 10_000))
+def bench_population_step(n):
+    steps = 100
+    integrity = np.linspace(1.0, 0.0, n)
+
+    def run(population):
+        for _ in range(steps):
+            population.step(integrity)
+    return n * steps, lambda: SubstratePopulation(n), run
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def time_case(case: Case, min_rounds: int = 5, max_time: float = 1.0, max_rounds: int = 1000) -> Dict[str, float]:
+    """
+    Time a case over several rounds, after one untimed warm-up round.
+
+    Rounds continue until at least min_rounds ran and max_time seconds
+    (setup included) elapsed. As with timeit, the garbage collector is
+    disabled while a round is timed.
+
+    Returns:
+        Per-operation statistics in nanoseconds
+    """
+    case.run(case.setup())
+    timings = []
+    perf = time.perf_counter_ns
+    gc_enabled = gc.isenabled()
+    deadline = time.perf_counter() + max_time
+    try:
+        while len(timings) < min_rounds or (time.perf_counter() < deadline and len(timings) < max_rounds):
+            state = case.setup()
+            gc.collect()
+            gc.disable()
+            start = perf()
+            case.run(state)
+            elapsed = perf() - start
+            if gc_enabled:
+                gc.enable()
+            timings.append(elapsed / case.items)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    mean = statistics.fmean(timings)
+    return {
+        "min": min(timings),
+        "max": max(timings),
+        "mean": mean,
+        "median": statistics.median(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": len(timings),
+        "ops": 1e9 / mean if mean else 0.0,
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(cases: Sequence[Case], min_rounds: int = 5, max_time: float = 1.0,
+              progress: Optional[Callable[[Dict], None]] = None) -> Dict[str, Any]:
+    """
+    Run every case and build the JSON results document.
+
+    Returns:
+        {"version", "datetime", "commit", "machine_info", "unit", "benchmarks": [...]}
+    """
+    benchmarks = []
+    for case in cases:
+        row = {
+            "name": case.name,
+            "group": case.group,
+            "params": case.params,
+            "items": case.items,
+            "stats": time_case(case, min_rounds=min_rounds, max_time=max_time),
+        }
+        benchmarks.append(row)
+        if progress is not None:
+            progress(row)
+    return {
+        "version": RESULTS_VERSION,
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "commit": _commit(),
+        "machine_info": machine_info(),
+        "unit": "ns/op",
+        "benchmarks": benchmarks,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25,
+            metric: str = "min") -> List[Dict[str, Any]]:
+    """
+    Compare results against a baseline results document.
+
+    A benchmark regresses when its metric exceeds the baseline by more
+    than `tolerance` (0.25 = 25% slower) and improves when it is faster by
+    the same margin. Baseline entries that were not run are ignored.
+
+    Returns:
+        One row per benchmark: name, baseline, current, ratio and status
+        ("ok", "regression", "improved" or "new")
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+    if tolerance < 0:
+        raise ValueError("tolerance must be >= 0")
+
+    reference = {row["name"]: row["stats"][metric] for row in baseline.get("benchmarks", [])}
+    rows = []
+    for row in results["benchmarks"]:
+        current = row["stats"][metric]
+        base = reference.get(row["name"])
+        if base is None:
+            rows.append({"name": row["name"], "baseline": None, "current": current, "ratio": None, "status": "new"})
+            continue
+        ratio = current / base if base else float("inf")
+        if ratio > 1.0 + tolerance:
+            status = "regression"
+        elif ratio < 1.0 / (1.0 + tolerance):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": row["name"], "baseline": base, "current": current, "ratio": ratio, "status": status})
+    return rows
+
+
+def _format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3f} {unit}"
+    return f"{ns:.1f} ns"
+
+
+def _print_row(row: Dict):
+    stats = row["stats"]
+    print(f"{row['name']:<48} {_format_ns(stats['min']):>12} {_format_ns(stats['median']):>12} "
+          f"{_format_ns(stats['mean']):>12} {stats['rounds']:>7}", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("-k", dest="keyword", help="Only run benchmarks whose name contains this substring")
+    parser.add_argument("--quick", action="store_true", help="Only the smallest data size of each benchmark")
+    parser.add_argument("--min-rounds", type=int, default=5)
+    parser.add_argument("--max-time", type=float, default=1.0, help="Seconds per benchmark after min rounds")
+    parser.add_argument("--json", dest="json_path", help="Write the results document to this file")
+    parser.add_argument("--compare", dest="baseline_path", help="Baseline results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before a regression is reported (0.25 = 25%%)")
+    parser.add_argument("--metric", choices=METRICS, default="min", help="Statistic used for comparison")
+    args = parser.parse_args(argv)
+
+    cases = collect(quick=args.quick, keyword=args.keyword)
+    if not cases:
+        print("No benchmarks selected")
+        return 1
+
+    print(f"{'benchmark (per op)':<48} {'min':>12} {'median':>12} {'mean':>12} {'rounds':>7}")
+    results = run_suite(cases, min_rounds=max(1, args.min_rounds), max_time=args.max_time, progress=_print_row)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nResults written to {args.json_path}")
+
+    if not args.baseline_path:
+        return 0
+
+    with open(args.baseline_path) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, tolerance=args.tolerance, metric=args.metric)
+    print(f"\nComparison against {args.baseline_path} ({args.metric}, tolerance {args.tolerance:.0%})")
+    for row in rows:
+        if row["baseline"] is None:
+            print(f"{row['name']:<48} {'':>12} {_format_ns(row['current']):>12} {'':>8}  new")
+        else:
+            print(f"{row['name']:<48} {_format_ns(row['baseline']):>12} {_format_ns(row['current']):>12} "
+                  f"{row['ratio']:>7.2f}x  {row['status']}")
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 """
 Benchmark script for MEBA Core performance optimization.
 Compares the current optimized implementation against a legacy O(4N) implementation.
+The maintained, size-parametrized suite is benchmarks/perf_suite.py.
 """
 
 import time
@@ -113,28 +114,29 @@ def run_benchmark():
     start_time = time.time()
     for _ in range(10):
         current_calc.calculate_score()
-        # Note: current implementation caches results, so subsequent calls are O(1).
-        # To strictly compare the aggregation logic vs iterative logic (assuming cache miss),
-        # we should ideally invalidate cache or just measure the first call.
-        # But 'calculate_score' usage pattern *benefits* from caching.
-        # However, let's force cache invalidation to compare the LOOP performance fairly?
-        # No, let's compare the "system" performance as it is used.
     current_duration = time.time() - start_time
-    print(f"Current (O(N) + Cache) Time: {current_duration:.4f}s")
+    print(f"Current (O(1) Incremental) Time: {current_duration:.4f}s")
 
-    # Measure Current with Cache Invalidation (fairer comparison of loop speed)
+    # Measure Current rebuilding its aggregates from the raw interactions on
+    # every call (the work the legacy implementation repeats per score)
     start_time = time.time()
     for _ in range(10):
-        current_calc._aggregates_cache = None # Force recalculation
-        current_calc.calculate_score()
-    current_uncached_duration = time.time() - start_time
-    print(f"Current (O(N) Uncached) Time: {current_uncached_duration:.4f}s")
+        rebuilt = MEBACalculator(retention="none")
+        for i in interactions:
+            rebuilt.add_interaction(i)
+        rebuilt.calculate_score()
+    current_rebuild_duration = time.time() - start_time
+    print(f"Current (O(N) Rebuild) Time: {current_rebuild_duration:.4f}s")
+
+    assert rebuilt.calculate_score() == current_calc.calculate_score()
 
-    speedup = legacy_duration / current_uncached_duration
-    print(f"\nSpeedup (Uncached Loop vs Legacy): {speedup:.2f}x")
+    speedup = legacy_duration / current_rebuild_duration
+    print(f"\nSpeedup (Rebuild vs Legacy): {speedup:.2f}x")
 
     speedup_real = legacy_duration / current_duration
-    print(f"Speedup (Real-world with Cache): {speedup_real:.2f}x")
+    print(f"Speedup (Real-world Incremental): {speedup_real:.2f}x")
+    print("\nSee benchmarks/perf_suite.py for the full suite and baseline comparison.")
+
 
 if __name__ == "__main__":
     run_benchmark()
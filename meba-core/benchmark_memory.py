@@ -0,0 +1,67 @@
+"""
+Memory benchmark for MEBACalculator retention policies.
+Feeds a sustained stream of interactions and reports traced memory per policy.
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Ensure we can import meba_core
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+
+from meba_core.meba_metric import MEBACalculator, Interaction  # noqa: E402
+
+POLICIES = [
+    ("all", 0),
+    ("none", 0),
+    ("last", 1000),
+    ("reservoir", 1000),
+]
+
+
+def measure(retention: str, size: int, count: int, checkpoints: int = 4):
+    """
+    Stream `count` interactions into a calculator and sample memory as it grows.
+
+    Returns:
+        (traced bytes at each checkpoint, elapsed seconds, final score)
+    """
+    rng = random.Random(7)
+    samples = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    calc = MEBACalculator(retention=retention, retention_size=size, seed=1)
+    step = count // checkpoints
+    for k in range(count):
+        calc.add_interaction(Interaction(f"id-{k}", rng.uniform(-1.0, 1.0), rng.uniform(10.0, 300.0)))
+        if (k + 1) % step == 0:
+            samples.append(tracemalloc.get_traced_memory()[0])
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return samples, elapsed, calc.calculate_score()
+
+
+def run_benchmark():
+    count = 400_000
+    print(f"Streaming {count} interactions per policy (memory sampled every {count // 4})\n")
+    print(f"{'policy':<16} {'memory growth (MiB)':<36} {'time':>8}")
+
+    reference = None
+    for retention, size in POLICIES:
+        samples, elapsed, score = measure(retention, size, count)
+        label = f"{retention}({size})" if size else retention
+        growth = " -> ".join(f"{b / 2**20:6.2f}" for b in samples)
+        print(f"{label:<16} {growth:<36} {elapsed:7.2f}s")
+
+        if reference is None:
+            reference = score
+        assert score == reference, f"{label} changed the score"
+
+    print("\nScores identical across policies:", reference["meba_cert"])
+
+
+if __name__ == "__main__":
+    run_benchmark()
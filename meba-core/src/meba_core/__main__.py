@@ -0,0 +1,15 @@
+"""
+MEBA Core: `python -m meba_core` runs the command line interface.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
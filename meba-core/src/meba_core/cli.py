@@ -0,0 +1,81 @@
+"""
+MEBA Core: Command line interface
+Score interaction exports without writing Python.
+
+    meba-core interactions.csv
+    meba-core export.ndjson --processes 8 --chunk-mb 16 --mmap
+
+The file is streamed in newline-aligned chunks that are parsed into
+columns and folded into MEBA aggregates, so memory stays constant
+regardless of file size.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from .meba_metric import MEBACalculator
+from .parallel import reduce_file
+from .reader import FORMATS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="meba-core",
+        description="Compute the MEBA_Cert score of an interaction export (CSV, TSV or NDJSON).",
+    )
+    parser.add_argument("path", help="Interaction file with sentiment_score and duration_seconds fields")
+    parser.add_argument("--format", choices=FORMATS, default=None, dest="fmt",
+                        help="File format (default: inferred from the suffix)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes; 0 = one per CPU (default: 1, in-process)")
+    parser.add_argument("--chunk-mb", type=float, default=8.0,
+                        help="Size of each parsed chunk in MiB (default: 8)")
+    parser.add_argument("--mmap", action="store_true", help="Read chunks through a memory map")
+    parser.add_argument("--ripn-max", type=float, default=10.0, help="RIPN normalization maximum")
+    parser.add_argument("--frn-penalty-weight", type=float, default=1.2, help="FRN penalty weight")
+    parser.add_argument("--state", action="store_true", help="Also print the merged aggregates")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of the `meba-core` console script.
+
+    Returns:
+        Process exit code (0 on success, 1 on unreadable input)
+    """
+    args = build_parser().parse_args(argv)
+    if args.chunk_mb <= 0:
+        print("meba-core: --chunk-mb must be > 0", file=sys.stderr)
+        return 1
+
+    try:
+        state = reduce_file(
+            args.path,
+            processes=None if args.processes == 0 else args.processes,
+            chunk_bytes=max(1, int(args.chunk_mb * 1024 * 1024)),
+            fmt=args.fmt,
+            use_mmap=args.mmap,
+        )
+    except (OSError, ValueError) as e:
+        print(f"meba-core: {e}", file=sys.stderr)
+        return 1
+
+    calc = MEBACalculator.from_state(state, ripn_max=args.ripn_max, frn_penalty_weight=args.frn_penalty_weight)
+    result = calc.calculate_score()
+    if args.state:
+        result["state"] = state.to_dict()
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,9 +12,17 @@ Author: AHI 3.0
 License: MIT
 """
 
+import math
+import random
+import struct
 import sys
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .sketch import DEFAULT_K, KLLSketch
 
 # Optimize Interaction class with slots if supported
 dataclass_kwargs = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -28,16 +36,117 @@ class Interaction:
     user_feedback: str = "neutral"  # positive, negative, neutral
 
 
+@dataclass(**dataclass_kwargs)
+class MEBAState:
+    """
+    Mergeable MEBA aggregate state.
+
+    The aggregates are plain sums, so merge() is associative and
+    commutative: partial states computed on disjoint shards of the data
+    (threads, processes, machines) reduce to the same result in any order.
+
+    interaction_count counts every interaction, neutral ones included.
+    States built without it (e.g. by engines that only track the scoring
+    aggregates) default to pos_count + neg_count.
+    """
+    pos_count: int = 0
+    neg_count: int = 0
+    neg_time: float = 0.0
+    total_time: float = 0.0
+    interaction_count: Optional[int] = None
+
+    _STRUCT = struct.Struct("<QQddQ")
+    _STRUCT_V1 = struct.Struct("<QQdd")   # Encoding without interaction_count
+
+    def __post_init__(self):
+        if self.interaction_count is None:
+            self.interaction_count = self.pos_count + self.neg_count
+
+    def merge(self, other: "MEBAState") -> "MEBAState":
+        """Return the combined state of self and other."""
+        return MEBAState(
+            self.pos_count + other.pos_count,
+            self.neg_count + other.neg_count,
+            self.neg_time + other.neg_time,
+            self.total_time + other.total_time,
+            self.interaction_count + other.interaction_count,
+        )
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float]) -> "MEBAState":
+        count = data.get("interaction_count")
+        return cls(int(data["pos_count"]), int(data["neg_count"]),
+                   float(data["neg_time"]), float(data["total_time"]),
+                   None if count is None else int(count))
+
+    def to_bytes(self) -> bytes:
+        """Compact 40-byte little-endian encoding."""
+        return self._STRUCT.pack(self.pos_count, self.neg_count, self.neg_time, self.total_time,
+                                 self.interaction_count)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MEBAState":
+        """Decode to_bytes() output (also accepts the older 32-byte encoding)."""
+        if len(data) == cls._STRUCT_V1.size:
+            return cls(*cls._STRUCT_V1.unpack(data))
+        return cls(*cls._STRUCT.unpack(data))
+
+
+# Raw Interaction retention policies (scoring only uses the aggregates)
+RETENTION_POLICIES = ("all", "none", "last", "reservoir")
+
+
 class MEBACalculator:
-    def __init__(self, ripn_max: float = 10.0, frn_penalty_weight: float = 1.2):
+    def __init__(self, ripn_max: float = 10.0, frn_penalty_weight: float = 1.2,
+                 retention: str = "all", retention_size: int = 0, seed: Optional[int] = None,
+                 distribution: bool = False, sketch_k: int = DEFAULT_K):
         """
         Args:
             ripn_max: Theoretical maximum for normalization (default 10.0 for standard scale)
             frn_penalty_weight: Weighting factor for Negative Retention (Adjustment)
+            retention: Which raw Interactions to keep in self.interactions:
+                "all" (default), "none", "last" (the most recent retention_size)
+                or "reservoir" (uniform sample of retention_size, for audits)
+            retention_size: N for "last", K for "reservoir"
+            seed: Seed for the reservoir sampler (reproducible audits)
+            distribution: Maintain quantile sketches of negative interactions
+                (duration and sentiment) and report them under "distribution"
+            sketch_k: KLL accuracy/memory parameter (rank error ~ 1.7 / k)
         """
+        if retention not in RETENTION_POLICIES:
+            raise ValueError(f"retention must be one of {RETENTION_POLICIES}, got {retention!r}")
+        if retention in ("last", "reservoir") and retention_size <= 0:
+            raise ValueError(f"retention={retention!r} requires retention_size > 0")
+
         self.ripn_max = ripn_max
         self.frn_penalty_weight = frn_penalty_weight
-        self.interactions: List[Interaction] = []
+        self.retention = retention
+        self.retention_size = retention_size
+        self.interaction_count = 0
+
+        # Optimization: Bounded policies keep memory flat under sustained load
+        self._retain: Optional[Callable[[Interaction], None]]
+        if retention == "last":
+            self.interactions = deque(maxlen=retention_size)
+            self._retain = self.interactions.append
+        else:
+            self.interactions: List[Interaction] = []
+            self._retain = {
+                "all": self.interactions.append,
+                "none": None,
+                "reservoir": self._retain_sample,
+            }[retention]
+
+        # Reservoir sampling state (Algorithm L: O(K log(N/K)) random draws)
+        self._rng = random.Random(seed)
+        self._reservoir_seen = 0
+        self._reservoir_w = 1.0
+        self._reservoir_next = retention_size - 1
+        if retention == "reservoir":
+            self._advance_reservoir()
 
         # Optimization: Incremental aggregates (O(1))
         self._pos_count = 0
@@ -45,8 +154,61 @@ class MEBACalculator:
         self._neg_time = 0.0
         self._total_time = 0.0
 
+        # Optional bounded-memory distributions of negative interactions
+        self._neg_duration_sketch: Optional[KLLSketch] = None
+        self._neg_sentiment_sketch: Optional[KLLSketch] = None
+        if distribution:
+            self._neg_duration_sketch = KLLSketch(sketch_k, seed=seed)
+            self._neg_sentiment_sketch = KLLSketch(sketch_k, seed=None if seed is None else seed + 1)
+
+    def _uniform(self) -> float:
+        """Uniform draw in the open interval (0, 1)."""
+        u = self._rng.random()
+        while u == 0.0:
+            u = self._rng.random()
+        return u
+
+    def _advance_reservoir(self):
+        """Schedule the index of the next interaction that enters the reservoir."""
+        self._reservoir_w *= math.exp(math.log(self._uniform()) / self.retention_size)
+        skip = math.floor(math.log(self._uniform()) / math.log1p(-self._reservoir_w))
+        self._reservoir_next += skip + 1
+
+    def _retain_sample(self, interaction: Interaction):
+        index = self._reservoir_seen
+        self._reservoir_seen = index + 1
+        if index < self.retention_size:
+            self.interactions.append(interaction)
+        elif index == self._reservoir_next:
+            self.interactions[self._rng.randrange(self.retention_size)] = interaction
+            self._advance_reservoir()
+
+    def _retain_range(self, n: int, make: Callable[[int], Interaction]):
+        """
+        Apply the retention policy to n interactions built on demand by make(j).
+
+        Optimization: Only the interactions that are actually kept are built.
+        """
+        if self.retention == "all":
+            self.interactions.extend(map(make, range(n)))
+        elif self.retention == "last":
+            self.interactions.extend(map(make, range(max(0, n - self.retention_size), n)))
+        elif self.retention == "reservoir":
+            k = self.retention_size
+            seen = self._reservoir_seen
+            for j in range(min(n, max(0, k - seen))):
+                self.interactions.append(make(j))
+            end = seen + n
+            while self._reservoir_next < end:
+                self.interactions[self._rng.randrange(k)] = make(self._reservoir_next - seen)
+                self._advance_reservoir()
+            self._reservoir_seen = end
+
     def add_interaction(self, interaction: Interaction):
-        self.interactions.append(interaction)
+        self.interaction_count += 1
+        retain = self._retain
+        if retain is not None:
+            retain(interaction)
 
         # Incremental update
         d = interaction.duration_seconds
@@ -58,6 +220,186 @@ class MEBACalculator:
         elif s < -0.1:
             self._neg_count += 1
             self._neg_time += d
+            if self._neg_duration_sketch is not None:
+                self._neg_duration_sketch.update(d)
+                self._neg_sentiment_sketch.update(s)
+
+    def add_interactions_array(self, sentiment, duration, ids: Optional[Sequence[str]] = None,
+                               retain: bool = True):
+        """
+        Bulk-ingest interactions from columns (NumPy arrays or sequences).
+
+        Optimization: Aggregates are updated with vectorized reductions
+        (O(N) in C, no per-interaction Python objects when retain=False).
+        Uses the same thresholds as add_interaction: sentiment > 0.1 is
+        positive, sentiment < -0.1 is negative.
+
+        Note: Time totals are summed pairwise by NumPy, so they may differ
+        from one-by-one ingestion in the last floating-point digits.
+
+        Args:
+            sentiment: 1-D sentiment scores in [-1.0, 1.0]
+            duration: 1-D durations in seconds, same length as sentiment
+            ids: Optional interaction ids (only used when retain=True);
+                defaults to the running interaction index as a string
+            retain: Also offer Interaction objects to the retention policy
+        """
+        s = np.asarray(sentiment, dtype=np.float64)
+        d = np.asarray(duration, dtype=np.float64)
+        if s.ndim != 1 or s.shape != d.shape:
+            raise ValueError(
+                f"sentiment and duration must be 1-D arrays of equal length, got {s.shape} and {d.shape}"
+            )
+        if ids is not None and len(ids) != len(s):
+            raise ValueError("ids must have the same length as sentiment")
+
+        neg_mask = s < -0.1
+        self._pos_count += int(np.count_nonzero(s > 0.1))
+        self._neg_count += int(np.count_nonzero(neg_mask))
+        self._neg_time += float(d[neg_mask].sum())
+        self._total_time += float(d.sum())
+        if self._neg_duration_sketch is not None:
+            self._neg_duration_sketch.update_array(d[neg_mask])
+            self._neg_sentiment_sketch.update_array(s[neg_mask])
+
+        start = self.interaction_count
+        self.interaction_count += len(s)
+        if retain and self._retain is not None:
+            s_list = s.tolist()
+            d_list = d.tolist()
+            if ids is None:
+                def make(j):
+                    return Interaction(str(start + j), s_list[j], d_list[j])
+            else:
+                def make(j):
+                    return Interaction(ids[j], s_list[j], d_list[j])
+            self._retain_range(len(s), make)
+
+    def get_state(self) -> MEBAState:
+        """Snapshot of the aggregates as a mergeable MEBAState."""
+        return MEBAState(self._pos_count, self._neg_count, self._neg_time, self._total_time,
+                         self.interaction_count)
+
+    def _merge_aggregates(self, state: MEBAState):
+        self._pos_count += state.pos_count
+        self._neg_count += state.neg_count
+        self._neg_time += state.neg_time
+        self._total_time += state.total_time
+        self.interaction_count += state.interaction_count
+
+    def merge_state(self, state: MEBAState):
+        """
+        Fold a partial MEBAState (e.g. from another worker) into this calculator.
+
+        Raises:
+            ValueError: This calculator keeps distribution sketches and the
+                state has negative interactions, which a MEBAState cannot
+                carry (use merge() with the other calculator instead)
+        """
+        if self._neg_duration_sketch is not None and state.neg_count:
+            raise ValueError("A MEBAState has no distribution sketches; merge the calculator instead")
+        self._merge_aggregates(state)
+
+    def merge(self, other: "MEBACalculator"):
+        """
+        Fold another calculator's aggregates and retained interactions into this one.
+
+        Distribution sketches are merged. With "reservoir" retention the
+        two samples are combined by a weighted merge (each side in
+        proportion to the interactions it has seen), so the result is a
+        uniform sample of the combined stream; other policies pass the
+        other calculator's retained interactions through their own policy.
+
+        Raises:
+            ValueError: This calculator keeps distribution sketches and the
+                other has negative interactions but no sketches, or this one
+                keeps a reservoir and the other's retained interactions are
+                not a large enough uniform sample of what it has seen
+        """
+        if self._neg_duration_sketch is not None and other._neg_duration_sketch is None and other._neg_count:
+            raise ValueError("Cannot merge a calculator without distribution sketches into one with them")
+        if self.retention == "reservoir":
+            sample, seen = other._uniform_sample()
+            if len(sample) < min(self.retention_size, seen):
+                raise ValueError(
+                    f"Cannot merge {other.retention!r} retention into a reservoir: "
+                    f"{len(sample)} retained interactions do not represent {seen} seen"
+                )
+
+        self._merge_aggregates(other.get_state())
+        if self._neg_duration_sketch is not None and other._neg_duration_sketch is not None:
+            self._neg_duration_sketch.merge(other._neg_duration_sketch)
+            self._neg_sentiment_sketch.merge(other._neg_sentiment_sketch)
+        if self.retention == "reservoir":
+            self._merge_reservoir(sample, seen)
+        elif self._retain is not None:
+            retained = list(other.interactions)
+            self._retain_range(len(retained), retained.__getitem__)
+
+    def _uniform_sample(self) -> Tuple[List[Interaction], int]:
+        """
+        Retained interactions as (uniform sample, number of interactions it stands for).
+
+        A reservoir stands for every interaction offered to it; other
+        policies only for what they still hold (a complete "all"/"last"
+        buffer is a sample of itself, a truncated one is not uniform).
+        """
+        sample = list(self.interactions)
+        if self.retention == "reservoir":
+            return sample, self._reservoir_seen
+        if self.retention == "all" or len(sample) == self.interaction_count:
+            return sample, len(sample)
+        return [], self.interaction_count
+
+    def _merge_reservoir(self, sample: List[Interaction], seen: int):
+        """
+        Combine this reservoir with a uniform sample standing for `seen` interactions.
+
+        Slots are filled one at a time from either side with probability
+        proportional to the interactions that side still represents
+        (sampling without replacement from the combined stream), then
+        Algorithm L is restarted for the combined count.
+        """
+        k = self.retention_size
+        n1, n2 = self._reservoir_seen, seen
+        if n1 + n2 <= k:
+            # Both sides are complete; the pending skip drawn at start-up stays valid
+            self.interactions.extend(sample)
+        else:
+            rng = self._rng
+            left = rng.sample(self.interactions, len(self.interactions))
+            right = rng.sample(sample, len(sample))
+            merged = []
+            i = j = 0
+            r1, r2 = n1, n2
+            for _ in range(k):
+                if rng.random() * (r1 + r2) < r1:
+                    merged.append(left[i])
+                    i += 1
+                    r1 -= 1
+                else:
+                    merged.append(right[j])
+                    j += 1
+                    r2 -= 1
+            self.interactions[:] = merged
+            # After n items the Algorithm L threshold W is the k-th smallest of n uniform keys
+            self._reservoir_w = rng.betavariate(k, n1 + n2 - k + 1)
+            skip = math.floor(math.log(self._uniform()) / math.log1p(-self._reservoir_w))
+            self._reservoir_next = n1 + n2 + skip
+        self._reservoir_seen = n1 + n2
+
+    @classmethod
+    def from_state(cls, state: MEBAState, **kwargs) -> "MEBACalculator":
+        """
+        Create a calculator (without retained interactions) from a MEBAState.
+
+        Raises:
+            ValueError: distribution=True with a state that has negative
+                interactions (see merge_state)
+        """
+        calc = cls(**kwargs)
+        calc.merge_state(state)
+        return calc
 
     def _calculate_aggregates(self) -> Tuple[int, int, float, float]:
         """
@@ -120,7 +462,7 @@ class MEBACalculator:
         # Clamp between -1.0 and 1.0 as per official documentation
         meba_cert = max(-1.0, min(1.0, meba_raw))
 
-        return {
+        result = {
             "meba_cert": round(meba_cert, 4),
             "components": {
                 "ripn": round(ripn, 4),
@@ -129,6 +471,24 @@ class MEBACalculator:
                 "ripn_max": self.ripn_max
             }
         }
+        if self._neg_duration_sketch is not None:
+            result["distribution"] = self.calculate_distribution()
+        return result
+
+    def calculate_distribution(self) -> Dict[str, Dict[str, float]]:
+        """
+        Approximate p50/p95/p99 of negative interactions (requires distribution=True).
+
+        Returns:
+            {"negative_duration": {...}, "negative_sentiment": {...}}, each
+            with p50, p95, p99 (None when there are no negatives) and count
+        """
+        if self._neg_duration_sketch is None:
+            raise ValueError("Distribution sketches are disabled; use MEBACalculator(distribution=True)")
+        return {
+            "negative_duration": self._neg_duration_sketch.summary(),
+            "negative_sentiment": self._neg_sentiment_sketch.summary(),
+        }
 
 
 # Example Usage
@@ -0,0 +1,110 @@
+"""
+MEBA Core: Parallel scoring
+Score large interaction files (CSV, TSV, NDJSON) across a process pool.
+
+Each worker parses a newline-aligned byte range of the file into
+columns, reduces it to a MEBAState, and the partial states are merged
+in the parent. Because MEBAState.merge is associative, the result does
+not depend on how the file was split.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Dict, List, Optional
+
+from .meba_metric import MEBACalculator, MEBAState
+from .reader import (
+    DEFAULT_CHUNK_BYTES,
+    Layout,
+    parse_chunk,
+    read_layout,
+    read_range,
+    split_ranges,
+)
+
+
+def _reduce_chunk(data: bytes, layout: Layout) -> MEBAState:
+    sentiment, duration = parse_chunk(data, layout)
+    calc = MEBACalculator(retention="none")
+    calc.add_interactions_array(sentiment, duration, retain=False)
+    return calc.get_state()
+
+
+def score_range(path: str, start: int, end: int, layout: Layout, use_mmap: bool = False) -> MEBAState:
+    """Reduce one byte range of an interaction export to its partial MEBAState."""
+    return _reduce_chunk(read_range(path, start, end, use_mmap), layout)
+
+
+def _reduce_mapped(path: str, ranges, layout: Layout) -> List[MEBAState]:
+    """Sequential reduction over one read-only mapping of the whole file."""
+    if not ranges:
+        return []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return [_reduce_chunk(mapped[start:end], layout) for start, end in ranges]
+
+
+def reduce_file(path: str, processes: Optional[int] = None,
+                chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                fmt: Optional[str] = None, use_mmap: bool = False) -> MEBAState:
+    """
+    Compute the MEBAState of an interaction file.
+
+    Memory is bounded by chunk_bytes per worker: only one parsed range
+    per process is alive at a time, whatever the file size.
+
+    Args:
+        path: CSV/TSV/NDJSON file with sentiment_score and duration_seconds fields
+        processes: Worker processes (None = os.cpu_count(); 0 or 1 = in-process)
+        chunk_bytes: Target size of each parsed range
+        fmt: "csv", "tsv" or "ndjson" (None = infer from the suffix)
+        use_mmap: Read ranges through a read-only memory map
+
+    Returns:
+        Merged MEBAState of the whole file
+    """
+    layout = read_layout(path, fmt)
+    ranges = split_ranges(path, layout.data_offset, chunk_bytes)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes <= 1 or len(ranges) <= 1:
+        if use_mmap:
+            partials = _reduce_mapped(path, ranges, layout)
+        else:
+            partials = [score_range(path, start, end, layout) for start, end in ranges]
+    else:
+        n = len(ranges)
+        with ProcessPoolExecutor(max_workers=min(processes, n)) as pool:
+            partials = list(pool.map(
+                score_range,
+                [path] * n,
+                [r[0] for r in ranges],
+                [r[1] for r in ranges],
+                [layout] * n,
+                [use_mmap] * n,
+            ))
+
+    return reduce(MEBAState.merge, partials, MEBAState())
+
+
+def score_file(path: str, processes: Optional[int] = None,
+               chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+               ripn_max: float = 10.0, frn_penalty_weight: float = 1.2,
+               fmt: Optional[str] = None, use_mmap: bool = False) -> Dict[str, float]:
+    """
+    Score an interaction file in parallel.
+
+    Returns:
+        The same dict as MEBACalculator.calculate_score()
+    """
+    state = reduce_file(path, processes=processes, chunk_bytes=chunk_bytes, fmt=fmt, use_mmap=use_mmap)
+    calc = MEBACalculator.from_state(state, ripn_max=ripn_max, frn_penalty_weight=frn_penalty_weight)
+    return calc.calculate_score()
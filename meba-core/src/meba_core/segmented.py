@@ -0,0 +1,230 @@
+"""
+MEBA Core: Segmented MEBA
+Group-by MEBA_Cert for many segments (tenant / model / cohort) at once.
+
+The four MEBA aggregates of every segment live in parallel NumPy arrays
+indexed by a segment slot, so ingestion is a vectorized scatter-add and
+scoring all segments is a handful of array operations, with no Python
+object per segment beyond its key.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from .meba_metric import MEBACalculator, MEBAState
+
+
+class SegmentedMEBA:
+    """
+    MEBA aggregates for many segments in array-backed tables.
+
+    Usage:
+        seg = SegmentedMEBA()
+        seg.add_arrays(tenant_ids, sentiment, duration)
+        table = seg.score_table()   # columns for every segment
+    """
+
+    def __init__(self, ripn_max: float = 10.0, frn_penalty_weight: float = 1.2, capacity: int = 1024):
+        """
+        Args:
+            ripn_max: Theoretical maximum for normalization
+            frn_penalty_weight: Weighting factor for Negative Retention
+            capacity: Initial number of segment slots (grows by doubling)
+        """
+        self.ripn_max = ripn_max
+        self.frn_penalty_weight = frn_penalty_weight
+
+        self._index: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        capacity = max(1, capacity)
+        self._pos = np.zeros(capacity, dtype=np.int64)
+        self._neg = np.zeros(capacity, dtype=np.int64)
+        self._neg_time = np.zeros(capacity, dtype=np.float64)
+        self._total_time = np.zeros(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    @property
+    def keys(self) -> List[Hashable]:
+        """Segment keys in slot order (the row order of score_table())."""
+        return list(self._keys)
+
+    def _reserve(self, n: int):
+        capacity = len(self._pos)
+        if n <= capacity:
+            return
+        while capacity < n:
+            capacity *= 2
+        for name in ("_pos", "_neg", "_neg_time", "_total_time"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def _slot(self, key) -> int:
+        slot = self._index.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            self._reserve(slot + 1)
+            self._index[key] = slot
+            self._keys.append(key)
+        return slot
+
+    def _slots(self, keys) -> np.ndarray:
+        """
+        Map a column of keys to slots.
+
+        Optimization: Only distinct keys go through the segment index. A
+        NumPy array of numbers or strings is factorized with np.unique;
+        anything else (lists, object arrays, tuple keys) with one dict
+        pass, so mixed keys such as 1 and '1' are never coerced to a
+        common dtype and each slot keeps the caller's own key object.
+        """
+        if isinstance(keys, np.ndarray) and keys.ndim == 1 and keys.dtype.kind in "biuUS":
+            uniques, codes = np.unique(keys, return_inverse=True)
+            distinct = uniques.tolist()
+        else:
+            codes_of: Dict[Hashable, int] = {}
+            codes = np.fromiter((codes_of.setdefault(k, len(codes_of)) for k in keys),
+                                dtype=np.int64, count=len(keys))
+            distinct = list(codes_of)
+        unique_slots = np.fromiter((self._slot(k) for k in distinct), dtype=np.int64, count=len(distinct))
+        return unique_slots[codes.ravel()]
+
+    def add(self, key, sentiment: float, duration: float):
+        """Add one interaction to a segment."""
+        slot = self._slot(key)
+        self._total_time[slot] += duration
+        if sentiment > 0.1:
+            self._pos[slot] += 1
+        elif sentiment < -0.1:
+            self._neg[slot] += 1
+            self._neg_time[slot] += duration
+
+    def add_arrays(self, keys, sentiment, duration):
+        """
+        Bulk-ingest (segment_key, sentiment, duration) columns.
+
+        Uses the same thresholds as MEBACalculator: sentiment > 0.1 is
+        positive, sentiment < -0.1 is negative.
+
+        Args:
+            keys: 1-D segment keys (any hashables, e.g. ints, strings or tuples)
+            sentiment: 1-D sentiment scores, same length as keys
+            duration: 1-D durations in seconds, same length as keys
+        """
+        s = np.asarray(sentiment, dtype=np.float64)
+        d = np.asarray(duration, dtype=np.float64)
+        if s.ndim != 1 or s.shape != d.shape or len(keys) != len(s):
+            raise ValueError("keys, sentiment and duration must be 1-D arrays of equal length")
+        if len(s) == 0:
+            return
+
+        slots = self._slots(keys)
+        n = len(self._keys)
+        pos = s > 0.1
+        neg = s < -0.1
+        # Optimization: One bincount per aggregate instead of a Python loop per row
+        self._pos[:n] += np.bincount(slots[pos], minlength=n)
+        self._neg[:n] += np.bincount(slots[neg], minlength=n)
+        self._neg_time[:n] += np.bincount(slots[neg], weights=d[neg], minlength=n)
+        self._total_time[:n] += np.bincount(slots, weights=d, minlength=n)
+
+    def get_state(self, key) -> MEBAState:
+        """Aggregates of one segment as a MEBAState."""
+        slot = self._index[key]
+        return MEBAState(int(self._pos[slot]), int(self._neg[slot]),
+                         float(self._neg_time[slot]), float(self._total_time[slot]))
+
+    def merge_state(self, key, state: MEBAState):
+        """Fold a partial MEBAState into one segment."""
+        slot = self._slot(key)
+        self._pos[slot] += state.pos_count
+        self._neg[slot] += state.neg_count
+        self._neg_time[slot] += state.neg_time
+        self._total_time[slot] += state.total_time
+
+    def merge(self, other: "SegmentedMEBA"):
+        """Fold every segment of another engine into this one."""
+        n = len(other)
+        if n == 0:
+            return
+        slots = np.fromiter((self._slot(k) for k in other._keys), dtype=np.int64, count=n)
+        np.add.at(self._pos, slots, other._pos[:n])
+        np.add.at(self._neg, slots, other._neg[:n])
+        np.add.at(self._neg_time, slots, other._neg_time[:n])
+        np.add.at(self._total_time, slots, other._total_time[:n])
+
+    def calculate_score(self, key) -> Dict[str, float]:
+        """MEBA result for one segment, identical to MEBACalculator.calculate_score()."""
+        calc = MEBACalculator.from_state(
+            self.get_state(key), ripn_max=self.ripn_max, frn_penalty_weight=self.frn_penalty_weight
+        )
+        return calc.calculate_score()
+
+    def score_table(self) -> Dict[str, np.ndarray]:
+        """
+        MEBA_Cert and components for every segment in one vectorized pass.
+
+        Same formula and clamping as MEBACalculator.calculate_score();
+        rounding uses np.round, which may differ from Python's round()
+        in the last decimal for exact ties.
+
+        Returns:
+            Dict of columns aligned with `keys`: keys, meba_cert, ripn,
+            frn, frn_adjusted, pos_count, neg_count
+        """
+        n = len(self._keys)
+        pos = self._pos[:n]
+        neg = self._neg[:n]
+        neg_time = self._neg_time[:n]
+        total_time = self._total_time[:n]
+
+        # RIPN = Positive / Negative (Positive count when there are no negatives)
+        ripn = pos.astype(np.float64)
+        has_neg = neg > 0
+        np.divide(pos, neg, out=ripn, where=has_neg)
+
+        # FRN = Negative Time / Total Time (0 when there is no time)
+        frn = np.zeros(n, dtype=np.float64)
+        np.divide(neg_time, total_time, out=frn, where=total_time != 0)
+        frn_adjusted = frn * self.frn_penalty_weight
+
+        meba_cert = np.clip((ripn - frn_adjusted) / self.ripn_max, -1.0, 1.0)
+
+        key_column = np.empty(n, dtype=object)
+        key_column[:] = self._keys
+
+        return {
+            "keys": key_column,
+            "meba_cert": np.round(meba_cert, 4),
+            "ripn": np.round(ripn, 4),
+            "frn": np.round(frn, 4),
+            "frn_adjusted": np.round(frn_adjusted, 4),
+            "pos_count": pos.copy(),
+            "neg_count": neg.copy(),
+        }
+
+    def calculate_scores(self, keys: Optional[Sequence[Hashable]] = None) -> Dict[Hashable, float]:
+        """
+        MEBA_Cert per segment as a plain dict.
+
+        Args:
+            keys: Optional subset of segments (default: all)
+        """
+        table = self.score_table()
+        scores = dict(zip(self._keys, table["meba_cert"].tolist()))
+        if keys is None:
+            return scores
+        return {k: scores[k] for k in keys}
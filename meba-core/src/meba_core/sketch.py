@@ -0,0 +1,196 @@
+"""
+MEBA Core: Quantile sketches
+Mergeable streaming quantile sketch (KLL) with bounded memory.
+
+A KLL sketch keeps a stack of compactors. Level h holds items that each
+stand for 2**h observations; when the sketch is full, the lowest level
+over its capacity is sorted and every other item (random offset) is
+promoted to the next level. Lower levels get geometrically smaller
+capacities, so memory is O(k) items and
+the rank error is about 1.7 / k with high probability, independent of
+the stream length.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import math
+import random
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_K = 200
+
+# Quantiles reported in MEBA results
+REPORTED_QUANTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+class KLLSketch:
+    """
+    Streaming quantile sketch.
+
+    Usage:
+        sketch = KLLSketch()
+        sketch.update_array(durations)
+        p95 = sketch.quantile(0.95)
+    """
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = None):
+        """
+        Args:
+            k: Accuracy/memory parameter (rank error ~ 1.7 / k)
+            seed: Seed for the compaction coin flips
+        """
+        if k < 8:
+            raise ValueError("k must be >= 8")
+        self.k = k
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels: List[List[float]] = [[]]
+        self._size = 0
+        self._refresh_capacities()
+        self._rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _refresh_capacities(self):
+        depth = len(self._levels)
+        self._capacities = [
+            max(2, int(math.ceil(self.k * (2 / 3) ** (depth - 1 - h)))) for h in range(depth)
+        ]
+        self._max_size = sum(self._capacities)
+
+    def _compact(self, h: int):
+        """Sort level h and promote every other item (random offset) to level h + 1."""
+        if h + 1 == len(self._levels):
+            self._levels.append([])
+            self._refresh_capacities()
+        items = sorted(self._levels[h])
+        # An odd item out stays at this level so total weight is conserved
+        keep = [items.pop()] if len(items) % 2 else []
+        self._levels[h + 1].extend(items[self._rng.getrandbits(1)::2])
+        self._levels[h] = keep
+        self._size -= len(items) // 2
+
+    def _compress(self):
+        """
+        Compact until the sketch fits its total capacity.
+
+        Optimization: Lazy compaction lets level 0 absorb updates until
+        the whole sketch is full, instead of compacting each level as
+        soon as it reaches its own (small) capacity.
+        """
+        while self._size >= self._max_size:
+            for h, level in enumerate(self._levels):
+                if len(level) >= self._capacities[h]:
+                    self._compact(h)
+                    break
+
+    def update(self, value: float):
+        """Add one observation."""
+        self._levels[0].append(value)
+        self.n += 1
+        self._size += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update_array(self, values):
+        """Add a batch of observations (NumPy array or sequence)."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self._size += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._levels[0].extend(values.tolist())
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch into this one (in place) and return self."""
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge sketches with k={self.k} and k={other.k}")
+        if other.n == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        self._refresh_capacities()
+        for h, level in enumerate(other._levels):
+            self._levels[h].extend(level)
+        self._size += other._size
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    @property
+    def retained(self) -> int:
+        """Number of stored items (the memory footprint)."""
+        return self._size
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """
+        Approximate quantiles; q=0 and q=1 return the exact min and max.
+
+        Returns:
+            One value per q (NaN for an empty sketch)
+        """
+        if self.n == 0:
+            return [math.nan] * len(qs)
+        values = np.concatenate([np.asarray(level, dtype=np.float64) for level in self._levels])
+        weights = np.concatenate([np.full(len(level), 1 << h, dtype=np.int64)
+                                  for h, level in enumerate(self._levels)])
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        cumulative = np.cumsum(weights[order])
+
+        result = []
+        for q in qs:
+            if not 0.0 <= q <= 1.0:
+                raise ValueError(f"quantile must be in [0, 1], got {q}")
+            if q == 0.0:
+                result.append(self.min)
+            elif q == 1.0:
+                result.append(self.max)
+            else:
+                idx = int(np.searchsorted(cumulative, q * self.n, side="left"))
+                result.append(float(values[min(idx, len(values) - 1)]))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile."""
+        return self.quantiles([q])[0]
+
+    def summary(self) -> Dict[str, float]:
+        """p50/p95/p99 rounded like the other MEBA components (None if empty), plus the count."""
+        values = self.quantiles([q for _, q in REPORTED_QUANTILES])
+        result = {name: round(v, 4) if self.n else None for (name, _), v in zip(REPORTED_QUANTILES, values)}
+        result["count"] = self.n
+        return result
+
+    def to_dict(self) -> Dict:
+        return {"k": self.k, "n": self.n, "min": self.min, "max": self.max,
+                "levels": [list(level) for level in self._levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict, seed: Optional[int] = None) -> "KLLSketch":
+        sketch = cls(k=data["k"], seed=seed)
+        sketch.n = data["n"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch._levels = [list(level) for level in data["levels"]] or [[]]
+        sketch._size = sum(len(level) for level in sketch._levels)
+        sketch._refresh_capacities()
+        return sketch
@@ -0,0 +1,232 @@
+"""
+MEBA Core: Windowed MEBA
+Sliding-window MEBA_Cert ("last 1h / 24h / 7d") with O(1) eviction.
+
+Interactions are folded into a ring of fixed-width time buckets (e.g.
+one per minute). Running totals over the ring are updated on insert and
+on bucket expiry, so adding or expiring data never rescans anything and
+memory is bounded by the number of buckets.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+from .meba_metric import MEBACalculator, MEBAState
+
+# Named windows for production dashboards (seconds)
+DEFAULT_WINDOWS = {"1h": 3600, "24h": 86400, "7d": 7 * 86400}
+
+# Empty ring slot; cannot be a bucket index (negative timestamps give negative buckets)
+_EMPTY = int(np.iinfo(np.int64).min)
+
+
+class WindowedMEBACalculator:
+    """
+    MEBA_Cert over the most recent `window_seconds` of interactions.
+
+    The window is approximated at bucket granularity: a bucket is evicted
+    as a whole once it falls completely outside the window.
+    """
+
+    def __init__(self, window_seconds: float = 3600, bucket_seconds: float = 60,
+                 ripn_max: float = 10.0, frn_penalty_weight: float = 1.2):
+        """
+        Args:
+            window_seconds: Length of the sliding window
+            bucket_seconds: Width of each ring bucket (resolution of eviction)
+            ripn_max: Theoretical maximum for normalization
+            frn_penalty_weight: Weighting factor for Negative Retention
+        """
+        if window_seconds <= 0 or bucket_seconds <= 0:
+            raise ValueError("window_seconds and bucket_seconds must be > 0")
+
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.ripn_max = ripn_max
+        self.frn_penalty_weight = frn_penalty_weight
+        self.n_buckets = max(1, math.ceil(window_seconds / bucket_seconds))
+
+        n = self.n_buckets
+        self._bucket_id = np.full(n, _EMPTY, dtype=np.int64)
+        self._pos = np.zeros(n, dtype=np.int64)
+        self._neg = np.zeros(n, dtype=np.int64)
+        self._neg_time = np.zeros(n, dtype=np.float64)
+        self._total_time = np.zeros(n, dtype=np.float64)
+        self._head: Optional[int] = None
+        self._live_buckets = 0
+
+        # Running totals over live buckets (O(1) scoring)
+        self._pos_count = 0
+        self._neg_count = 0
+        self._neg_time_sum = 0.0
+        self._total_time_sum = 0.0
+
+    def _bucket_of(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _evict(self, slot: int):
+        if self._bucket_id[slot] == _EMPTY:
+            return
+        self._pos_count -= int(self._pos[slot])
+        self._neg_count -= int(self._neg[slot])
+        self._neg_time_sum -= float(self._neg_time[slot])
+        self._total_time_sum -= float(self._total_time[slot])
+        self._bucket_id[slot] = _EMPTY
+        self._live_buckets -= 1
+        self._pos[slot] = 0
+        self._neg[slot] = 0
+        self._neg_time[slot] = 0.0
+        self._total_time[slot] = 0.0
+
+    def _advance(self, bucket: int):
+        """Move the head to bucket, evicting buckets that left the window."""
+        head = self._head
+        if head is not None and bucket <= head:
+            return
+        n = self.n_buckets
+        if head is None or bucket - head >= n:
+            for slot in np.flatnonzero(self._bucket_id != _EMPTY).tolist():
+                self._evict(slot)
+        else:
+            # Optimization: each bucket is evicted once, so expiry is O(1) amortized per interaction
+            for b in range(head + 1, bucket + 1):
+                self._evict(b % n)
+        self._head = bucket
+
+        if self._live_buckets == 0:
+            # Drop float residue left by subtracting evicted buckets
+            self._neg_time_sum = 0.0
+            self._total_time_sum = 0.0
+
+    def advance_to(self, timestamp: float):
+        """Expire everything older than the window ending at timestamp."""
+        self._advance(self._bucket_of(timestamp))
+
+    def add(self, timestamp: float, sentiment: float, duration: float) -> bool:
+        """
+        Add one interaction (O(1) amortized).
+
+        Returns:
+            False if the interaction is older than the window and was ignored
+        """
+        bucket = self._bucket_of(timestamp)
+        self._advance(bucket)
+        if bucket <= self._head - self.n_buckets:
+            return False
+
+        slot = bucket % self.n_buckets
+        if self._bucket_id[slot] == _EMPTY:
+            self._bucket_id[slot] = bucket
+            self._live_buckets += 1
+        self._total_time[slot] += duration
+        self._total_time_sum += duration
+        if sentiment > 0.1:
+            self._pos[slot] += 1
+            self._pos_count += 1
+        elif sentiment < -0.1:
+            self._neg[slot] += 1
+            self._neg_count += 1
+            self._neg_time[slot] += duration
+            self._neg_time_sum += duration
+        return True
+
+    def add_arrays(self, timestamps, sentiment, duration) -> int:
+        """
+        Vectorized bulk add; timestamps need not be sorted.
+
+        Returns:
+            Number of interactions accepted (inside the window)
+        """
+        ts = np.asarray(timestamps, dtype=np.float64)
+        s = np.asarray(sentiment, dtype=np.float64)
+        d = np.asarray(duration, dtype=np.float64)
+        if not (ts.shape == s.shape == d.shape) or ts.ndim != 1:
+            raise ValueError("timestamps, sentiment and duration must be 1-D and equal length")
+        if len(ts) == 0:
+            return 0
+
+        buckets = np.floor_divide(ts, self.bucket_seconds).astype(np.int64)
+        self._advance(int(buckets.max()))
+        live = buckets > self._head - self.n_buckets
+        buckets, s, d = buckets[live], s[live], d[live]
+
+        slots = buckets % self.n_buckets
+        pos = s > 0.1
+        neg = s < -0.1
+        n = self.n_buckets
+        touched = np.unique(slots)
+        self._live_buckets += int(np.count_nonzero(self._bucket_id[touched] == _EMPTY))
+        self._bucket_id[slots] = buckets
+        self._pos += np.bincount(slots[pos], minlength=n)
+        self._neg += np.bincount(slots[neg], minlength=n)
+        self._neg_time += np.bincount(slots[neg], weights=d[neg], minlength=n)
+        self._total_time += np.bincount(slots, weights=d, minlength=n)
+
+        self._pos_count += int(np.count_nonzero(pos))
+        self._neg_count += int(np.count_nonzero(neg))
+        self._neg_time_sum += float(d[neg].sum())
+        self._total_time_sum += float(d.sum())
+        return int(np.count_nonzero(live))
+
+    def get_state(self) -> MEBAState:
+        """Aggregates of the current window as a MEBAState."""
+        return MEBAState(self._pos_count, self._neg_count,
+                         max(0.0, self._neg_time_sum), max(0.0, self._total_time_sum))
+
+    def calculate_score(self, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        MEBA_Cert for the current window.
+
+        Args:
+            now: Optional current time; expires buckets older than the window first
+
+        Returns:
+            Same dict as MEBACalculator.calculate_score()
+        """
+        if now is not None:
+            self.advance_to(now)
+        calc = MEBACalculator.from_state(
+            self.get_state(), ripn_max=self.ripn_max, frn_penalty_weight=self.frn_penalty_weight
+        )
+        return calc.calculate_score()
+
+
+class MultiWindowMEBA:
+    """
+    Several sliding windows fed from one stream, e.g. 1h / 24h / 7d.
+
+    Each window keeps its own bounded ring; an interaction costs O(1) per window.
+    """
+
+    def __init__(self, windows: Optional[Dict[str, float]] = None, bucket_seconds: float = 60, **kwargs):
+        """
+        Args:
+            windows: {name: window_seconds}; defaults to DEFAULT_WINDOWS
+            bucket_seconds: Ring bucket width shared by all windows
+            **kwargs: ripn_max / frn_penalty_weight for every window
+        """
+        windows = DEFAULT_WINDOWS if windows is None else windows
+        self.windows = {
+            name: WindowedMEBACalculator(seconds, bucket_seconds, **kwargs)
+            for name, seconds in windows.items()
+        }
+
+    def add(self, timestamp: float, sentiment: float, duration: float):
+        for window in self.windows.values():
+            window.add(timestamp, sentiment, duration)
+
+    def add_arrays(self, timestamps, sentiment, duration):
+        for window in self.windows.values():
+            window.add_arrays(timestamps, sentiment, duration)
+
+    def calculate_scores(self, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """MEBA result for every window, keyed by window name."""
+        return {name: window.calculate_score(now) for name, window in self.windows.items()}
@@ -0,0 +1,113 @@
+"""
+Tests for MEBA Core - Command line interface and NDJSON reading
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from meba_core.cli import main
+from meba_core.meba_metric import MEBACalculator
+from meba_core.parallel import reduce_file
+
+
+def _columns(n=3000, seed=6):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1.0, 1.0, n).round(6), rng.uniform(10.0, 300.0, n).round(3)
+
+
+def _write_ndjson(path, sentiment, duration):
+    with open(path, "w") as f:
+        for i, (s, d) in enumerate(zip(sentiment.tolist(), duration.tolist())):
+            f.write(json.dumps({"id": f"id-{i}", "sentiment": s, "duration_seconds": d}) + "\n")
+        f.write("\n")
+
+
+def _write_csv(path, sentiment, duration, delimiter=","):
+    with open(path, "w") as f:
+        f.write(delimiter.join(["id", "sentiment_score", "duration_seconds"]) + "\n")
+        for i, (s, d) in enumerate(zip(sentiment.tolist(), duration.tolist())):
+            f.write(delimiter.join([f"id-{i}", str(s), str(d)]) + "\n")
+
+
+def _expected(sentiment, duration):
+    calc = MEBACalculator()
+    calc.add_interactions_array(sentiment, duration, retain=False)
+    return calc
+
+
+class TestReaderFormats:
+    """Test suite for format-aware chunked reading."""
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_ndjson_matches_columns(self, tmp_path, processes, use_mmap):
+        sentiment, duration = _columns()
+        path = str(tmp_path / "export.ndjson")
+        _write_ndjson(path, sentiment, duration)
+
+        state = reduce_file(path, processes=processes, chunk_bytes=4096, use_mmap=use_mmap)
+        expected = _expected(sentiment, duration)
+
+        assert (state.pos_count, state.neg_count) == (expected._pos_count, expected._neg_count)
+        assert state.total_time == pytest.approx(expected._total_time, rel=1e-12)
+
+    def test_explicit_tsv_format(self, tmp_path):
+        """--format overrides the suffix."""
+        sentiment, duration = _columns(n=100)
+        path = str(tmp_path / "export.txt")
+        _write_csv(path, sentiment, duration, delimiter="\t")
+
+        state = reduce_file(path, processes=1, fmt="tsv")
+        assert state.pos_count == _expected(sentiment, duration)._pos_count
+
+    def test_quoted_csv(self, tmp_path, capsys):
+        """Quoted numbers and quoted ids containing the delimiter are parsed."""
+        sentiment, duration = _columns(n=500)
+        path = tmp_path / "quoted.csv"
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+            writer.writerow(["id", "sentiment_score", "duration_seconds", "note"])
+            for i, (s, d) in enumerate(zip(sentiment.tolist(), duration.tolist())):
+                writer.writerow([f"user {i}, session {i % 7}", s, d, 'said "ok", left'])
+
+        state = reduce_file(str(path), processes=1, chunk_bytes=4096)
+        expected = _expected(sentiment, duration)
+        assert (state.pos_count, state.neg_count) == (expected._pos_count, expected._neg_count)
+        assert state.total_time == pytest.approx(expected._total_time, rel=1e-12)
+
+        assert main([str(path)]) == 0
+        assert json.loads(capsys.readouterr().out)["meba_cert"] == expected.calculate_score()["meba_cert"]
+
+    def test_empty_file_with_mmap(self, tmp_path):
+        path = tmp_path / "empty.ndjson"
+        path.write_text("")
+        assert reduce_file(str(path), processes=1, use_mmap=True).total_time == 0.0
+
+
+class TestCLI:
+    """Test suite for the meba-core console script."""
+
+    def test_prints_score(self, tmp_path, capsys):
+        sentiment, duration = _columns()
+        path = str(tmp_path / "interactions.csv")
+        _write_csv(path, sentiment, duration)
+
+        assert main([path, "--chunk-mb", "0.01", "--mmap", "--state"]) == 0
+        output = json.loads(capsys.readouterr().out)
+
+        expected = _expected(sentiment, duration)
+        assert output["meba_cert"] == expected.calculate_score()["meba_cert"]
+        assert output["state"]["pos_count"] == expected._pos_count
+
+    def test_missing_file(self, tmp_path, capsys):
+        assert main([str(tmp_path / "nope.csv")]) == 1
+        assert "meba-core:" in capsys.readouterr().err
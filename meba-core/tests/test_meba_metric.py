@@ -8,6 +8,9 @@ Author: AHI 3.0
 License: MIT
 """
 
+import numpy as np
+import pytest
+
 from meba_core.meba_metric import MEBACalculator, Interaction
 
 
@@ -125,6 +128,149 @@ class TestMEBACalculator:
         assert "meba_cert" in result
 
 
+class TestBulkIngestion:
+    """Test suite for MEBACalculator.add_interactions_array."""
+
+    def _columns(self, n=10_000, seed=11):
+        rng = np.random.default_rng(seed)
+        sentiment = rng.uniform(-1.0, 1.0, n)
+        # Include values exactly on the thresholds
+        sentiment[:4] = [0.1, -0.1, 0.1000001, -0.1000001]
+        duration = rng.uniform(10.0, 300.0, n)
+        return sentiment, duration
+
+    def test_matches_scalar_ingestion(self):
+        """Vectorized aggregates equal one-by-one ingestion."""
+        sentiment, duration = self._columns()
+
+        scalar = MEBACalculator()
+        for i, (s, d) in enumerate(zip(sentiment.tolist(), duration.tolist())):
+            scalar.add_interaction(Interaction(str(i), s, d))
+
+        bulk = MEBACalculator()
+        bulk.add_interactions_array(sentiment, duration)
+
+        assert bulk._pos_count == scalar._pos_count
+        assert bulk._neg_count == scalar._neg_count
+        assert bulk._neg_time == pytest.approx(scalar._neg_time, rel=1e-12)
+        assert bulk._total_time == pytest.approx(scalar._total_time, rel=1e-12)
+        assert bulk.calculate_score() == scalar.calculate_score()
+
+    def test_retained_objects(self):
+        """retain=True keeps Interaction objects with generated or given ids."""
+        calc = MEBACalculator()
+        calc.add_interaction(Interaction("a", 0.5, 10))
+        calc.add_interactions_array([0.8, -0.5], [60, 30])
+        calc.add_interactions_array([0.2], [5], ids=["custom"])
+
+        assert [i.id for i in calc.interactions] == ["a", "1", "2", "custom"]
+        assert calc.interactions[2].sentiment_score == -0.5
+        assert calc.interactions[2].duration_seconds == 30.0
+
+    def test_no_retention(self):
+        """retain=False updates aggregates without storing objects."""
+        calc = MEBACalculator()
+        calc.add_interactions_array([0.8, 0.9, -0.5], [120, 60, 30], retain=False)
+
+        assert len(calc.interactions) == 0
+        assert calc.calculate_ripn() == 2.0
+        assert calc.calculate_frn() == pytest.approx(30 / 210)
+
+    def test_shape_validation(self):
+        """Mismatched columns are rejected."""
+        calc = MEBACalculator()
+        with pytest.raises(ValueError):
+            calc.add_interactions_array([0.1, 0.2], [1.0])
+        with pytest.raises(ValueError):
+            calc.add_interactions_array([0.5], [1.0], ids=["a", "b"])
+
+
+class TestRetentionPolicy:
+    """Test suite for bounded raw-interaction retention."""
+
+    @staticmethod
+    def _feed(calc, n=1000):
+        for i in range(n):
+            calc.add_interaction(Interaction(str(i), (i % 7 - 3) / 3, 10 + i % 13))
+        return calc
+
+    @pytest.mark.parametrize("retention,size", [("none", 0), ("last", 50), ("reservoir", 50)])
+    def test_score_unchanged(self, retention, size):
+        """Retention never affects the score."""
+        full = self._feed(MEBACalculator())
+        bounded = self._feed(MEBACalculator(retention=retention, retention_size=size, seed=1))
+
+        assert bounded.calculate_score() == full.calculate_score()
+        assert bounded.interaction_count == full.interaction_count == 1000
+        assert len(bounded.interactions) == size
+
+    def test_last_keeps_most_recent(self):
+        calc = self._feed(MEBACalculator(retention="last", retention_size=3))
+        calc.add_interactions_array([0.5, 0.6], [1, 2])
+
+        assert [i.id for i in calc.interactions] == ["999", "1000", "1001"]
+
+    def test_reservoir_bulk_matches_scalar(self):
+        """Bulk ingestion draws the same sample as one-by-one ingestion."""
+        rng = np.random.default_rng(8)
+        sentiment = rng.uniform(-1, 1, 5000)
+        duration = rng.uniform(1, 100, 5000)
+        scalar = MEBACalculator(retention="reservoir", retention_size=20, seed=42)
+        for i, (s, d) in enumerate(zip(sentiment.tolist(), duration.tolist())):
+            scalar.add_interaction(Interaction(str(i), s, d))
+        bulk = MEBACalculator(retention="reservoir", retention_size=20, seed=42)
+        bulk.add_interactions_array(sentiment[:7], duration[:7])
+        bulk.add_interactions_array(sentiment[7:], duration[7:])
+
+        assert [i.id for i in bulk.interactions] == [i.id for i in scalar.interactions]
+
+    def test_reservoir_is_uniform(self):
+        """Every interaction has about K/N chance to be sampled."""
+        hits = np.zeros(100)
+        for seed in range(2000):
+            calc = MEBACalculator(retention="reservoir", retention_size=10, seed=seed)
+            calc.add_interactions_array(np.zeros(100), np.ones(100))
+            hits[[int(i.id) for i in calc.interactions]] += 1
+
+        assert np.all(np.abs(hits / 2000 - 0.1) < 0.04)
+
+    def test_reservoir_merge_is_weighted(self):
+        """A merged reservoir samples both sides by their seen counts, and keeps doing so."""
+        ids = np.arange(2000)
+        hits = np.zeros(len(ids))
+        for seed in range(1000):
+            left = MEBACalculator(retention="reservoir", retention_size=10, seed=seed)
+            left.add_interactions_array(np.zeros(200), np.ones(200))
+            right = MEBACalculator(retention="reservoir", retention_size=10, seed=seed + 10_000)
+            right.add_interactions_array(np.zeros(800), np.ones(800), ids=[str(i) for i in ids[200:1000]])
+            left.merge(right)
+            assert left._reservoir_seen == 1000 and len(left.interactions) == 10
+            left.add_interactions_array(np.zeros(1000), np.ones(1000), ids=[str(i) for i in ids[1000:]])
+            hits[[int(i.id) for i in left.interactions]] += 1
+
+        share = hits / hits.sum()
+        assert share[:200].sum() == pytest.approx(0.1, abs=0.02)
+        assert share[200:1000].sum() == pytest.approx(0.4, abs=0.02)
+        assert share[1000:].sum() == pytest.approx(0.5, abs=0.02)
+
+    def test_reservoir_merge_small_and_invalid(self):
+        left = self._feed(MEBACalculator(retention="reservoir", retention_size=50, seed=1), n=20)
+        left.merge(self._feed(MEBACalculator(), n=25))
+        assert len(left.interactions) == 45 and left.interaction_count == 45
+
+        with pytest.raises(ValueError):
+            left.merge(self._feed(MEBACalculator(retention="last", retention_size=5)))
+        with pytest.raises(ValueError):
+            left.merge(self._feed(MEBACalculator(retention="reservoir", retention_size=5, seed=2)))
+        assert left.interaction_count == 45
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            MEBACalculator(retention="sometimes")
+        with pytest.raises(ValueError):
+            MEBACalculator(retention="last")
+
+
 class TestInteraction:
     """Test suite for Interaction dataclass."""
 
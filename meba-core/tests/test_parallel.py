@@ -0,0 +1,151 @@
+"""
+Tests for MEBA Core - Mergeable state and parallel file scoring
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import numpy as np
+import pytest
+
+from meba_core.meba_metric import MEBACalculator, MEBAState, Interaction
+from meba_core.parallel import reduce_file, score_file
+from meba_core.reader import read_csv_layout, split_ranges
+
+
+def _write_csv(path, n=5000, seed=5):
+    rng = np.random.default_rng(seed)
+    sentiment = rng.uniform(-1.0, 1.0, n).round(6)
+    duration = rng.uniform(10.0, 300.0, n).round(3)
+    with open(path, "w") as f:
+        f.write("id,sentiment_score,duration_seconds,user_feedback\n")
+        for i, (s, d) in enumerate(zip(sentiment.tolist(), duration.tolist())):
+            f.write(f"id-{i},{s},{d},neutral\n")
+    return sentiment, duration
+
+
+class TestMEBAState:
+    """Test suite for MEBAState."""
+
+    def test_merge_is_associative_and_commutative(self):
+        """Any reduction order gives the same counts."""
+        a = MEBAState(1, 2, 3.0, 10.0)
+        b = MEBAState(4, 0, 0.0, 5.0)
+        c = MEBAState(0, 7, 8.5, 9.5)
+
+        assert a.merge(b).merge(c) == a.merge(b.merge(c))
+        assert a.merge(b) == b.merge(a)
+        assert MEBAState().merge(a) == a
+
+    def test_serialization(self):
+        """States round-trip through bytes and dicts."""
+        state = MEBAState(3, 1, 12.5, 99.25)
+
+        assert MEBAState.from_bytes(state.to_bytes()) == state
+        assert len(state.to_bytes()) == 40
+        assert MEBAState.from_dict(state.to_dict()) == state
+
+        counted = MEBAState(3, 1, 12.5, 99.25, interaction_count=9)
+        assert MEBAState.from_bytes(counted.to_bytes()) == counted
+        assert MEBAState.from_dict(counted.to_dict()).interaction_count == 9
+        # Encodings without interaction_count fall back to the scored interactions
+        assert MEBAState.from_bytes(MEBAState._STRUCT_V1.pack(3, 1, 12.5, 99.25)) == state
+        assert state.interaction_count == 4
+
+    def test_calculator_merge(self):
+        """Merging calculators equals ingesting everything into one."""
+        left = MEBACalculator()
+        left.add_interaction(Interaction("1", 0.8, 120))
+        right = MEBACalculator()
+        right.add_interaction(Interaction("2", 0.9, 60))
+        right.add_interaction(Interaction("3", -0.5, 30))
+
+        whole = MEBACalculator()
+        for i in left.interactions + right.interactions:
+            whole.add_interaction(i)
+
+        left.merge(right)
+        assert left.calculate_score() == whole.calculate_score()
+        assert len(left.interactions) == 3
+        assert left.interaction_count == 3
+
+    def test_counts_follow_merged_state(self):
+        """Merged states carry the interaction count, neutral interactions included."""
+        a, b = MEBACalculator(), MEBACalculator()
+        a.add_interactions_array([0.5, 0.0, -0.5], [10.0, 20.0, 30.0])
+        b.add_interactions_array([0.0, 0.9], [5.0, 5.0])
+
+        calc = MEBACalculator.from_state(a.get_state())
+        calc.merge_state(b.get_state())
+        assert calc.interaction_count == 5
+        assert calc.get_state() == a.get_state().merge(b.get_state())
+
+    def test_distribution_merges(self):
+        """Sketches are merged with the counts; a bare state cannot update them."""
+        a = MEBACalculator(distribution=True, seed=1)
+        b = MEBACalculator(distribution=True, seed=2)
+        a.add_interactions_array([-0.5, 0.5], [10.0, 20.0])
+        b.add_interactions_array([-0.9, -0.2, 0.0], [5.0, 6.0, 7.0])
+
+        a.merge(b)
+        assert a.calculate_distribution()["negative_duration"]["count"] == a._neg_count == 3
+        with pytest.raises(ValueError):
+            a.merge_state(b.get_state())
+        with pytest.raises(ValueError):
+            MEBACalculator.from_state(b.get_state(), distribution=True)
+        with pytest.raises(ValueError):
+            a.merge(MEBACalculator.from_state(b.get_state()))
+        assert a.interaction_count == 5
+        a.merge_state(MEBAState(2, 0, 0.0, 4.0, 3))
+        assert a.interaction_count == 8
+
+    def test_from_state(self):
+        """A calculator can be rebuilt from a state with custom parameters."""
+        calc = MEBACalculator.from_state(MEBAState(2, 1, 30.0, 210.0), ripn_max=5.0)
+        assert calc.ripn_max == 5.0
+        assert calc.calculate_ripn() == 2.0
+
+
+class TestParallelScoring:
+    """Test suite for parallel file scoring."""
+
+    def test_ranges_cover_file(self, tmp_path):
+        """Ranges are contiguous, newline-aligned and cover every row."""
+        path = str(tmp_path / "interactions.csv")
+        _write_csv(path, n=1000)
+        layout = read_csv_layout(path)
+
+        ranges = split_ranges(path, layout.data_offset, chunk_bytes=4096)
+        data = open(path, "rb").read()
+
+        assert len(ranges) > 1
+        assert ranges[0][0] == layout.data_offset
+        assert ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[end - 1:end] == b"\n"
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_matches_single_calculator(self, tmp_path, processes):
+        """Chunked/parallel scoring equals scoring the columns directly."""
+        path = str(tmp_path / "interactions.csv")
+        sentiment, duration = _write_csv(path)
+
+        calc = MEBACalculator()
+        calc.add_interactions_array(sentiment, duration, retain=False)
+
+        state = reduce_file(path, processes=processes, chunk_bytes=8192)
+        assert state.pos_count == calc._pos_count
+        assert state.neg_count == calc._neg_count
+        assert state.total_time == pytest.approx(calc._total_time, rel=1e-12)
+        assert score_file(path, processes=processes, chunk_bytes=8192) == calc.calculate_score()
+
+    def test_missing_column(self, tmp_path):
+        """Files without the MEBA columns are rejected."""
+        path = tmp_path / "bad.csv"
+        path.write_text("id,score\n1,0.5\n")
+        with pytest.raises(ValueError):
+            score_file(str(path), processes=1)
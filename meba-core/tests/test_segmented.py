@@ -0,0 +1,122 @@
+"""
+Tests for MEBA Core - Segmented (group-by) MEBA
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import numpy as np
+import pytest
+
+from meba_core.meba_metric import MEBACalculator, Interaction
+from meba_core.segmented import SegmentedMEBA
+
+
+def _columns(n=5000, segments=50, seed=9):
+    rng = np.random.default_rng(seed)
+    keys = np.array([f"tenant-{i}" for i in rng.integers(0, segments, n)])
+    sentiment = rng.uniform(-1.0, 1.0, n)
+    duration = rng.uniform(5.0, 300.0, n)
+    return keys, sentiment, duration
+
+
+class TestSegmentedMEBA:
+    """Test suite for SegmentedMEBA."""
+
+    def test_matches_one_calculator_per_segment(self):
+        """Every segment scores exactly like a dedicated MEBACalculator."""
+        keys, sentiment, duration = _columns()
+        seg = SegmentedMEBA()
+        calcs = {}
+        for i, (k, s, d) in enumerate(zip(keys.tolist(), sentiment.tolist(), duration.tolist())):
+            seg.add(k, s, d)
+            calcs.setdefault(k, MEBACalculator()).add_interaction(Interaction(str(i), s, d))
+
+        table = seg.score_table()
+        for row, key in enumerate(table["keys"]):
+            expected = calcs[key].calculate_score()
+            assert seg.calculate_score(key) == expected
+            assert table["meba_cert"][row] == pytest.approx(expected["meba_cert"], abs=1e-4)
+            assert table["ripn"][row] == pytest.approx(expected["components"]["ripn"], abs=1e-4)
+            assert table["frn"][row] == pytest.approx(expected["components"]["frn"], abs=1e-4)
+
+    def test_add_arrays_matches_scalar(self):
+        """Vectorized group-by gives the same aggregates as per-row adds."""
+        keys, sentiment, duration = _columns(seed=2)
+        bulk = SegmentedMEBA(capacity=4)
+        bulk.add_arrays(keys, sentiment, duration)
+        scalar = SegmentedMEBA()
+        for k, s, d in zip(keys.tolist(), sentiment.tolist(), duration.tolist()):
+            scalar.add(k, s, d)
+
+        assert sorted(bulk.keys) == sorted(scalar.keys)
+        for key in scalar.keys:
+            a, b = bulk.get_state(key), scalar.get_state(key)
+            assert (a.pos_count, a.neg_count) == (b.pos_count, b.neg_count)
+            assert a.total_time == pytest.approx(b.total_time)
+            assert a.neg_time == pytest.approx(b.neg_time)
+
+    def test_edge_cases_match_scalar_rules(self):
+        """No negatives -> RIPN is the positive count; no time -> FRN is 0."""
+        seg = SegmentedMEBA()
+        seg.add_arrays([1, 1, 2, 3], [0.9, 0.8, 0.0, -0.5], [10, 10, 0, 0])
+
+        scores = seg.calculate_scores()
+        for key in (1, 2, 3):
+            assert scores[key] == seg.calculate_score(key)["meba_cert"]
+
+    def test_merge(self):
+        """Merging two engines equals ingesting everything into one."""
+        keys, sentiment, duration = _columns(seed=4)
+        whole = SegmentedMEBA()
+        whole.add_arrays(keys, sentiment, duration)
+        left, right = SegmentedMEBA(), SegmentedMEBA()
+        left.add_arrays(keys[:2000], sentiment[:2000], duration[:2000])
+        right.add_arrays(keys[2000:], sentiment[2000:], duration[2000:])
+        left.merge(right)
+
+        assert left.calculate_scores() == pytest.approx(whole.calculate_scores())
+
+    def test_many_segments(self):
+        """100k segments are held in flat arrays, not per-segment objects."""
+        n = 100_000
+        seg = SegmentedMEBA()
+        seg.add_arrays(np.arange(n), np.full(n, 0.5), np.ones(n))
+        seg.add_arrays(np.arange(n), np.full(n, -0.5), np.ones(n))
+
+        table = seg.score_table()
+        assert len(seg) == n
+        assert np.all(table["ripn"] == 1.0)
+        assert np.all(table["frn"] == 0.5)
+
+    def test_mixed_keys_are_not_coerced(self):
+        """1 and '1' stay distinct segments, and keys keep their original objects."""
+        seg = SegmentedMEBA()
+        seg.add(1, 0.9, 10.0)
+        seg.add_arrays([1, "a", "1", 1], [0.9, -0.5, 0.9, -0.5], [1.0, 2.0, 3.0, 4.0])
+        seg.add_arrays(np.array([1, 2]), [0.9, 0.9], [1.0, 1.0])
+
+        assert seg.keys == [1, "a", "1", 2]
+        assert [type(k) for k in seg.keys] == [int, str, str, int]
+        assert seg.get_state(1).pos_count == 3
+        assert seg.get_state(1).neg_count == 1
+        assert seg.get_state("1").total_time == 3.0
+
+    def test_tuple_keys(self):
+        keys = [("tenant-a", "model-1"), ("tenant-b", "model-1"), ("tenant-a", "model-1")]
+        seg = SegmentedMEBA()
+        seg.add_arrays(keys, [0.9, -0.5, 0.9], [1.0, 2.0, 3.0])
+        object_keys = np.empty(2, dtype=object)
+        object_keys[:] = [("tenant-a", "model-1"), ("tenant-c", "model-2")]
+        seg.add_arrays(object_keys, [-0.5, 0.9], [1.0, 1.0])
+
+        assert seg.keys == [("tenant-a", "model-1"), ("tenant-b", "model-1"), ("tenant-c", "model-2")]
+        state = seg.get_state(("tenant-a", "model-1"))
+        assert (state.pos_count, state.neg_count, state.total_time) == (2, 1, 5.0)
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            SegmentedMEBA().add_arrays(["a"], [0.5, 0.1], [1.0])
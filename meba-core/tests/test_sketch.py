@@ -0,0 +1,124 @@
+"""
+Tests for MEBA Core - Quantile sketches and MEBA distributions
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import numpy as np
+import pytest
+
+from meba_core.meba_metric import MEBACalculator, Interaction
+from meba_core.sketch import KLLSketch
+
+
+def _rank_error(data, value, q):
+    """Distance between q and the empirical rank of value."""
+    return abs(np.searchsorted(np.sort(data), value, side="right") / len(data) - q)
+
+
+class TestKLLSketch:
+    """Test suite for KLLSketch."""
+
+    @pytest.mark.parametrize("q", [0.01, 0.25, 0.5, 0.9, 0.95, 0.99])
+    def test_rank_error_is_bounded(self, q):
+        data = np.random.default_rng(1).lognormal(3.0, 1.0, 200_000)
+        sketch = KLLSketch(k=200, seed=1)
+        for chunk in np.array_split(data, 50):
+            sketch.update_array(chunk)
+
+        assert _rank_error(data, sketch.quantile(q), q) < 0.02
+
+    def test_memory_is_bounded(self):
+        sketch = KLLSketch(k=100, seed=2)
+        for x in np.random.default_rng(2).uniform(size=100_000).tolist():
+            sketch.update(x)
+
+        assert sketch.n == 100_000
+        assert sketch.retained < 4 * sketch.k
+
+    def test_extremes_are_exact(self):
+        sketch = KLLSketch(seed=3)
+        sketch.update_array(np.arange(10_000, dtype=float))
+
+        assert sketch.quantile(0.0) == 0.0
+        assert sketch.quantile(1.0) == 9999.0
+
+    def test_merge_matches_single_stream(self):
+        """Merged sketches answer within the same error bound."""
+        data = np.random.default_rng(4).normal(size=100_000)
+        parts = [KLLSketch(seed=i) for i in range(4)]
+        for sketch, chunk in zip(parts, np.array_split(data, 4)):
+            sketch.update_array(chunk)
+        merged = parts[0]
+        for sketch in parts[1:]:
+            merged.merge(sketch)
+
+        assert merged.n == len(data)
+        for q in (0.5, 0.95, 0.99):
+            assert _rank_error(data, merged.quantile(q), q) < 0.02
+
+    def test_round_trip(self):
+        sketch = KLLSketch(seed=5)
+        sketch.update_array(np.linspace(0, 1, 5000))
+
+        assert KLLSketch.from_dict(sketch.to_dict()).quantiles([0.1, 0.5]) == sketch.quantiles([0.1, 0.5])
+
+    def test_mismatched_k(self):
+        with pytest.raises(ValueError):
+            KLLSketch(k=100).merge(KLLSketch(k=200))
+
+
+class TestMEBADistribution:
+    """Test suite for the optional distribution key of calculate_score."""
+
+    def test_disabled_by_default(self):
+        calc = MEBACalculator()
+        calc.add_interaction(Interaction("1", -0.5, 30))
+
+        assert "distribution" not in calc.calculate_score()
+
+    def test_small_stream_is_exact(self):
+        """Below k observations the sketch holds every value."""
+        calc = MEBACalculator(distribution=True)
+        calc.add_interaction(Interaction("1", 0.8, 120))
+        for i in range(1, 101):
+            calc.add_interaction(Interaction(str(i), -i / 100, float(i)))
+
+        dist = calc.calculate_score()["distribution"]
+        durations = np.arange(11, 101, dtype=float)
+        assert dist["negative_duration"]["count"] == 90
+        for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            assert dist["negative_duration"][name] == np.quantile(durations, q, method="inverted_cdf")
+            assert dist["negative_sentiment"][name] == np.quantile(-durations / 100, q, method="inverted_cdf")
+
+    def test_bulk_matches_numpy(self):
+        rng = np.random.default_rng(6)
+        sentiment = rng.uniform(-1, 1, 100_000)
+        duration = rng.exponential(60.0, 100_000)
+        calc = MEBACalculator(distribution=True, seed=6)
+        calc.add_interactions_array(sentiment, duration, retain=False)
+
+        neg = duration[sentiment < -0.1]
+        p95 = calc.calculate_distribution()["negative_duration"]["p95"]
+        assert _rank_error(neg, p95, 0.95) < 0.02
+
+    def test_merge_combines_distributions(self):
+        left = MEBACalculator(distribution=True)
+        right = MEBACalculator(distribution=True)
+        left.add_interactions_array([-0.5, -0.6], [10, 20], retain=False)
+        right.add_interactions_array([-0.7], [30], retain=False)
+        left.merge(right)
+
+        assert left.calculate_distribution()["negative_duration"]["count"] == 3
+
+    def test_empty_distribution(self):
+        dist = MEBACalculator(distribution=True).calculate_score()["distribution"]
+        assert dist["negative_duration"] == {"p50": None, "p95": None, "p99": None, "count": 0}
+
+    def test_calculate_distribution_requires_sketches(self):
+        with pytest.raises(ValueError):
+            MEBACalculator().calculate_distribution()
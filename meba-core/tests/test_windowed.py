@@ -0,0 +1,142 @@
+"""
+Tests for MEBA Core - Sliding-window MEBA
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+
+Author: AHI 3.0
+License: MIT
+"""
+
+import numpy as np
+import pytest
+
+from meba_core.meba_metric import MEBACalculator, Interaction
+from meba_core.windowed import MultiWindowMEBA, WindowedMEBACalculator
+
+
+def _reference_score(timestamps, sentiment, duration, start):
+    """Lifetime calculator over the interactions at or after start."""
+    calc = MEBACalculator()
+    for i, (t, s, d) in enumerate(zip(timestamps, sentiment, duration)):
+        if t >= start:
+            calc.add_interaction(Interaction(str(i), s, d))
+    return calc.calculate_score()
+
+
+class TestWindowedMEBA:
+    """Test suite for WindowedMEBACalculator."""
+
+    def test_matches_lifetime_inside_window(self):
+        """Before anything expires the window equals the lifetime score."""
+        win = WindowedMEBACalculator(window_seconds=3600, bucket_seconds=60)
+        calc = MEBACalculator()
+        for i, (s, d) in enumerate([(0.8, 120), (0.9, 60), (-0.5, 30), (0.0, 10)]):
+            win.add(i * 10.0, s, d)
+            calc.add_interaction(Interaction(str(i), s, d))
+
+        assert win.calculate_score() == calc.calculate_score()
+
+    def test_old_buckets_are_evicted(self):
+        """Only buckets inside the window contribute to the score."""
+        rng = np.random.default_rng(11)
+        ts = np.sort(rng.uniform(0, 7200, 2000))
+        s = rng.uniform(-1, 1, 2000)
+        d = rng.uniform(5, 300, 2000)
+
+        win = WindowedMEBACalculator(window_seconds=600, bucket_seconds=60)
+        for t, si, di in zip(ts, s, d):
+            win.add(t, si, di)
+
+        head_bucket = int(ts[-1] // 60)
+        start = (head_bucket - win.n_buckets + 1) * 60
+        expected = _reference_score(ts, s, d, start)
+        result = win.calculate_score()
+
+        assert result["components"]["ripn"] == expected["components"]["ripn"]
+        assert result["meba_cert"] == pytest.approx(expected["meba_cert"], abs=1e-4)
+
+    def test_advance_expires_everything(self):
+        """Advancing past the window empties it exactly."""
+        win = WindowedMEBACalculator(window_seconds=300, bucket_seconds=60)
+        win.add(0, -0.9, 17.3)
+        win.add(61, 0.5, 0.1)
+
+        result = win.calculate_score(now=10_000)
+
+        assert result["meba_cert"] == 0.0
+        assert win.get_state().total_time == 0.0
+        assert win.get_state().neg_count == 0
+
+    def test_late_interaction_is_ignored(self):
+        """Interactions older than the window are rejected."""
+        win = WindowedMEBACalculator(window_seconds=120, bucket_seconds=60)
+        win.add(1000, 0.5, 10)
+
+        assert win.add(10, -0.9, 99) is False
+        assert win.get_state().neg_count == 0
+
+    def test_add_arrays_matches_scalar(self):
+        """Vectorized bulk add gives the same aggregates as per-item adds."""
+        rng = np.random.default_rng(3)
+        ts = rng.uniform(0, 5000, 3000)  # unsorted on purpose
+        s = rng.uniform(-1, 1, 3000)
+        d = rng.uniform(5, 300, 3000)
+
+        bulk = WindowedMEBACalculator(window_seconds=1800, bucket_seconds=60)
+        accepted = bulk.add_arrays(ts, s, d)
+        scalar = WindowedMEBACalculator(window_seconds=1800, bucket_seconds=60)
+        scalar.advance_to(ts.max())
+        scalar_accepted = sum(scalar.add(t, si, di) for t, si, di in zip(ts, s, d))
+
+        assert accepted == scalar_accepted
+        a, b = bulk.get_state(), scalar.get_state()
+        assert (a.pos_count, a.neg_count) == (b.pos_count, b.neg_count)
+        assert a.total_time == pytest.approx(b.total_time)
+        assert a.neg_time == pytest.approx(b.neg_time)
+
+    def test_negative_timestamps(self):
+        """Bucket -1 (and other pre-epoch buckets) is a live bucket like any other."""
+        win = WindowedMEBACalculator(window_seconds=180, bucket_seconds=60)
+        win.add(-30, -0.9, 10)
+        win.add(-10, 0.5, 5)
+        assert win._live_buckets == 1
+        win.add(20, -0.5, 2)
+
+        state = win.get_state()
+        assert (state.pos_count, state.neg_count, state.total_time) == (1, 2, 17.0)
+        assert win._live_buckets == 2
+
+        bulk = WindowedMEBACalculator(window_seconds=180, bucket_seconds=60)
+        assert bulk.add_arrays([-30, -10, 20], [-0.9, 0.5, -0.5], [10, 5, 2]) == 3
+        assert bulk.get_state() == state
+        assert bulk._live_buckets == 2
+        bulk.advance_to(130)  # buckets 0-2 remain: bucket -1 expires
+        assert bulk.get_state().total_time == 2.0
+
+    def test_memory_is_bounded(self):
+        """Ring size depends on the window, not on the number of interactions."""
+        win = WindowedMEBACalculator(window_seconds=3600, bucket_seconds=60)
+        win.add_arrays(np.arange(100_000) * 0.5, np.ones(100_000), np.ones(100_000))
+
+        assert win.n_buckets == 60
+        assert win._pos.shape == (60,)
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            WindowedMEBACalculator(window_seconds=0)
+
+
+class TestMultiWindowMEBA:
+    """Test suite for MultiWindowMEBA."""
+
+    def test_default_windows(self):
+        multi = MultiWindowMEBA()
+        multi.add(0, -0.8, 100)
+        multi.add(2 * 3600, 0.9, 50)
+
+        scores = multi.calculate_scores()
+
+        assert set(scores) == {"1h", "24h", "7d"}
+        assert scores["1h"]["components"]["frn"] == 0.0
+        assert scores["24h"]["components"]["frn"] > 0.0
@@ -0,0 +1,208 @@
+"""
+Load test for the SAP governance HTTP service.
+Opens N keep-alive connections against a localhost service (started in
+a child process unless --target is given) and reports throughput and
+latency percentiles for single-event, batched and MEBA ingestion.
+
+    python loadtest_service.py --connections 16 --requests 2000
+    python loadtest_service.py --mode batch --batch-size 256
+    python loadtest_service.py --target 127.0.0.1:8080 --pipeline 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import List, Optional, Tuple
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), 'src'))
+MEBA_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'meba-core', 'src'))
+
+MODES = ("event", "batch", "meba")
+
+
+def _metrics(rng: random.Random) -> dict:
+    base = 0.5 if rng.random() < 0.05 else 0.95
+    return {
+        'semantic_stability': base + rng.uniform(-0.03, 0.03),
+        'output_stability': base + rng.uniform(-0.03, 0.03),
+        'constraint_compliance': min(1.0, base + rng.uniform(-0.03, 0.03)),
+        'decision_entropy': (1.0 - base) + rng.uniform(-0.03, 0.03)
+    }
+
+
+def _request(method: str, path: str, payload=None) -> bytes:
+    body = json.dumps(payload, separators=(',', ':')).encode() if payload is not None else b""
+    return (f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        if line[:15].lower() == b"content-length:":
+            length = int(line[15:])
+    await reader.readexactly(length)
+    return status
+
+
+def _build_requests(mode: str, worker: int, count: int, batch_size: int) -> Tuple[bytes, List[bytes], int]:
+    """Setup request, the measured requests, and items (events/interactions) per request."""
+    rng = random.Random(worker)
+    artifact = f"LOAD-{worker:04d}"
+    if mode == "meba":
+        requests = [
+            _request("POST", f"/meba/{artifact}/interactions", {
+                "sentiment_score": [rng.uniform(-1, 1) for _ in range(batch_size)],
+                "duration_seconds": [rng.uniform(1, 60) for _ in range(batch_size)],
+            })
+            for _ in range(count)
+        ]
+        return _request("GET", "/health"), requests, batch_size
+
+    setup = _request("POST", "/artifacts", {"artifact_id": artifact, "sha256": f"{worker:064x}"})
+    if mode == "batch":
+        requests = [
+            _request("POST", f"/artifacts/{artifact}/events/batch", [_metrics(rng) for _ in range(batch_size)])
+            for _ in range(count)
+        ]
+        return setup, requests, batch_size
+    requests = [_request("POST", f"/artifacts/{artifact}/events", _metrics(rng)) for _ in range(count)]
+    return setup, requests, 1
+
+
+async def _worker(host: str, port: int, setup: bytes, requests: List[bytes], pipeline: int,
+                  latencies: List[float]) -> int:
+    """Send requests over one keep-alive connection; returns the number of non-2xx answers."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(setup)
+    await _read_response(reader)
+
+    errors = 0
+    perf = time.perf_counter
+    for start in range(0, len(requests), pipeline):
+        window = requests[start:start + pipeline]
+        sent = perf()
+        writer.write(b"".join(window))
+        for _ in window:
+            if not 200 <= await _read_response(reader) < 300:
+                errors += 1
+            latencies.append(perf() - sent)
+    writer.close()
+    await writer.wait_closed()
+    return errors
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run_load_test(host: str, port: int, mode: str = "event", connections: int = 8,
+                        requests: int = 1000, batch_size: int = 100, pipeline: int = 1) -> dict:
+    """
+    Drive the service with `connections` concurrent keep-alive clients.
+
+    Returns:
+        Summary with request/item throughput and latency percentiles (ms)
+    """
+    plans = [_build_requests(mode, w, requests, batch_size) for w in range(connections)]
+    latencies: List[float] = []
+
+    started = time.perf_counter()
+    errors = await asyncio.gather(*(
+        _worker(host, port, setup, reqs, pipeline, latencies) for setup, reqs, _ in plans
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = connections * requests
+    return {
+        "mode": mode,
+        "connections": connections,
+        "pipeline": pipeline,
+        "requests": total,
+        "errors": sum(errors),
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(total / elapsed, 1),
+        "items_per_s": round(total * plans[0][2] / elapsed, 1),
+        "latency_ms": {
+            name: round(_percentile(latencies, q) * 1000, 3)
+            for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_service(port: int) -> subprocess.Popen:
+    """Run the service in a child process and wait until /health answers."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (SRC, MEBA_SRC, env.get("PYTHONPATH")) if p)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "sap_pilot_kit.service", "--port", str(port)],
+        env=env, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=0.5).read()
+            return proc
+        except OSError:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("SAP governance service did not start")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", help="host:port of a running service (default: start one locally)")
+    parser.add_argument("--mode", choices=MODES, default="event")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per connection")
+    parser.add_argument("--batch-size", type=int, default=100, help="Events/interactions per batch request")
+    parser.add_argument("--pipeline", type=int, default=1, help="Requests in flight per connection")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.target:
+        host, port = args.target.rsplit(":", 1)
+        port = int(port)
+    else:
+        host, port = "127.0.0.1", _free_port()
+        proc = start_local_service(port)
+    try:
+        summary = asyncio.run(run_load_test(
+            host, port, args.mode, args.connections, args.requests, args.batch_size, max(1, args.pipeline),
+        ))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    lat = summary["latency_ms"]
+    print(f"{summary['mode']}: {summary['requests']} requests over {summary['connections']} connections "
+          f"(pipeline {summary['pipeline']}) in {summary['seconds']} s, {summary['errors']} errors")
+    print(f"  {summary['requests_per_s']:,.0f} req/s, {summary['items_per_s']:,.0f} items/s")
+    print(f"  latency p50 {lat['p50']} ms, p95 {lat['p95']} ms, p99 {lat['p99']} ms, max {lat['max']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+ICE-W Async Ingestion
+SAP Pilot Kit v0.1 - asyncio front-end with bounded telemetry queue
+
+La decisión de autarquía (ALLOW/BLOCK) se calcula de forma síncrona y
+ordenada en submit(); la construcción de telemetría se difiere a una
+tarea en segundo plano con cola acotada y contrapresión.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+from .ice_w_logger import ICEWLogger
+
+OVERFLOW_POLICIES = ("block", "drop")
+
+_log = logging.getLogger(__name__)
+
+
+class AsyncICEWLogger:
+    """
+    asyncio wrapper around an ICEWLogger.
+
+    submit() runs the decision phase (coherence, drift, state machine)
+    inline, before yielding to the event loop, so decisions stay ordered
+    per artifact and never wait on logging. The telemetry record, a
+    snapshot of that decision, is queued for a background task that
+    appends it to the logger's telemetry log.
+
+    Overflow policies when the queue is full:
+        "block": submit() awaits queue space (backpressure to the caller)
+        "drop":  the telemetry record is discarded and counted in `dropped`;
+                 the decision and its epoch statistics are never dropped
+
+    A record that fails to be written is logged and counted in `failed`;
+    the writer keeps draining and the next flush() raises the first error.
+
+    Usage:
+        async with AsyncICEWLogger(ICEWLogger(aid, sha)) as sap:
+            action, state = await sap.submit(metrics)
+    """
+
+    def __init__(self, logger: ICEWLogger, maxsize: int = 10000, overflow: str = "block"):
+        """
+        Args:
+            logger: Logger that owns the SAP state
+            maxsize: Maximum number of queued telemetry records (> 0)
+            overflow: "block" or "drop"
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        if maxsize <= 0:
+            raise ValueError("maxsize must be > 0")
+
+        self.logger = logger
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.failed = 0
+        self._error: Optional[BaseException] = None
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._put_lock: Optional[asyncio.Lock] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self):
+        """Start the background telemetry writer (idempotent)."""
+        if self._writer is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            # FIFO lock so blocked producers enqueue in decision order
+            self._put_lock = asyncio.Lock()
+            self._writer = asyncio.create_task(self._drain())
+
+    async def submit(self, metrics: dict) -> Tuple[str, str]:
+        """
+        Decide ALLOW/BLOCK for one event and queue its telemetry.
+
+        Args:
+            metrics: IPHY metrics for this event
+
+        Returns:
+            (action, state), e.g. ("BLOCK_OUTPUT", "INVALIDATED")
+        """
+        if self._closed:
+            raise RuntimeError("AsyncICEWLogger is closed")
+        if self._writer is None:
+            await self.start()
+
+        logger = self.logger
+        # Synchronous decision: no await before the state has been updated
+        if logger._wal is not None:
+            logger._wal.append(metrics)
+        cn = logger.calculate_coherence(metrics)
+        delta_cn, threshold_crossed = logger._decide(cn)
+        state = logger.state
+        blocked = logger.is_blocked
+        record = (
+            cn, delta_cn, threshold_crossed, state,
+            logger.k_counter, logger.m_counter, logger.p_counter,
+            blocked, logger._clock.now_ns(),
+        )
+
+        if self.overflow == "drop":
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                # Keep the epoch statistics complete, as decide() does
+                logger._record_stats(cn, state, record[-1])
+        else:
+            # Always take the FIFO lock: testing locked() would let a new
+            # submitter overtake a waiter that was woken but has not run yet.
+            # An uncontended acquire and a put with free space do not yield.
+            async with self._put_lock:
+                await self._queue.put(record)
+
+        return ("BLOCK_OUTPUT" if blocked else "ALLOW"), state
+
+    async def _drain(self):
+        """Background task: append queued records to the telemetry log."""
+        queue = self._queue
+        record_event = self.logger._record
+        while True:
+            record = await queue.get()
+            # Drain whatever is already queued without yielding per record
+            while True:
+                try:
+                    record_event(*record)
+                except Exception as exc:
+                    # One bad record must not stop the writer (flush() would hang)
+                    self.failed += 1
+                    if self._error is None:
+                        self._error = exc
+                    _log.exception("Failed to write telemetry record")
+                finally:
+                    queue.task_done()
+                if queue.empty():
+                    break
+                record = queue.get_nowait()
+
+    @property
+    def pending(self) -> int:
+        """Telemetry records waiting to be written."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def flush(self):
+        """
+        Wait until every queued telemetry record has been written.
+
+        Raises:
+            Exception: The first error raised while writing a record since
+                the previous flush(); the remaining records are still written
+        """
+        if self._queue is not None:
+            await self._queue.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    async def close(self):
+        """Flush pending telemetry, then stop the background writer."""
+        self._closed = True
+        if self._writer is None:
+            return
+        try:
+            await self.flush()
+        finally:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
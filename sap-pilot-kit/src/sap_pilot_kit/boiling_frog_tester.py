@@ -1,5 +1,24 @@
 from .ice_w_logger import ICEWLogger
 
+# Métricas IPHY de un evento perfecto (fase de línea base)
+BASELINE_METRICS = {
+    'semantic_stability': 0.98,
+    'output_stability': 0.99,
+    'constraint_compliance': 1.0,
+    'decision_entropy': 0.05
+}
+
+
+def stress_metrics(ambiguity_factor: float) -> dict:
+    """IPHY metrics degraded by the given ambiguity factor (Boiling Frog ramp)."""
+    return {
+        'semantic_stability': max(0.4, 0.98 - ambiguity_factor),
+        'output_stability': max(0.4, 0.99 - (ambiguity_factor * 1.1)),
+        'constraint_compliance': max(0.1, 1.0 - (ambiguity_factor * 1.5)),  # Degrades faster
+        'decision_entropy': min(0.9, 0.05 + ambiguity_factor)
+    }
+
+
 def simulate_stress_test():
     """
     🧪 Boiling Frog SAP Tester v1.0
@@ -20,13 +39,7 @@ def simulate_stress_test():
     # 2. Baseline Phase (10 perfect events to stabilize W)
     print("Phase 1: Establishing Baseline (W=100)")
     for i in range(10):
-        baseline_metrics = {
-            'semantic_stability': 0.98,
-            'output_stability': 0.99,
-            'constraint_compliance': 1.0,
-            'decision_entropy': 0.05
-        }
-        logger.process_event(baseline_metrics)
+        logger.process_event(dict(BASELINE_METRICS))
     print("✅ Baseline stable\n")
 
     # 3. Graduated Stress Phase (30 ambiguity levels)
@@ -41,12 +54,7 @@ def simulate_stress_test():
         ambiguity_factor = level * 0.03
 
         # Simulate IPHY metrics degradation
-        current_metrics = {
-            'semantic_stability': max(0.4, 0.98 - ambiguity_factor),
-            'output_stability': max(0.4, 0.99 - (ambiguity_factor * 1.1)),
-            'constraint_compliance': max(0.1, 1.0 - (ambiguity_factor * 1.5)),  # Degrades faster
-            'decision_entropy': min(0.9, 0.05 + ambiguity_factor)
-        }
+        current_metrics = stress_metrics(ambiguity_factor)
 
         # Process event and get telemetry
         log = logger.process_event(current_metrics)
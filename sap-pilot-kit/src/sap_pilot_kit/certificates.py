@@ -0,0 +1,313 @@
+"""
+Event Sovereignty Certificates
+SAP Pilot Kit v0.1 - Cached template rendering and bulk certification
+
+Carga y pre-analiza certificate_template.md una sola vez, rellena los
+certificados de muchos loggers en lote y los escribe en un directorio
+(E/S en paralelo) o en un único archivo zip/tar con un manifiesto de
+digests SHA-256 (formato de `sha256sum -c`).
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "certificate_template.md")
+
+# Manifest written next to the certificates (sha256sum format)
+MANIFEST_NAME = "SHA256SUMS"
+
+FORMATS = ("md", "json")
+
+_TAR_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tar.xz": "w:xz",
+}
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+class CertificateTemplate:
+    """
+    certificate_template.md split once into literal text and placeholders.
+
+    Rendering joins the pieces instead of re-parsing the template with
+    str.format on every certificate; the output is identical.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        # Literal text before each field, plus the text after the last one
+        self._literals: List[str] = []
+        self._fields: List[tuple] = []
+        pending = ""
+        for literal, name, spec, conversion in Formatter().parse(text):
+            pending += literal
+            if name is not None:
+                if not name.isidentifier():
+                    raise ValueError(f"Unsupported certificate placeholder: {{{name}}}")
+                self._literals.append(pending)
+                self._fields.append((name, spec or "", conversion))
+                pending = ""
+        self._literals.append(pending)
+        self.fields = tuple(name for name, _, _ in self._fields)
+
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Fill every placeholder.
+
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        parts = []
+        for literal, (name, spec, conversion) in zip(self._literals, self._fields):
+            value = values[name]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+            parts.append(literal)
+            parts.append(format(value, spec))
+        parts.append(self._literals[-1])
+        return "".join(parts)
+
+
+@lru_cache(maxsize=8)
+def load_template(path: str = TEMPLATE_PATH) -> CertificateTemplate:
+    """
+    Read and pre-parse a certificate template (cached per path).
+
+    Raises:
+        FileNotFoundError: If the template does not exist
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return CertificateTemplate(f.read())
+
+
+class Certificate(NamedTuple):
+    """One rendered certificate."""
+    filename: str
+    data: dict        # certificate_id, issue_date, artifact_id, sha256, final_state, result
+    content: bytes    # Encoded file content
+    sha256: str       # Hex digest of content
+
+
+def certificate_data(logger, issue_date: Optional[str] = None) -> dict:
+    """
+    Certificate fields for a logger (what generate_certificate returns).
+
+    Args:
+        logger: ICEWLogger to certify
+        issue_date: ISO-8601 issue date (default: now, UTC)
+    """
+    return {
+        "certificate_id": f"CERT-SAP-2026-{logger.artifact_id[:8]}",
+        "issue_date": issue_date or datetime.now(timezone.utc).isoformat(),
+        "artifact_id": logger.artifact_id,
+        "sha256": logger.sha256,
+        "final_state": logger.state,
+        "result": "PASSED (BLOCKED)" if logger.is_blocked else "FAILED",
+    }
+
+
+def _placeholders(logger, data: dict) -> Dict[str, str]:
+    return {
+        "CERT_ID": data["certificate_id"],
+        "DATE": data["issue_date"],
+        "STATUS": data["final_state"],
+        "ARTIFACT_ID": data["artifact_id"],
+        "SHA256_HASH": data["sha256"],
+        "EVENTS_PROCESSED": str(len(logger.telemetry_log)),
+        "K_COUNT": str(logger.k_counter),
+        "M_COUNT": str(logger.m_counter),
+        "P_COUNT": str(logger.p_counter),
+        "RESULT": data["result"],
+    }
+
+
+def certificate_filename(artifact_id: str, fmt: str = "md") -> str:
+    """File name for an artifact's certificate (unsafe characters replaced by '_')."""
+    return f"{_UNSAFE_CHARS.sub('_', artifact_id)}.{fmt}"
+
+
+def format_manifest(digests: Dict[str, str]) -> bytes:
+    """Manifest lines "<sha256>  <filename>", verifiable with `sha256sum -c`."""
+    return "".join(f"{digest}  {name}\n" for name, digest in digests.items()).encode("utf-8")
+
+
+def _write_file(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _write_files(files: List[tuple]):
+    for path, content in files:
+        _write_file(path, content)
+
+
+class CertificateRenderer:
+    """
+    Renders Event Sovereignty Certificates from a cached template.
+
+    Usage:
+        renderer = CertificateRenderer()
+        digests = renderer.write_archive(loggers, "pilot-certificates.zip")
+    """
+
+    def __init__(self, template_path: str = TEMPLATE_PATH):
+        """
+        Args:
+            template_path: Markdown template with {PLACEHOLDER} fields
+
+        Raises:
+            FileNotFoundError: If the template does not exist
+        """
+        self.template_path = template_path
+        self.template = load_template(template_path)
+
+    def render(self, logger, issue_date: Optional[str] = None) -> str:
+        """Markdown certificate for one logger."""
+        return self.template.render(_placeholders(logger, certificate_data(logger, issue_date)))
+
+    def render_batch(self, loggers: Iterable, fmt: str = "md",
+                     issue_date: Optional[str] = None) -> List[Certificate]:
+        """
+        Render certificates for many loggers.
+
+        Args:
+            loggers: ICEWLoggers to certify
+            fmt: "md" (filled template) or "json" (certificate fields)
+            issue_date: Shared ISO-8601 issue date (default: now, once per batch)
+
+        Returns:
+            One Certificate per logger, in input order
+
+        Raises:
+            ValueError: Unknown format or two artifacts mapping to one file name
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+        issue_date = issue_date or datetime.now(timezone.utc).isoformat()
+
+        certificates = []
+        seen = set()
+        for logger in loggers:
+            filename = certificate_filename(logger.artifact_id, fmt)
+            if filename in seen:
+                raise ValueError(f"Duplicate certificate file name: {filename}")
+            seen.add(filename)
+
+            data = certificate_data(logger, issue_date)
+            if fmt == "md":
+                text = self.template.render(_placeholders(logger, data))
+            else:
+                text = json.dumps(data, indent=2)
+            content = text.encode("utf-8")
+            certificates.append(Certificate(filename, data, content, hashlib.sha256(content).hexdigest()))
+        return certificates
+
+    def write_batch(self, loggers: Iterable, output_dir: str, fmt: str = "md",
+                    issue_date: Optional[str] = None, workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        Write one certificate file per logger plus a SHA256SUMS manifest.
+
+        Optimization: Rendering is cheap once the template is parsed; the
+        file writes dominate and are split into one contiguous slice per
+        writer thread (open/write/close release the GIL), so slow or
+        network file systems are written in parallel without paying
+        executor overhead per file.
+
+        Args:
+            loggers: ICEWLoggers to certify
+            output_dir: Directory to write into (created if missing)
+            fmt: "md" or "json"
+            issue_date: Shared ISO-8601 issue date (default: now)
+            workers: Writer threads (None = os.cpu_count(); 1 = sequential)
+
+        Returns:
+            Manifest: file name -> SHA-256 hex digest
+        """
+        certificates = self.render_batch(loggers, fmt=fmt, issue_date=issue_date)
+        os.makedirs(output_dir, exist_ok=True)
+        files = [(os.path.join(output_dir, c.filename), c.content) for c in certificates]
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(files))
+        if workers > 1:
+            step = -(-len(files) // workers)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_write_files, [files[i:i + step] for i in range(0, len(files), step)]))
+        else:
+            _write_files(files)
+
+        digests = {c.filename: c.sha256 for c in certificates}
+        _write_file(os.path.join(output_dir, MANIFEST_NAME), format_manifest(digests))
+        return digests
+
+    def write_archive(self, loggers: Iterable, archive_path: str, fmt: str = "md",
+                      issue_date: Optional[str] = None) -> Dict[str, str]:
+        """
+        Bundle all certificates and a SHA256SUMS manifest into one archive.
+
+        The archive type follows the suffix: .zip (deflate), .tar, .tar.gz
+        / .tgz, .tar.bz2 or .tar.xz.
+
+        Returns:
+            Manifest: file name -> SHA-256 hex digest
+
+        Raises:
+            ValueError: Unsupported archive suffix
+        """
+        lowered = archive_path.lower()
+        if lowered.endswith(".zip"):
+            mode = None
+        else:
+            mode = next((m for suffix, m in _TAR_MODES.items() if lowered.endswith(suffix)), "")
+            if not mode:
+                raise ValueError(f"Unsupported archive type: {archive_path} (use .zip or .tar[.gz|.bz2|.xz])")
+
+        certificates = self.render_batch(loggers, fmt=fmt, issue_date=issue_date)
+        digests = {c.filename: c.sha256 for c in certificates}
+        members = [(c.filename, c.content) for c in certificates]
+        members.append((MANIFEST_NAME, format_manifest(digests)))
+
+        if mode is None:
+            with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for name, content in members:
+                    archive.writestr(name, content)
+        else:
+            mtime = time.time()
+            with tarfile.open(archive_path, mode) as archive:
+                for name, content in members:
+                    info = tarfile.TarInfo(name)
+                    info.size = len(content)
+                    info.mtime = mtime
+                    info.mode = 0o644
+                    archive.addfile(info, io.BytesIO(content))
+        return digests
+
+
+@lru_cache(maxsize=1)
+def default_renderer() -> CertificateRenderer:
+    """Process-wide renderer for the bundled template (loaded on first use)."""
+    return CertificateRenderer()
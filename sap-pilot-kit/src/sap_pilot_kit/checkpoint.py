@@ -0,0 +1,279 @@
+"""
+ICE-W Checkpoint
+SAP Pilot Kit v0.1 - Versioned binary snapshots of ICEWLogger state
+
+Permite reiniciar un pod sin perder la ventana estadística, los
+contadores k/m/p ni el estado SAP: un modelo INVALIDATED sigue
+bloqueado tras el reinicio.
+
+Format (little-endian):
+    header   magic b"ICEW", u16 version, u16 flags
+    strings  artifact_id, sha256 (u32 length + UTF-8)
+    core     fixed-size protocol parameters, state machine and statistics
+    window   u32 length + float64 values
+    epochs   u32 length + compact JSON of epoch_summaries
+    rollups  u32 length + compact JSON of the hour/day/month rollup state
+    log      (optional) base_seq, length and raw column bytes
+    trailer  u32 CRC-32 of everything above
+
+Version 2 stores the window's Welford accumulators where version 1
+stored raw sums and a recompute counter; version 1 snapshots are still
+read, rebuilding the statistics from the stored window. Version 3 adds
+the epoch rollups; older snapshots rebuild them from their epoch
+summaries.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import deque
+
+from .rollups import EpochRollups
+from .sap_profile import PARAM_NAMES, SAPProfile
+from .telemetry_store import EVENT_ID_BYTES, STATE_CODES, STATES, TelemetryBuffer
+
+MAGIC = b"ICEW"
+FORMAT_VERSION = 3
+SUPPORTED_VERSIONS = (1, 2, 3)
+
+FLAG_HAS_LOG = 0x01
+
+_HEADER = struct.Struct("<4sHH")
+_U32 = struct.Struct("<I")
+_CRC = struct.Struct("<I")
+_LOG_HEADER = struct.Struct("<QQ")
+
+# W_size, sigma, k_limit, m_limit, p_recovery, max_log_size,
+# state, is_blocked, k, m, p, window_run, window_mean, window_m2,
+# block_n, block_mean, block_m2,
+# stat_event_count, stat_start_ns, stat_end_ns, stat_cn_sum, stat_cn_min,
+# stat_cn_max, stat_degraded, stat_invalidated, export_cursor, export_summary_cursor,
+# log_end_seq (global sequence number of the next event)
+_CORE = struct.Struct("<IdIIIQ" "BBiiiI" "dd" "Idd" "QqqdddQQ" "QQQ")
+
+# Version 1: drift_counter, window_sum_x, window_sum_sq_x in place of the
+# window_run .. block_m2 fields
+_CORE_V1 = struct.Struct("<IdIIIQ" "BBiiiI" "dd" "QqqdddQQ" "QQQ")
+
+# Columns of TelemetryBuffer in serialization order
+_LOG_COLUMNS = ("cn", "delta", "flags", "state", "k", "m", "p", "timestamp_ns")
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _pack_str(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    return _U32.pack(len(raw)) + raw
+
+
+def _array_bytes(values: array) -> bytes:
+    if _BIG_ENDIAN and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _array_from(typecode: str, raw) -> array:
+    values = array(typecode)
+    values.frombytes(raw)
+    if _BIG_ENDIAN and values.itemsize > 1:
+        values.byteswap()
+    return values
+
+
+class _Reader:
+    """Bounds-checked cursor over a snapshot payload."""
+
+    def __init__(self, data: bytes):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def take(self, size: int) -> memoryview:
+        end = self.offset + size
+        if end > len(self.view):
+            raise ValueError("Truncated ICE-W checkpoint")
+        chunk = self.view[self.offset:end]
+        self.offset = end
+        return chunk
+
+    def unpack(self, fmt: struct.Struct):
+        return fmt.unpack(self.take(fmt.size))
+
+    def string(self) -> str:
+        (length,) = self.unpack(_U32)
+        return str(self.take(length), "utf-8")
+
+
+def dump_state(logger, include_log: bool = True) -> bytes:
+    """
+    Serialize every piece of ICEWLogger state into a versioned snapshot.
+
+    Args:
+        logger: ICEWLogger to snapshot
+        include_log: Also store the buffered telemetry columns. Without
+            them the snapshot is small (the epoch rollups are bounded)
+            and still restores the exact decision state (window,
+            counters, SAP state, epoch stats).
+
+    Returns:
+        Snapshot bytes
+    """
+    parts = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, FLAG_HAS_LOG if include_log else 0),
+        _pack_str(logger.artifact_id),
+        _pack_str(logger.sha256),
+        _CORE.pack(
+            logger.W_size, logger.sigma, logger.k_limit, logger.m_limit,
+            logger.p_recovery, logger.max_log_size,
+            STATE_CODES[logger.state], int(logger.is_blocked),
+            logger.k_counter, logger.m_counter, logger.p_counter, logger._window_run,
+            logger._window_mean, logger._window_m2,
+            logger._block_n, logger._block_mean, logger._block_m2,
+            logger._stat_event_count, logger._stat_start_ns, logger._stat_end_ns,
+            logger._stat_cn_sum, logger._stat_cn_min, logger._stat_cn_max,
+            logger._stat_degraded_count, logger._stat_invalidated_count,
+            logger._export_cursor, logger._export_summary_cursor,
+            logger.telemetry_log.base_seq + len(logger.telemetry_log),
+        ),
+        _U32.pack(len(logger.window)),
+        _array_bytes(array("d", logger.window)),
+    ]
+
+    summaries = json.dumps(logger.epoch_summaries, separators=(",", ":")).encode("utf-8")
+    rollups = json.dumps(logger.rollups.to_state(), separators=(",", ":")).encode("utf-8")
+    parts += [_U32.pack(len(summaries)), summaries, _U32.pack(len(rollups)), rollups]
+
+    if include_log:
+        log = logger.telemetry_log
+        parts.append(_LOG_HEADER.pack(log.base_seq, len(log)))
+        parts += [_array_bytes(getattr(log, name)) for name in _LOG_COLUMNS]
+        parts.append(bytes(log.event_id))
+
+    payload = b"".join(parts)
+    return payload + _CRC.pack(zlib.crc32(payload))
+
+
+def load_state(cls, data: bytes):
+    """
+    Rebuild an ICEWLogger from snapshot bytes.
+
+    The logger is constructed normally first, so attributes that are not
+    part of the snapshot keep their defaults.
+
+    Args:
+        cls: ICEWLogger (or subclass) to instantiate
+        data: Bytes produced by dump_state()
+
+    Returns:
+        Restored logger
+
+    Raises:
+        ValueError: Corrupted, truncated or unsupported snapshot
+    """
+    if len(data) < _HEADER.size + _CRC.size:
+        raise ValueError("Truncated ICE-W checkpoint")
+    payload, (crc,) = data[:-_CRC.size], _CRC.unpack(data[-_CRC.size:])
+    if zlib.crc32(payload) != crc:
+        raise ValueError("ICE-W checkpoint checksum mismatch")
+
+    reader = _Reader(payload)
+    magic, version, flags = reader.unpack(_HEADER)
+    if magic != MAGIC:
+        raise ValueError("Not an ICE-W checkpoint")
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported ICE-W checkpoint version: {version}")
+
+    artifact_id = reader.string()
+    sha256 = reader.string()
+    if version == 1:
+        core = reader.unpack(_CORE_V1)
+        # Window statistics are rebuilt from the window below
+        core = core[:11] + (0, 0.0, 0.0, 0, 0.0, 0.0) + core[14:]
+    else:
+        core = reader.unpack(_CORE)
+    (W_size, sigma, k_limit, m_limit, p_recovery, max_log_size,
+     state_code, is_blocked,
+     k_counter, m_counter, p_counter, window_run,
+     window_mean, window_m2,
+     block_n, block_mean, block_m2,
+     stat_event_count, stat_start_ns, stat_end_ns,
+     stat_cn_sum, stat_cn_min, stat_cn_max,
+     stat_degraded_count, stat_invalidated_count,
+     export_cursor, export_summary_cursor,
+     log_end_seq) = core
+
+    profile = SAPProfile.from_dict(dict(zip(PARAM_NAMES, (W_size, sigma, k_limit, m_limit, p_recovery))))
+    logger = cls(artifact_id, sha256, profile=profile)
+    logger.max_log_size = max_log_size
+    logger.k_counter, logger.m_counter, logger.p_counter = k_counter, m_counter, p_counter
+    logger._stat_event_count = stat_event_count
+    logger._stat_start_ns, logger._stat_end_ns = stat_start_ns, stat_end_ns
+    logger._stat_cn_sum, logger._stat_cn_min, logger._stat_cn_max = stat_cn_sum, stat_cn_min, stat_cn_max
+    logger._stat_degraded_count = stat_degraded_count
+    logger._stat_invalidated_count = stat_invalidated_count
+    logger._export_cursor, logger._export_summary_cursor = export_cursor, export_summary_cursor
+    logger.state = STATES[state_code]
+    logger.is_blocked = bool(is_blocked)
+
+    (window_len,) = reader.unpack(_U32)
+    logger.window = deque(_array_from("d", reader.take(8 * window_len)), maxlen=logger.W_size)
+    if version == 1:
+        logger._rebuild_window_stats()
+    else:
+        logger._window_run, logger._window_mean, logger._window_m2 = window_run, window_mean, window_m2
+        logger._block_n, logger._block_mean, logger._block_m2 = block_n, block_mean, block_m2
+
+    (summaries_len,) = reader.unpack(_U32)
+    summaries = json.loads(str(reader.take(summaries_len), "utf-8"))
+    try:
+        if version >= 3:
+            (rollups_len,) = reader.unpack(_U32)
+            state = json.loads(str(reader.take(rollups_len), "utf-8"))
+            logger.rollups = EpochRollups.from_state(state, summaries)
+        else:
+            logger.rollups = EpochRollups.from_epochs(summaries)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid epoch rollups in ICE-W checkpoint: {e}")
+
+    log = TelemetryBuffer(logger.artifact_id, logger.sha256)
+    if flags & FLAG_HAS_LOG:
+        log.base_seq, count = reader.unpack(_LOG_HEADER)
+        for name in _LOG_COLUMNS:
+            typecode = getattr(log, name).typecode
+            itemsize = array(typecode).itemsize
+            setattr(log, name, _array_from(typecode, reader.take(itemsize * count)))
+        log.event_id = bytearray(reader.take(EVENT_ID_BYTES * count))
+        if log.base_seq + count != log_end_seq:
+            raise ValueError("Inconsistent telemetry log in ICE-W checkpoint")
+    else:
+        # Buffered events were not snapshotted; numbering continues after them
+        log.base_seq = log_end_seq
+    logger.telemetry_log = log
+
+    if reader.offset != len(payload):
+        raise ValueError("Trailing data in ICE-W checkpoint")
+    return logger
+
+
+def write_checkpoint(logger, path: str, include_log: bool = True):
+    """Atomically write a snapshot to path (write to temp file, then rename)."""
+    data = dump_state(logger, include_log=include_log)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(cls, path: str):
+    """Rebuild an ICEWLogger from a snapshot file."""
+    with open(path, "rb") as f:
+        return load_state(cls, f.read())
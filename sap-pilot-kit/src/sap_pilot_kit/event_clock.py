@@ -0,0 +1,83 @@
+"""
+ICE-W Event Clock
+SAP Pilot Kit v0.1 - Monotonic timestamps and sortable event ids
+
+Sustituye uuid.uuid4() y el reloj de pared por un generador por logger:
+marcas de tiempo enteras en nanosegundos estrictamente crecientes e
+identificadores de 128 bits con el formato UUIDv7 (RFC 9562), que se
+ordenan por tiempo y se siguen exportando como cadenas UUID canónicas.
+
+Layout of an event id (big-endian):
+    48 bits  Unix time in milliseconds
+     4 bits  version (7)
+    12 bits  sub-millisecond fraction (1/4096 ms)
+     2 bits  variant (0b10)
+    30 bits  per-clock random node
+    32 bits  per-clock sequence number
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import os
+import time
+from typing import Optional
+
+_VERSION_BITS = 0x7 << 76
+_VARIANT_BITS = 0b10 << 62
+_SEQ_MASK = 0xFFFFFFFF
+
+
+class EventClock:
+    """
+    Per-logger source of event timestamps and ids.
+
+    Timestamps follow the wall clock (time.time_ns()) but never repeat or
+    go backwards within one clock. Ids sort in event order: by time, then
+    by sequence number for events in the same 1/4096 ms slot.
+
+    Usage:
+        clock = EventClock()
+        timestamp_ns = clock.now_ns()
+        event_id = clock.event_id(timestamp_ns)   # 16 bytes
+    """
+
+    __slots__ = ("_last_ns", "_seq", "_node_bits")
+
+    def __init__(self, node: Optional[int] = None):
+        """
+        Args:
+            node: 30-bit node value (default: random per clock)
+        """
+        if node is None:
+            node = int.from_bytes(os.urandom(4), "big")
+        self._node_bits = _VARIANT_BITS | (node & 0x3FFFFFFF) << 32
+        self._last_ns = 0
+        self._seq = 0
+
+    def now_ns(self) -> int:
+        """Current time in ns since the Unix epoch, strictly increasing."""
+        now = time.time_ns()
+        if now <= self._last_ns:
+            now = self._last_ns + 1
+        self._last_ns = now
+        return now
+
+    def event_id(self, timestamp_ns: int) -> bytes:
+        """
+        16-byte UUIDv7-style id for an event at timestamp_ns.
+
+        Optimization: one integer expression and to_bytes(), instead of
+        os.urandom(16) plus a uuid.UUID object per event.
+        """
+        ms, sub_ms = divmod(timestamp_ns, 1_000_000)
+        seq = self._seq = (self._seq + 1) & _SEQ_MASK
+        return (
+            (ms << 80) | _VERSION_BITS | ((sub_ms << 12) // 1_000_000) << 64 | self._node_bits | seq
+        ).to_bytes(16, "big")
+
+
+def event_id_timestamp_ms(event_id: bytes) -> int:
+    """Unix time in milliseconds embedded in an EventClock id."""
+    return int.from_bytes(event_id[:6], "big")
@@ -0,0 +1,300 @@
+"""
+ICE-W Fleet Monitor
+SAP Pilot Kit v0.1 - Multi-artifact, sharded event processing
+
+Enruta eventos por artifact_id hacia loggers ICE-W repartidos en shards.
+Cada shard vive en su propio proceso y es dueño exclusivo del estado de
+sus artefactos, por lo que artefactos independientes escalan con los
+núcleos disponibles.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import multiprocessing
+import os
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ice_w_logger import ICEWLogger
+from .sap_profile import SAPProfile
+from .telemetry_store import STATES
+
+
+class _Shard:
+    """
+    Owner of a disjoint subset of ICEWLogger instances.
+
+    Runs inside a worker process (or in-process when the fleet has no
+    pool). All mutation of logger state happens here.
+    """
+
+    def __init__(self):
+        self.loggers: Dict[str, ICEWLogger] = {}
+        self.blocked: Dict[str, int] = {}
+
+    def handle(self, command: str, payload):
+        if command == "events":
+            return self._process(payload)
+        if command == "register":
+            for artifact_id, sha256, profile in payload:
+                if artifact_id not in self.loggers:
+                    self.loggers[artifact_id] = ICEWLogger(artifact_id, sha256, profile=profile)
+                    self.blocked[artifact_id] = 0
+            return len(self.loggers)
+        if command == "states":
+            return {aid: logger.state for aid, logger in self.loggers.items()}
+        if command == "blocked":
+            return dict(self.blocked)
+        raise ValueError(f"Unknown shard command: {command!r}")
+
+    def _process(self, batches) -> int:
+        processed = 0
+        for artifact_id, metrics in batches:
+            logger = self.loggers[artifact_id]
+            process_cn = logger._process_cn
+            blocked = 0
+            for cn in logger.calculate_coherence_batch(metrics).tolist():
+                process_cn(cn)
+                if logger.is_blocked:
+                    blocked += 1
+            self.blocked[artifact_id] += blocked
+            processed += len(metrics)
+        return processed
+
+
+def _shard_worker(conn):
+    """Worker process loop: serve shard commands until 'close'."""
+    shard = _Shard()
+    while True:
+        command, payload = conn.recv()
+        if command == "close":
+            conn.close()
+            return
+        try:
+            conn.send((True, shard.handle(command, payload)))
+        except Exception as exc:  # surfaced to the caller in the parent
+            conn.send((False, exc))
+
+
+class ICEWFleet:
+    """
+    Fleet-level monitor for many artifacts, each with its own ICEWLogger.
+
+    Events are buffered per artifact in the parent and shipped to their
+    shard as (N, 4) arrays on flush(). Shards process their batches
+    concurrently, so throughput grows with the number of worker processes
+    as long as events are spread over independent artifacts.
+
+    Per-artifact ordering is preserved: an artifact always maps to the
+    same shard and its events are processed in submission order.
+
+    Usage:
+        with ICEWFleet(processes=4) as fleet:
+            fleet.register("MODEL-A", sha_a)
+            fleet.submit("MODEL-A", metrics)
+            fleet.flush()
+            fleet.invalidated_artifacts()
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        """
+        Args:
+            processes: Number of shard worker processes. None uses
+                os.cpu_count(); 0 runs a single shard in-process (no pool).
+        """
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes < 0:
+            raise ValueError("processes must be >= 0")
+
+        self._local: Optional[_Shard] = None
+        self._conns = []
+        self._workers = []
+
+        if processes == 0:
+            self._local = _Shard()
+            self.n_shards = 1
+        else:
+            self.n_shards = processes
+            for _ in range(processes):
+                parent_conn, child_conn = multiprocessing.Pipe()
+                worker = multiprocessing.Process(target=_shard_worker, args=(child_conn,), daemon=True)
+                worker.start()
+                child_conn.close()
+                self._conns.append(parent_conn)
+                self._workers.append(worker)
+
+        self._shard_of: Dict[str, int] = {}
+        self._pending: Dict[str, List[np.ndarray]] = {}
+        # Batches of shards that failed during flush(), kept out of the pending buffer
+        self.failed: Dict[str, List[np.ndarray]] = {}
+
+    def shard_for(self, artifact_id: str) -> int:
+        """Stable shard index for an artifact (independent of PYTHONHASHSEED)."""
+        return zlib.crc32(artifact_id.encode('utf-8')) % self.n_shards
+
+    # --- Shard RPC -------------------------------------------------------
+
+    def _exchange(self, messages: Dict[int, tuple]) -> Tuple[Dict[int, object], Dict[int, Exception]]:
+        """
+        Send one message per shard, then collect every reply (shards run in parallel).
+
+        A reply is read from every shard even when an earlier one failed, so
+        no stale reply is left in a pipe for the next call to pick up.
+
+        Returns:
+            ({shard: result} for successful shards, {shard: exception} for failed ones)
+        """
+        replies: Dict[int, object] = {}
+        errors: Dict[int, Exception] = {}
+        if self._local is not None:
+            for shard, msg in messages.items():
+                try:
+                    replies[shard] = self._local.handle(*msg)
+                except Exception as exc:
+                    errors[shard] = exc
+            return replies, errors
+
+        for shard, msg in messages.items():
+            self._conns[shard].send(msg)
+        for shard in messages:
+            ok, result = self._conns[shard].recv()
+            if ok:
+                replies[shard] = result
+            else:
+                errors[shard] = result
+        return replies, errors
+
+    def _broadcast(self, messages: Dict[int, tuple]) -> Dict[int, object]:
+        """Like _exchange(), but raise the first shard error once all replies are in."""
+        replies, errors = self._exchange(messages)
+        if errors:
+            raise next(iter(errors.values()))
+        return replies
+
+    def _query_all(self, command: str) -> Dict[str, object]:
+        merged = {}
+        for result in self._broadcast({s: (command, None) for s in range(self.n_shards)}).values():
+            merged.update(result)
+        return merged
+
+    # --- Ingestion -------------------------------------------------------
+
+    def register(self, artifact_id: str, sha256: str, profile: Optional[SAPProfile] = None):
+        """Create the artifact's ICEWLogger on its shard (idempotent)."""
+        shard = self.shard_for(artifact_id)
+        self._broadcast({shard: ("register", [(artifact_id, sha256, profile)])})
+        self._shard_of[artifact_id] = shard
+        self._pending.setdefault(artifact_id, [])
+
+    def register_many(self, artifacts: Dict[str, str], profile: Optional[SAPProfile] = None):
+        """Register {artifact_id: sha256} with one round-trip per shard, all with the same profile."""
+        by_shard: Dict[int, list] = {}
+        for artifact_id, sha256 in artifacts.items():
+            by_shard.setdefault(self.shard_for(artifact_id), []).append((artifact_id, sha256, profile))
+        self._broadcast({shard: ("register", items) for shard, items in by_shard.items()})
+        for artifact_id in artifacts:
+            self._shard_of[artifact_id] = self.shard_for(artifact_id)
+            self._pending.setdefault(artifact_id, [])
+
+    def submit(self, artifact_id: str, metrics: dict):
+        """
+        Buffer one event for an artifact; processed on the next flush().
+
+        Raises:
+            KeyError: Unknown artifact or missing IPHY metric
+            ValueError: Non-numeric, non-finite or out-of-range metric
+                (rejected here so it never reaches a shard)
+        """
+        if artifact_id not in self._shard_of:
+            raise KeyError(f"Unknown artifact: {artifact_id}")
+        self._pending[artifact_id].append(ICEWLogger._checked_metrics_array([metrics]))
+
+    def submit_batch(self, artifact_id: str, metrics_batch):
+        """Buffer a batch (sequence of dicts or (N, 4) array) for an artifact; validated like submit()."""
+        if artifact_id not in self._shard_of:
+            raise KeyError(f"Unknown artifact: {artifact_id}")
+        self._pending[artifact_id].append(ICEWLogger._checked_metrics_array(metrics_batch))
+
+    def flush(self) -> int:
+        """
+        Ship all buffered events to their shards and wait for processing.
+
+        If a shard fails, the events of the shards that succeeded are
+        cleared and the failed shard's batches are moved to `failed`
+        ({artifact_id: [batch, ...]}) so later flushes are not stuck on
+        them; the first shard error is then raised. Failed batches can be
+        inspected and resubmitted with submit_batch().
+
+        Returns:
+            Number of events processed
+        """
+        by_shard: Dict[int, list] = {}
+        for artifact_id, pending in self._pending.items():
+            if not pending:
+                continue
+            # Items were validated into (N, 4) float64 arrays by submit()/submit_batch()
+            by_shard.setdefault(self._shard_of[artifact_id], []).append(
+                (artifact_id, np.concatenate(pending) if len(pending) > 1 else pending[0])
+            )
+
+        if not by_shard:
+            return 0
+        replies, errors = self._exchange({shard: ("events", batches) for shard, batches in by_shard.items()})
+        for shard in replies:
+            for artifact_id, _ in by_shard[shard]:
+                self._pending[artifact_id] = []
+        # Isolate what a failed shard did not confirm instead of retrying it forever
+        for shard in errors:
+            for artifact_id, batch in by_shard[shard]:
+                self.failed.setdefault(artifact_id, []).append(batch)
+                self._pending[artifact_id] = []
+        if errors:
+            raise next(iter(errors.values()))
+        return sum(replies.values())
+
+    # --- Fleet-wide queries ----------------------------------------------
+
+    def states(self) -> Dict[str, str]:
+        """Current SAP state of every registered artifact."""
+        return self._query_all("states")
+
+    def invalidated_artifacts(self) -> List[str]:
+        """Sorted artifact ids currently INVALIDATED (output blocked)."""
+        return sorted(aid for aid, state in self.states().items() if state == "INVALIDATED")
+
+    def state_counts(self) -> Dict[str, int]:
+        """Number of artifacts in each SAP state."""
+        counts = {state: 0 for state in STATES}
+        for state in self.states().values():
+            counts[state] += 1
+        return counts
+
+    def blocked_counts(self) -> Dict[str, int]:
+        """Number of events answered with BLOCK_OUTPUT, per artifact."""
+        return self._query_all("blocked")
+
+    # --- Lifecycle -------------------------------------------------------
+
+    def close(self):
+        """Stop shard workers. Buffered, unflushed events are discarded."""
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._conns = []
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -13,12 +13,67 @@ Registro IMPI: EXP-3495968
 License: MIT
 """
 
+import itertools
 import json
-import os
-import uuid
 import math
-from datetime import datetime, timezone
+from array import array
 from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import certificates, checkpoint
+from .event_clock import EventClock
+from .instrumentation import Instrumentation, logger_stats
+from .rollups import EpochRollups
+from .sap_profile import DEFAULT_PROFILE, MIN_WINDOW, SAPProfile
+from .telemetry_export import open_sink, write_ndjson
+from .telemetry_store import (
+    FLAG_BLOCKED,
+    FLAG_THRESHOLD_CROSSED,
+    STATE_CODES,
+    STATES,
+    TelemetryBuffer,
+    format_timestamp_ns,
+    parse_timestamp_ns,
+)
+
+# Orden canónico del vector IPHY (columnas de los lotes NumPy)
+IPHY_KEYS = (
+    'semantic_stability',
+    'output_stability',
+    'constraint_compliance',
+    'decision_entropy',
+)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """
+    Compact per-event outcome of ICEWLogger.process_events().
+
+    Attributes:
+        state_codes: int8 array, SAP state after each event (index into STATES)
+        blocked: bool array, True where the event was answered with BLOCK_OUTPUT
+        first_seq: Telemetry sequence number of the first event; entries
+            not yet compacted are in telemetry_log at first_seq - base_seq
+    """
+    state_codes: np.ndarray
+    blocked: np.ndarray
+    first_seq: int
+
+    def __len__(self) -> int:
+        return len(self.state_codes)
+
+    @property
+    def states(self) -> List[str]:
+        return [STATES[code] for code in self.state_codes.tolist()]
+
+    @property
+    def actions(self) -> List[str]:
+        return ["BLOCK_OUTPUT" if b else "ALLOW" for b in self.blocked.tolist()]
 
 
 class ICEWLogger:
@@ -26,7 +81,7 @@ class ICEWLogger:
     Internal Coherence Engine - Watcher (ICE-W)
     Implementación del Protocolo SAP v0.1 para AHI Governance.
 
-    State Machine:
+    State Machine (default profile):
         SOVEREIGN → DEGRADED (k=3) → INVALIDATED (m=10)
                  ←   RECOVERY (p=50)  ←
 
@@ -34,26 +89,33 @@ class ICEWLogger:
     and ensures fail-safe behavior.
     """
 
-    def __init__(self, artifact_id: str, sha256: str):
+    def __init__(self, artifact_id: str, sha256: str, profile: Optional[SAPProfile] = None):
         """
         Initialize the ICE-W Logger.
 
         Args:
             artifact_id: Unique identifier for the system under test
             sha256: Hash of the model/artifact being monitored
+            profile: SAP protocol parameters (default: DEFAULT_PROFILE)
         """
         self.artifact_id = artifact_id
         self.sha256 = sha256
 
-        # Parámetros del Protocolo SAP
-        self.W_size = 100      # Tamaño de ventana estadística
-        self.sigma = 0.73      # Umbral de deriva (validado empíricamente)
-        self.k_limit = 3       # Umbral para DEGRADED
-        self.m_limit = 10      # Umbral para INVALIDATED
-        self.p_recovery = 50   # Eventos necesarios para RECOVERY
+        # Parámetros del Protocolo SAP (perfil inmutable y validado)
+        if profile is None:
+            profile = DEFAULT_PROFILE
+        if not isinstance(profile, SAPProfile):
+            raise TypeError(f"profile must be a SAPProfile, got {type(profile).__name__}")
+        self.profile = profile
+
+        # Optimization: Per-instance copies of the thresholds read on every event
+        self._sigma = profile.sigma
+        self._k_limit = profile.k_limit
+        self._m_limit = profile.m_limit
+        self._p_recovery = profile.p_recovery
 
         # Memoria Estadística (Ventana W)
-        self.window = deque(maxlen=self.W_size)
+        self.window = deque(maxlen=profile.W_size)
 
         # Máquina de Estados
         self.state = "SOVEREIGN"
@@ -62,35 +124,83 @@ class ICEWLogger:
         self.p_counter = 0
         self.is_blocked = False
 
-        # Telemetry log
-        self.telemetry_log = []
+        # Telemetry log (columnar; entries are materialized on read)
+        self.telemetry_log = TelemetryBuffer(artifact_id, sha256)
 
         # Retention Policy
         self.max_log_size = 100000
-        self.epoch_summaries = []
+        # Epoch summaries with bounded hour/day/month rollups (see rollups.py)
+        self.rollups = EpochRollups()
+
+        # Streaming export cursors (next event / epoch summary sequence)
+        self._export_cursor = 0
+        self._export_summary_cursor = 0
 
         # Performance: Incremental stats for current epoch
+        # (covers logged and decision-only events alike)
+        self._stat_event_count = 0
+        self._stat_start_ns = 0
+        self._stat_end_ns = 0
         self._stat_cn_sum = 0.0
         self._stat_cn_min = float('inf')
         self._stat_cn_max = float('-inf')
         self._stat_degraded_count = 0
         self._stat_invalidated_count = 0
 
-        # Optimization: Incremental stats for sliding window (O(1) variance)
-        self._window_sum_x = 0.0
-        self._window_sum_sq_x = 0.0
-        self._drift_counter = 0
-
-    def _compact_logs(self):
-        """
-        Summarize granular telemetry logs into an epoch summary to free memory.
-        """
-        count = len(self.telemetry_log)
-        if count == 0:
-            return
-
-        start_time = self.telemetry_log[0]['event']['timestamp']
-        end_time = self.telemetry_log[-1]['event']['timestamp']
+        # Write-ahead log of raw IPHY vectors (see wal.py), optional
+        self._wal = None
+
+        # Monotonic event timestamps and sortable ids (see event_clock.py)
+        self._clock = EventClock()
+
+        # Optimization: Windowed Welford stats for the sliding window (O(1) variance)
+        self._window_mean = 0.0
+        self._window_m2 = 0.0      # Sum of squared deviations from the mean
+        self._window_run = 0       # Trailing run of identical values
+        self._block_n = 0          # Add-only accumulator of the current block
+        self._block_mean = 0.0
+        self._block_m2 = 0.0
+
+        # Opt-in per-phase timings and counters (see instrumentation.py)
+        self.instrumentation: Optional[Instrumentation] = None
+
+    # Parámetros del protocolo (solo lectura; se fijan con el perfil)
+
+    @property
+    def W_size(self) -> int:
+        """Tamaño de ventana estadística."""
+        return self.profile.W_size
+
+    @property
+    def sigma(self) -> float:
+        """Umbral de deriva (validado empíricamente)."""
+        return self.profile.sigma
+
+    @property
+    def k_limit(self) -> int:
+        """Umbral para DEGRADED."""
+        return self.profile.k_limit
+
+    @property
+    def m_limit(self) -> int:
+        """Umbral para INVALIDATED."""
+        return self.profile.m_limit
+
+    @property
+    def p_recovery(self) -> int:
+        """Eventos necesarios para RECOVERY."""
+        return self.profile.p_recovery
+
+    @property
+    def epoch_summaries(self) -> List[dict]:
+        """Retained epoch summaries, oldest first (older ones live on in the rollups)."""
+        return self.rollups.epochs
+
+    def _epoch_summary(self) -> dict:
+        """Summary of the current epoch from its incremental statistics."""
+        count = self._stat_event_count
+        start_time = format_timestamp_ns(self._stat_start_ns)
+        end_time = format_timestamp_ns(self._stat_end_ns)
 
         # Optimization: Use incrementally accumulated stats (O(1))
         # Replaces previous implementation that iterated over the log list
@@ -102,7 +212,7 @@ class ICEWLogger:
 
         cn_avg = cn_sum / count
 
-        summary = {
+        return {
             "type": "epoch_summary",
             "start_time": start_time,
             "end_time": end_time,
@@ -118,16 +228,67 @@ class ICEWLogger:
             }
         }
 
-        self.epoch_summaries.append(summary)
-        self.telemetry_log = []
+    def _compact_logs(self):
+        """
+        Summarize granular telemetry logs into an epoch summary to free memory.
+
+        The summary is also folded into its hour, day and month rollups;
+        every tier keeps a bounded number of entries.
+        """
+        if self._stat_event_count == 0:
+            return
+
+        self.rollups.add(self._epoch_summary(), self._stat_start_ns, self._stat_end_ns, self._stat_cn_sum)
+        self.telemetry_log.clear()
 
         # Reset stats
+        self._stat_event_count = 0
         self._stat_cn_sum = 0.0
         self._stat_cn_min = float('inf')
         self._stat_cn_max = float('-inf')
         self._stat_degraded_count = 0
         self._stat_invalidated_count = 0
 
+    @staticmethod
+    def _as_ns(value) -> Optional[int]:
+        """Epoch ns from an int, an ISO-8601 string or a datetime (None passes through)."""
+        if value is None or isinstance(value, int):
+            return value
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return parse_timestamp_ns(value)
+
+    def summarize(self, start=None, end=None) -> Optional[dict]:
+        """
+        Merged Cn and violation summary of every epoch starting in [start, end).
+
+        Covers compacted epochs (through the hour/day/month rollups) and the
+        epoch still being filled. Each tier is searched with bisect, so the
+        cost does not grow with the age of the logger.
+
+        Args:
+            start, end: Epoch ns, ISO-8601 strings or datetimes (None = unbounded)
+
+        Returns:
+            "range_summary" dict with the epoch_summary fields plus
+            epoch_count and exact (False if evicted detail was replaced by
+            a coarser period), or None if no epoch starts in the range
+        """
+        open_epoch = None
+        if self._stat_event_count:
+            open_epoch = (self._epoch_summary(), self._stat_start_ns, self._stat_end_ns, self._stat_cn_sum)
+        return self.rollups.summarize(self._as_ns(start), self._as_ns(end), open_epoch=open_epoch)
+
+    def rollup_summaries(self, tier: str = "hour", start=None, end=None) -> List[dict]:
+        """
+        Retained summaries of one tier ("epoch", "hour", "day" or "month") in a time range.
+
+        Args:
+            tier: Rollup tier
+            start, end: Epoch ns, ISO-8601 strings or datetimes (None = unbounded)
+        """
+        return self.rollups.summaries(tier, self._as_ns(start), self._as_ns(end))
+
     def calculate_coherence(self, metrics: dict) -> float:
         """
         Calcula Cn basado en el vector de estabilidad IPHY.
@@ -150,6 +311,61 @@ class ICEWLogger:
             + (1 - metrics['decision_entropy'])  # Entropy inverted
         ) / 4.0
 
+    def calculate_coherence_batch(self, metrics_batch) -> np.ndarray:
+        """
+        Vectorized Cn for a whole batch of IPHY vectors.
+
+        Applies exactly the same float operations as calculate_coherence,
+        so every element is bit-identical to the per-event result.
+
+        Args:
+            metrics_batch: Sequence of metric dicts or an (N, 4) array
+                with columns ordered as IPHY_KEYS
+
+        Returns:
+            Float64 array of N coherence scores
+        """
+        m = self._as_metrics_array(metrics_batch)
+        return (m[:, 0] + m[:, 1] + m[:, 2] + (1 - m[:, 3])) / 4.0
+
+    @staticmethod
+    def _as_metrics_array(metrics_batch) -> np.ndarray:
+        """Normalize a batch of IPHY metrics into an (N, 4) float64 array."""
+        if isinstance(metrics_batch, np.ndarray):
+            m = np.asarray(metrics_batch, dtype=np.float64)
+        else:
+            m = np.array(
+                [[metrics[key] for key in IPHY_KEYS] for metrics in metrics_batch],
+                dtype=np.float64,
+            )
+            if m.size == 0:
+                m = m.reshape(0, len(IPHY_KEYS))
+
+        if m.ndim != 2 or m.shape[1] != len(IPHY_KEYS):
+            raise ValueError(
+                f"metrics_batch must have shape (N, {len(IPHY_KEYS)}), got {m.shape}"
+            )
+        return m
+
+    @classmethod
+    def _checked_metrics_array(cls, metrics_batch) -> np.ndarray:
+        """
+        _as_metrics_array() that also rejects values a window cannot absorb.
+
+        Raises:
+            ValueError: Non-numeric, non-finite (NaN, e.g. from None) or
+                outside [0, 1]
+        """
+        try:
+            m = cls._as_metrics_array(metrics_batch)
+        except TypeError as e:
+            raise ValueError(f"IPHY metrics must be numbers: {e}") from None
+        if not np.isfinite(m).all():
+            raise ValueError("IPHY metrics must be finite")
+        if ((m < 0.0) | (m > 1.0)).any():
+            raise ValueError("IPHY metrics must be within [0, 1]")
+        return m
+
     def process_event(self, raw_metrics: dict) -> dict:
         """
         Process a single inference event and update SAP state.
@@ -160,98 +376,320 @@ class ICEWLogger:
         Returns:
             SAP telemetry log entry
         """
-        cn = self.calculate_coherence(raw_metrics)
+        if self._wal is not None:
+            self._wal.append(raw_metrics)
+        self._process_cn(self.calculate_coherence(raw_metrics))
+        return self.telemetry_log[-1]
 
-        # 1. Análisis de Deriva (Invariante de Trayectoria)
-        if len(self.window) >= 10:
-            w_len = len(self.window)
+    def process_events(self, metrics_batch: Union[Sequence[dict], np.ndarray]) -> BatchResult:
+        """
+        Process a batch of inference events in arrival order.
+
+        Coherence is computed for the whole batch at once; drift analysis
+        and the state machine are order-dependent and run per event over
+        the precomputed Cn values. State and telemetry are identical to
+        calling process_event in a loop.
+
+        Optimization: No log entry dict is built per event; the result
+        holds one state code and one blocked flag per event, and the full
+        entries stay in the columnar telemetry_log.
+
+        Args:
+            metrics_batch: Sequence of metric dicts or an (N, 4) array
+                with columns ordered as IPHY_KEYS
+
+        Returns:
+            BatchResult with the state and action of every event
+        """
+        metrics = self._as_metrics_array(metrics_batch)
+        if self._wal is not None:
+            self._wal.append_array(metrics)
+        cn_values = self.calculate_coherence_batch(metrics)
+        first_seq = self.telemetry_log.base_seq + len(self.telemetry_log)
+
+        process_cn = self._process_cn
+        codes = STATE_CODES
+        states = array('b')
+        blocked = array('b')
+        add_state = states.append
+        add_blocked = blocked.append
+        # tolist() yields Python floats, keeping the scalar path bit-exact
+        for cn in cn_values.tolist():
+            process_cn(cn)
+            add_state(codes[self.state])
+            add_blocked(self.is_blocked)
+        return BatchResult(
+            np.frombuffer(states, dtype=np.int8),
+            np.frombuffer(blocked, dtype=np.int8).astype(bool),
+            first_seq,
+        )
+
+    def _process_cn(self, cn: float):
+        """
+        Run drift analysis, state transition and logging for one Cn value.
+
+        The event is appended to telemetry_log; no log dict is built here.
+
+        Args:
+            cn: Coherence score of the event
+        """
+        delta_cn, threshold_crossed = self._decide(cn)
+        self._record(
+            cn, delta_cn, threshold_crossed, self.state,
+            self.k_counter, self.m_counter, self.p_counter,
+            self.is_blocked, self._clock.now_ns(),
+        )
+
+    def _decide(self, cn: float):
+        """
+        Decision phase: drift analysis, state transition and window update.
+
+        This is everything the ALLOW/BLOCK answer depends on. It must run
+        synchronously and in event order; logging can happen later.
 
-            # Optimization: Incremental stats calculation (O(1))
-            # Uses formula: Var(X) = E[X^2] - (E[X])^2
-            sum_x = self._window_sum_x
-            sum_sq_x = self._window_sum_sq_x
+        Args:
+            cn: Coherence score of the event
 
-            mean_w = sum_x / w_len
-            variance = (sum_sq_x / w_len) - (mean_w * mean_w)
+        Returns:
+            (delta_cn, threshold_crossed)
+        """
+        window = self.window
+        w_len = len(window)
+
+        # 1. Análisis de Deriva (Invariante de Trayectoria)
+        if w_len >= MIN_WINDOW:
+            # Optimization: Welford mean/M2 maintained per event (O(1))
+            mean_w = self._window_mean
 
             # Population standard deviation (ddof=0) to match np.std
-            # Clamp variance to 0 to handle floating point precision issues
-            std_w = math.sqrt(max(0.0, variance)) + 1e-6
+            std_w = math.sqrt(self._window_m2 / w_len) + 1e-6
 
             delta_cn = abs(cn - mean_w)
-            threshold_crossed = delta_cn > (self.sigma * std_w)
+            threshold_crossed = delta_cn > (self._sigma * std_w)
         else:
             delta_cn = 0.0
             threshold_crossed = False
 
         # 2. Transición de Estados (Fusible Lógico)
-        self._update_state(threshold_crossed)
+        # Optimization: A stable SOVEREIGN event with k=0 changes nothing
+        if threshold_crossed or self.k_counter or self.state != "SOVEREIGN":
+            self._update_state(threshold_crossed)
+
+        # Update sliding window stats (O(1)), windowed Welford: updates work on
+        # deviations from the mean, so there is no E[X^2] - E[X]^2 cancellation.
+        run = self._window_run + 1 if w_len and window[-1] == cn else 1
+        old_mean = self._window_mean
+        if w_len == window.maxlen:
+            removed = window[0]
+            change = cn - removed
+            mean = old_mean + change / w_len
+            m2 = self._window_m2 + change * ((cn - mean) + (removed - old_mean))
+        else:
+            w_len += 1
+            change = cn - old_mean
+            mean = old_mean + change / w_len
+            m2 = self._window_m2 + change * (cn - mean)
+        window.append(cn)
+
+        # Sliding updates never forget their rounding error, so a second,
+        # add-only accumulator restarts every W_size events; when it spans
+        # the whole window it replaces the sliding one. This replaces the
+        # periodic full recompute with a constant amount of work per event.
+        block_n = self._block_n + 1
+        change = cn - self._block_mean
+        block_mean = self._block_mean + change / block_n
+        block_m2 = self._block_m2 + change * (cn - block_mean)
+        if block_n == w_len:
+            mean, m2 = block_mean, block_m2
+            block_n, block_mean, block_m2 = 0, 0.0, 0.0
+        self._block_n, self._block_mean, self._block_m2 = block_n, block_mean, block_m2
+
+        # A window holding one repeated value is exactly (value, 0)
+        if run >= w_len:
+            run, mean, m2 = w_len, cn, 0.0
+        self._window_run = run
+        self._window_mean = mean
+        self._window_m2 = m2 if m2 > 0.0 else 0.0
+
+        return delta_cn, threshold_crossed
+
+    def _rebuild_window_stats(self):
+        """Recompute mean, M2 and the trailing run from the window contents."""
+        window = self.window
+        n = len(window)
+        mean = math.fsum(window) / n if n else 0.0
+        run = 0
+        for x in reversed(window):
+            if x != window[-1]:
+                break
+            run += 1
+        self._window_run = run
+        if n and run >= n:
+            self._window_mean, self._window_m2 = window[-1], 0.0
+        else:
+            self._window_mean = mean
+            self._window_m2 = math.fsum((x - mean) * (x - mean) for x in window)
+
+    def _record(self, cn: float, delta_cn: float, threshold_crossed: bool, state: str,
+                k: int, m: int, p: int, blocked: bool, timestamp_ns: int):
+        """
+        Logging phase: epoch statistics, compaction and telemetry append.
+
+        Takes a snapshot of the state produced by _decide() so it can be
+        deferred (e.g. to a background task) without changing the record.
+        """
+        cn_rounded = self._record_stats(cn, state, timestamp_ns)
+
+        # 3. Construcción del Log (SAP-Telemetry-0.1), almacenado en columnas
+        flags = FLAG_THRESHOLD_CROSSED if threshold_crossed else 0
+        if blocked:
+            flags |= FLAG_BLOCKED
+
+        self.telemetry_log.append(
+            cn_rounded,
+            round(float(delta_cn), 4),
+            flags,
+            STATE_CODES[state],
+            k,
+            m,
+            p,
+            timestamp_ns,
+            self._clock.event_id(timestamp_ns),
+        )
+
+    def _record_stats(self, cn: float, state: str, timestamp_ns: int) -> float:
+        """
+        Fold one event into the current epoch statistics (O(1)).
+
+        Compacts first when the epoch is full, so a summary covers exactly
+        max_log_size events.
+
+        Returns:
+            The rounded Cn as stored in the log
+        """
+        if self._stat_event_count >= self.max_log_size:
+            self._compact_logs()
 
         # Optimization: Incremental stats update (O(1))
         # Use rounded cn to match log entry
         cn_rounded = round(float(cn), 4)
 
+        if self._stat_event_count == 0:
+            self._stat_start_ns = timestamp_ns
+        self._stat_end_ns = timestamp_ns
+        self._stat_event_count += 1
+
         self._stat_cn_sum += cn_rounded
         if cn_rounded < self._stat_cn_min:
             self._stat_cn_min = cn_rounded
         if cn_rounded > self._stat_cn_max:
             self._stat_cn_max = cn_rounded
 
-        if self.state == "DEGRADED":
+        if state == "DEGRADED":
             self._stat_degraded_count += 1
-        elif self.state == "INVALIDATED":
+        elif state == "INVALIDATED":
             self._stat_invalidated_count += 1
 
-        # 3. Construcción del Log (SAP-Telemetry-0.1)
-        log_entry = {
-            "schema_version": "SAP-Telemetry-0.1",
-            "artifact": {
-                "id": self.artifact_id,
-                "hash": self.sha256
-            },
-            "event": {
-                "id": str(uuid.uuid4()),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "state": self.state
-            },
-            "metrics": {
-                "cn": cn_rounded,
-                "delta": round(float(delta_cn), 4),
-                "threshold_crossed": bool(threshold_crossed)
-            },
-            "autarchy": {
-                "k": self.k_counter,
-                "m": self.m_counter,
-                "p": self.p_counter,
-                "action": "BLOCK_OUTPUT" if self.is_blocked else "ALLOW"
-            }
-        }
+        return cn_rounded
+
+    def decide(self, raw_metrics: dict) -> Tuple[str, str]:
+        """
+        Decision-only fast path: answer "is output blocked?" for one event.
 
-        # Update sliding window stats (O(1))
-        removed = 0.0
-        if len(self.window) == self.window.maxlen:
-            removed = self.window[0]
+        Updates the statistical window, the k/m/p counters and the SAP state
+        exactly like process_event, and folds the event into the epoch
+        statistics used by _compact_logs, but generates no event id and
+        appends nothing to telemetry_log.
 
-        self.window.append(cn)
+        Args:
+            raw_metrics: IPHY metrics for this event
 
-        self._window_sum_x += cn
-        self._window_sum_x -= removed
-        self._window_sum_sq_x += (cn * cn)
-        self._window_sum_sq_x -= (removed * removed)
+        Returns:
+            (action, state), e.g. ("ALLOW", "SOVEREIGN")
+        """
+        if self._wal is not None:
+            self._wal.append(raw_metrics)
+        cn = self.calculate_coherence(raw_metrics)
+        self._decide(cn)
+        state = self.state
+        self._record_stats(cn, state, self._clock.now_ns())
+        return ("BLOCK_OUTPUT" if self.is_blocked else "ALLOW"), state
 
-        # Periodic re-computation to prevent floating point drift
-        self._drift_counter += 1
-        if self._drift_counter >= 1000:
-            self._window_sum_x = sum(self.window)
-            self._window_sum_sq_x = sum(x * x for x in self.window)
-            self._drift_counter = 0
+    def attach_wal(self, wal):
+        """
+        Record the raw IPHY vector of every subsequent event in a WAL.
 
-        # Compact logs if limit reached
-        if len(self.telemetry_log) >= self.max_log_size:
-            self._compact_logs()
+        Args:
+            wal: TelemetryWAL (or None to detach)
+        """
+        self._wal = wal
+
+    def enable_instrumentation(self) -> Instrumentation:
+        """
+        Start recording per-phase nanosecond histograms and event counters.
+
+        Optimization: Timing wrappers are installed on this instance only,
+        so loggers without instrumentation keep the unwrapped hot path.
+
+        Returns:
+            The Instrumentation collecting for this logger (the existing
+            one if already enabled)
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+            self.instrumentation.attach(self)
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        """Stop recording and drop the collected timings and counters."""
+        if self.instrumentation is not None:
+            self.instrumentation.detach(self)
+            self.instrumentation = None
+
+    def stats(self) -> dict:
+        """
+        State gauges, plus counters and per-phase timings when instrumented.
+
+        Returns:
+            See instrumentation.logger_stats()
+        """
+        return logger_stats(self)
+
+    def snapshot(self, include_log: bool = True) -> bytes:
+        """
+        Serialize the complete logger state into a versioned binary snapshot.
+
+        Captures the statistical window and its running mean/M2, the k/m/p
+        counters, the SAP state, epoch statistics and summaries, export
+        cursors and (optionally) the buffered telemetry columns.
+
+        Args:
+            include_log: Include buffered telemetry. Without it the snapshot
+                is small enough to take every few events.
+
+        Returns:
+            Snapshot bytes (see checkpoint.py for the format)
+        """
+        return checkpoint.dump_state(self, include_log=include_log)
+
+    @classmethod
+    def restore(cls, data: bytes) -> "ICEWLogger":
+        """
+        Rebuild a logger from snapshot() bytes, without warm-up replay.
+
+        Raises:
+            ValueError: If the snapshot is corrupted or of an unknown version
+        """
+        return checkpoint.load_state(cls, data)
 
-        self.telemetry_log.append(log_entry)
-        return log_entry
+    def save_checkpoint(self, path: str, include_log: bool = True):
+        """Atomically write a snapshot to path."""
+        checkpoint.write_checkpoint(self, path, include_log=include_log)
+
+    @classmethod
+    def load_checkpoint(cls, path: str) -> "ICEWLogger":
+        """Restore a logger from a file written by save_checkpoint()."""
+        return checkpoint.read_checkpoint(cls, path)
 
     def _update_state(self, crossed: bool):
         """
@@ -266,10 +704,10 @@ class ICEWLogger:
         if self.state != "INVALIDATED":
             if crossed:
                 self.k_counter += 1
-                if self.k_counter >= self.k_limit:
+                if self.k_counter >= self._k_limit:
                     self.state = "DEGRADED"
                     self.m_counter += 1
-                    if self.m_counter >= self.m_limit:
+                    if self.m_counter >= self._m_limit:
                         self.state = "INVALIDATED"
                         self.is_blocked = True
             else:
@@ -283,7 +721,7 @@ class ICEWLogger:
         else:
             if not crossed:
                 self.p_counter += 1
-                if self.p_counter >= self.p_recovery:
+                if self.p_counter >= self._p_recovery:
                     self.state = "SOVEREIGN"
                     self.p_counter = 0
                     self.m_counter = 0
@@ -295,48 +733,23 @@ class ICEWLogger:
     def generate_certificate(self, output_path: str = None) -> dict:
         """
         Generate an Event Sovereignty Certificate based on test results.
-        Reads 'certificate_template.md' and fills placeholders.
-        """
-        cert_id = f"CERT-SAP-2026-{self.artifact_id[:8]}"
-        issue_date = datetime.now(timezone.utc).isoformat()
-        final_state = self.state
-        status_result = "PASSED (BLOCKED)" if self.is_blocked else "FAILED"
-
-        cert_data = {
-            "certificate_id": cert_id,
-            "issue_date": issue_date,
-            "artifact_id": self.artifact_id,
-            "sha256": self.sha256,
-            "final_state": final_state,
-            "result": status_result
-        }
+        Fills the placeholders of 'certificate_template.md'.
+
+        Optimization: The template is read and pre-parsed once per process
+        (see certificates.py); use CertificateRenderer.write_batch() or
+        write_archive() to certify many loggers at once.
+        """
+        cert_data = certificates.certificate_data(self)
 
         # Determine if outputting JSON or MD based on extension
         if output_path and output_path.endswith('.md'):
-            template_path = os.path.join(os.path.dirname(__file__), 'certificate_template.md')
-            if os.path.exists(template_path):
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    template = f.read()
-
-                # Fill Placeholders using str.format for performance
-                replacements = {
-                    "CERT_ID": cert_id,
-                    "DATE": issue_date,
-                    "STATUS": final_state,
-                    "ARTIFACT_ID": self.artifact_id,
-                    "SHA256_HASH": self.sha256,
-                    "EVENTS_PROCESSED": str(len(self.telemetry_log)),
-                    "K_COUNT": str(self.k_counter),
-                    "M_COUNT": str(self.m_counter),
-                    "P_COUNT": str(self.p_counter),
-                    "RESULT": status_result
-                }
-                filled_content = template.format(**replacements)
-
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(filled_content)
+            try:
+                renderer = certificates.default_renderer()
+            except FileNotFoundError:
+                print(f"Warning: Template not found at {certificates.TEMPLATE_PATH}")
             else:
-                print(f"Warning: Template not found at {template_path}")
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(renderer.render(self, cert_data["issue_date"]))
 
         elif output_path:
             with open(output_path, 'w') as f:
@@ -345,13 +758,71 @@ class ICEWLogger:
         return cert_data
 
     def export_telemetry(self, output_path: str):
-        """Export full telemetry log as JSON, including historical summaries."""
-        export_data = {
-            "epoch_summaries": self.epoch_summaries,
-            "current_window": self.telemetry_log
-        }
+        """
+        Export full telemetry log as JSON, including historical summaries.
+
+        Historical summaries are the month, day and hour rollups plus the
+        retained epoch summaries, so the document stays bounded however
+        long the logger has been running.
+
+        Optimization: The document is written entry by entry instead of
+        building it in memory first. The bytes are identical to
+        json.dump({"rollups": {"month": ..., "day": ..., "hour": ...},
+        "epoch_summaries": ..., "current_window": [...]}).
+        """
         with open(output_path, 'w') as f:
-            json.dump(export_data, f)
+            f.write('{"rollups": {')
+            separator = ''
+            for tier in ("month", "day", "hour"):
+                f.write(f'{separator}"{tier}": ')
+                json.dump(self.rollups.summaries(tier), f)
+                separator = ', '
+            f.write('}, "epoch_summaries": ')
+            json.dump(self.epoch_summaries, f)
+            f.write(', "current_window": [')
+            separator = ''
+            for entry in self.telemetry_log:
+                f.write(separator)
+                f.write(json.dumps(entry))
+                separator = ', '
+            f.write(']}')
+
+    def export_telemetry_ndjson(self, output_path: str, compression: str = "infer",
+                                incremental: bool = True) -> int:
+        """
+        Stream telemetry as NDJSON, one SAP-Telemetry-0.1 record per line.
+
+        Epoch summaries are written first (they carry "type": "epoch_summary"),
+        followed by the buffered event records. Epochs evicted from the
+        retained summaries before an incremental export are only covered
+        by the hour/day/month rollups.
+
+        Args:
+            output_path: Destination file
+            compression: "gzip", "bz2", "lzma", None, or "infer" from the suffix
+            incremental: Append only records produced since the previous
+                export. Events compacted in between are covered by their
+                epoch summary. If False, rewrite the file with everything
+                currently held.
+
+        Returns:
+            Number of records written
+        """
+        log = self.telemetry_log
+        rollups = self.rollups
+        if incremental:
+            summaries = rollups.epochs[max(0, self._export_summary_cursor - rollups.epoch_base_seq):]
+            start = max(0, self._export_cursor - log.base_seq)
+        else:
+            summaries = self.epoch_summaries
+            start = 0
+
+        with open_sink(output_path, compression, append=incremental) as sink:
+            written = write_ndjson(itertools.chain(summaries, log.entries(start)), sink)
+
+        self._export_summary_cursor = rollups.epoch_base_seq + len(rollups.epochs)
+        self._export_cursor = log.base_seq + len(log)
+        return written
 
 
 # --- Ejemplo de Uso ---
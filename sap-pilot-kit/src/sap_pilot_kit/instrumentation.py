@@ -0,0 +1,382 @@
+"""
+ICE-W Instrumentation
+SAP Pilot Kit v0.1 - Opt-in per-phase timings and counters
+
+Mide, por logger y bajo demanda, cuánto tiempo consume cada fase de
+process_event (coherencia, análisis de deriva, máquina de estados,
+registro y compactación) en histogramas de nanosegundos, junto con
+contadores de eventos por estado, cruces de umbral y compactaciones.
+Se exporta con ICEWLogger.stats() o en formato de texto de Prometheus.
+
+Phases:
+    event       whole process_event() / decide() call
+    coherence   calculate_coherence()
+    drift       _decide() minus the state machine (drift analysis, window stats)
+    state       _update_state()
+    log         _record() minus compaction (epoch stats, columnar append, event id)
+    compaction  _compact_logs()
+
+process_events() and the service batch route compute coherence for the
+whole batch at once, so they feed every phase except event and coherence.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import os
+import time
+from typing import Dict, Iterable, List, Union
+
+PHASES = ("event", "coherence", "drift", "state", "log", "compaction")
+
+# Methods replaced on the instance while instrumentation is enabled
+WRAPPED = ("process_event", "decide", "calculate_coherence", "_decide", "_update_state",
+           "_record", "_compact_logs")
+
+# Histogram upper bounds: powers of two from 64 ns to 2**30 ns (~1.07 s), then +Inf
+_MIN_EXP = 6
+BUCKET_BOUNDS_NS = tuple(2 ** k for k in range(_MIN_EXP, 31))
+_OVERFLOW = len(BUCKET_BOUNDS_NS)
+
+STATES = ("SOVEREIGN", "DEGRADED", "INVALIDATED")
+
+
+class PhaseHistogram:
+    """Log2-bucketed histogram of phase durations in nanoseconds."""
+
+    __slots__ = ("counts", "count", "sum_ns", "min_ns", "max_ns")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (_OVERFLOW + 1)
+        self.count = 0
+        self.sum_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def observe(self, ns: int):
+        """
+        Record one duration.
+
+        Optimization: The bucket is the bit length of the duration, so an
+        observation costs no search over the bounds.
+        """
+        index = (ns - 1).bit_length() - _MIN_EXP
+        if index < 0:
+            index = 0
+        elif index > _OVERFLOW:
+            index = _OVERFLOW
+        self.counts[index] += 1
+        if not self.count or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.count += 1
+        self.sum_ns += ns
+
+    def quantile(self, q: float) -> int:
+        """Upper bound (ns) of the bucket holding the q-quantile (max_ns past the last bound)."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(BUCKET_BOUNDS_NS[index], self.max_ns) if index < _OVERFLOW else self.max_ns
+        return self.max_ns
+
+    def to_dict(self) -> Dict:
+        """Summary plus the non-empty buckets ({upper bound ns or "+Inf": count})."""
+        return {
+            "count": self.count,
+            "sum_ns": self.sum_ns,
+            "mean_ns": self.sum_ns / self.count if self.count else 0.0,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "p50_ns": self.quantile(0.50),
+            "p90_ns": self.quantile(0.90),
+            "p99_ns": self.quantile(0.99),
+            "buckets": {
+                (str(BUCKET_BOUNDS_NS[i]) if i < _OVERFLOW else "+Inf"): n
+                for i, n in enumerate(self.counts) if n
+            },
+        }
+
+
+class Instrumentation:
+    """
+    Per-phase histograms and counters of one ICEWLogger.
+
+    Enabling wraps the logger's hot-path methods on the instance only;
+    disabling deletes the wrappers, so a logger that was never
+    instrumented runs the plain class methods with no extra cost.
+
+    Usage:
+        logger.enable_instrumentation()
+        ...
+        logger.stats()["phases"]["drift"]["p99_ns"]
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, PhaseHistogram] = {phase: PhaseHistogram() for phase in PHASES}
+        self.events_by_state: Dict[str, int] = dict.fromkeys(STATES, 0)
+        self.transitions: Dict[str, int] = {}     # "SOVEREIGN->DEGRADED" -> count
+        self.threshold_crossings = 0
+        self.blocked_events = 0
+        self.compactions = 0
+        self.compacted_events = 0
+
+    def attach(self, logger):
+        """Replace the logger's hot-path methods with timed wrappers."""
+        perf = time.perf_counter_ns
+        cls = type(logger)
+        process_event = cls.process_event.__get__(logger)
+        decide_event = cls.decide.__get__(logger)
+        coherence = cls.calculate_coherence.__get__(logger)
+        decide = cls._decide.__get__(logger)
+        update_state = cls._update_state.__get__(logger)
+        record = cls._record.__get__(logger)
+        compact = cls._compact_logs.__get__(logger)
+
+        observe_event = self.phases["event"].observe
+        observe_coherence = self.phases["coherence"].observe
+        observe_drift = self.phases["drift"].observe
+        observe_state = self.phases["state"].observe
+        observe_log = self.phases["log"].observe
+        observe_compaction = self.phases["compaction"].observe
+        events_by_state = self.events_by_state
+        transitions = self.transitions
+        # Time spent in phases nested inside _decide / _record
+        nested = {"state": 0, "compaction": 0}
+
+        def timed_process_event(raw_metrics):
+            start = perf()
+            entry = process_event(raw_metrics)
+            observe_event(perf() - start)
+            return entry
+
+        def timed_decide_event(raw_metrics):
+            start = perf()
+            result = decide_event(raw_metrics)
+            observe_event(perf() - start)
+            return result
+
+        def timed_coherence(metrics):
+            start = perf()
+            cn = coherence(metrics)
+            observe_coherence(perf() - start)
+            return cn
+
+        def timed_update_state(crossed):
+            start = perf()
+            update_state(crossed)
+            elapsed = perf() - start
+            observe_state(elapsed)
+            nested["state"] += elapsed
+
+        def timed_decide(cn):
+            before = logger.state
+            nested["state"] = 0
+            start = perf()
+            result = decide(cn)
+            observe_drift(perf() - start - nested["state"])
+
+            state = logger.state
+            events_by_state[state] = events_by_state.get(state, 0) + 1
+            if state != before:
+                key = f"{before}->{state}"
+                transitions[key] = transitions.get(key, 0) + 1
+            if result[1]:
+                self.threshold_crossings += 1
+            if logger.is_blocked:
+                self.blocked_events += 1
+            return result
+
+        def timed_compact():
+            pending = logger._stat_event_count
+            start = perf()
+            compact()
+            elapsed = perf() - start
+            nested["compaction"] += elapsed
+            if pending:
+                observe_compaction(elapsed)
+                self.compactions += 1
+                self.compacted_events += pending
+
+        def timed_record(*args):
+            nested["compaction"] = 0
+            start = perf()
+            record(*args)
+            observe_log(perf() - start - nested["compaction"])
+
+        replacements = {
+            "process_event": timed_process_event,
+            "decide": timed_decide_event,
+            "calculate_coherence": timed_coherence,
+            "_decide": timed_decide,
+            "_update_state": timed_update_state,
+            "_record": timed_record,
+            "_compact_logs": timed_compact,
+        }
+        for name in WRAPPED:
+            setattr(logger, name, replacements[name])
+
+    @staticmethod
+    def detach(logger):
+        """Remove the wrappers; the class methods apply again."""
+        for name in WRAPPED:
+            logger.__dict__.pop(name, None)
+
+    def reset(self):
+        """Zero every histogram and counter (in place; attached wrappers keep recording)."""
+        for histogram in self.phases.values():
+            histogram.reset()
+        self.events_by_state.clear()
+        self.events_by_state.update(dict.fromkeys(STATES, 0))
+        self.transitions.clear()
+        self.threshold_crossings = 0
+        self.blocked_events = 0
+        self.compactions = 0
+        self.compacted_events = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "counters": {
+                "events_by_state": dict(self.events_by_state),
+                "transitions": dict(self.transitions),
+                "threshold_crossings": self.threshold_crossings,
+                "blocked_events": self.blocked_events,
+                "compactions": self.compactions,
+                "compacted_events": self.compacted_events,
+            },
+            "phases": {phase: histogram.to_dict() for phase, histogram in self.phases.items()},
+        }
+
+
+def logger_stats(logger) -> Dict:
+    """
+    Current state gauges of a logger, plus its instrumentation if enabled.
+
+    Returns:
+        {"artifact_id", "instrumented", "state", "is_blocked", "k", "m", "p",
+         "events", "buffered_events", "epoch_summaries"[, "counters", "phases"]}
+    """
+    log = logger.telemetry_log
+    stats = {
+        "artifact_id": logger.artifact_id,
+        "instrumented": logger.instrumentation is not None,
+        "state": logger.state,
+        "is_blocked": logger.is_blocked,
+        "k": logger.k_counter,
+        "m": logger.m_counter,
+        "p": logger.p_counter,
+        "events": log.base_seq + len(log),
+        "buffered_events": len(log),
+        "epoch_summaries": len(logger.epoch_summaries),
+    }
+    if logger.instrumentation is not None:
+        stats.update(logger.instrumentation.to_dict())
+    return stats
+
+
+# --- Prometheus text exposition format (version 0.0.4) ---
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _seconds(ns: float) -> str:
+    return repr(ns / 1e9)
+
+
+def prometheus_text(loggers: Union[object, Iterable]) -> str:
+    """
+    Render loggers' gauges, counters and phase histograms for Prometheus.
+
+    Durations are exported in seconds, as Prometheus conventions expect;
+    histogram bucket bounds are the nanosecond powers of two converted to
+    seconds. Counters and histograms only appear for instrumented loggers.
+
+    Args:
+        loggers: One ICEWLogger or an iterable of them
+
+    Returns:
+        Text exposition, one sample per line, ending with a newline
+    """
+    if hasattr(loggers, "telemetry_log"):
+        loggers = [loggers]
+    loggers = list(loggers)
+    instrumented = [lg for lg in loggers if lg.instrumentation is not None]
+    families: List[tuple] = []
+
+    def family(name: str, kind: str, help_text: str, samples: List[str]):
+        families.append((name, kind, help_text, samples))
+
+    def label(logger) -> str:
+        return f'artifact="{_escape(logger.artifact_id)}"'
+
+    family("sap_icew_state", "gauge", "1 for the current SAP state of the artifact.", [
+        f'sap_icew_state{{{label(lg)},state="{state}"}} {int(lg.state == state)}'
+        for lg in loggers for state in STATES
+    ])
+    family("sap_icew_blocked", "gauge", "1 while output is blocked (INVALIDATED).", [
+        f"sap_icew_blocked{{{label(lg)}}} {int(lg.is_blocked)}" for lg in loggers
+    ])
+    family("sap_icew_buffered_events", "gauge", "Telemetry records buffered since the last compaction.", [
+        f"sap_icew_buffered_events{{{label(lg)}}} {len(lg.telemetry_log)}" for lg in loggers
+    ])
+
+    family("sap_icew_events_total", "counter", "Events decided, by resulting SAP state.", [
+        f'sap_icew_events_total{{{label(lg)},state="{state}"}} {n}'
+        for lg in instrumented for state, n in lg.instrumentation.events_by_state.items()
+    ])
+    family("sap_icew_transitions_total", "counter", "SAP state transitions.", [
+        f'sap_icew_transitions_total{{{label(lg)},from="{key.split("->")[0]}",to="{key.split("->")[1]}"}} {n}'
+        for lg in instrumented for key, n in sorted(lg.instrumentation.transitions.items())
+    ])
+    for name, attr, help_text in (
+        ("sap_icew_threshold_crossings_total", "threshold_crossings", "Events whose drift crossed sigma."),
+        ("sap_icew_blocked_events_total", "blocked_events", "Events answered with BLOCK_OUTPUT."),
+        ("sap_icew_compactions_total", "compactions", "Log compactions into epoch summaries."),
+        ("sap_icew_compacted_events_total", "compacted_events", "Events folded into epoch summaries."),
+    ):
+        family(name, "counter", help_text, [
+            f"{name}{{{label(lg)}}} {getattr(lg.instrumentation, attr)}" for lg in instrumented
+        ])
+
+    samples = []
+    name = "sap_icew_phase_duration_seconds"
+    for lg in instrumented:
+        for phase, histogram in lg.instrumentation.phases.items():
+            labels = f'{label(lg)},phase="{phase}"'
+            cumulative = 0
+            for index, n in enumerate(histogram.counts):
+                cumulative += n
+                le = _seconds(BUCKET_BOUNDS_NS[index]) if index < _OVERFLOW else "+Inf"
+                samples.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            samples.append(f"{name}_sum{{{labels}}} {_seconds(histogram.sum_ns)}")
+            samples.append(f"{name}_count{{{labels}}} {histogram.count}")
+    family(name, "histogram", "Time spent in each ICE-W hot-path phase.", samples)
+
+    lines = []
+    for name, kind, help_text, samples in families:
+        if samples:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def write_prometheus(path: str, loggers: Union[object, Iterable]):
+    """Write prometheus_text() atomically, e.g. for the node_exporter textfile collector."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text(loggers))
+    os.replace(tmp, path)
@@ -0,0 +1,368 @@
+"""
+ICE-W Epoch Rollups
+SAP Pilot Kit v0.1 - Tiered hour/day/month summaries of compacted epochs
+
+Cada resumen de época que produce _compact_logs se acumula también en
+su hora, día y mes (UTC) con los mismos campos cn_avg/min/max y de
+violaciones. Cada nivel conserva un número acotado de entradas, así la
+memoria no crece con la vida del logger, y las consultas por rango
+localizan sus límites con bisect.
+
+Tiers and default retention (most recent entries kept):
+    epoch   1024 epoch summaries (ICEWLogger.epoch_summaries)
+    hour    2160 (90 days)
+    day     1830 (about 5 years)
+    month   1200 (100 years)
+
+An epoch belongs to the hour, day and month that contain its start_time.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .telemetry_store import format_timestamp_ns, parse_timestamp_ns
+
+TIERS = ("epoch", "hour", "day", "month")
+DEFAULT_RETENTION = {"epoch": 1024, "hour": 2160, "day": 1830, "month": 1200}
+
+_HOUR_NS = 3600 * 1_000_000_000
+_DAY_NS = 24 * _HOUR_NS
+_EPOCH_DATE = date(1970, 1, 1)
+
+# Unbounded query end (any epoch-ns timestamp before year 2262)
+_END_OF_TIME = 2 ** 63
+
+# Range coverage status: every epoch exactly, a superset (edges widened to
+# whole periods), or incomplete (a tier evicted part of the range)
+_EXACT, _WIDENED, _PARTIAL = 0, 1, 2
+
+# Row layout shared by every tier
+_FIRST, _LAST, _EPOCHS, _EVENTS, _CN_SUM, _CN_MIN, _CN_MAX, _DEGRADED, _INVALIDATED = range(9)
+
+
+def period_start(tier: str, timestamp_ns: int) -> int:
+    """Start (epoch ns) of the UTC hour, day or month containing timestamp_ns."""
+    if tier == "hour":
+        return timestamp_ns - timestamp_ns % _HOUR_NS
+    day = timestamp_ns - timestamp_ns % _DAY_NS
+    if tier == "day":
+        return day
+    d = _EPOCH_DATE + timedelta(days=day // _DAY_NS)
+    return (d.replace(day=1) - _EPOCH_DATE).days * _DAY_NS
+
+
+def period_end(tier: str, key: int) -> int:
+    """Start of the period following the one that starts at key."""
+    if tier == "hour":
+        return key + _HOUR_NS
+    if tier == "day":
+        return key + _DAY_NS
+    d = _EPOCH_DATE + timedelta(days=key // _DAY_NS)
+    d = date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+    return (d - _EPOCH_DATE).days * _DAY_NS
+
+
+def _epoch_row(summary: dict, start_ns: int, end_ns: int, cn_sum: Optional[float] = None) -> tuple:
+    count = summary["event_count"]
+    metrics, violations = summary["metrics"], summary["violations"]
+    return (
+        start_ns, end_ns, 1, count,
+        metrics["cn_avg"] * count if cn_sum is None else cn_sum,
+        metrics["cn_min"], metrics["cn_max"],
+        violations["degraded"], violations["invalidated"],
+    )
+
+
+def _merge_row(row: list, other):
+    if other[_FIRST] < row[_FIRST]:
+        row[_FIRST] = other[_FIRST]
+    if other[_LAST] > row[_LAST]:
+        row[_LAST] = other[_LAST]
+    row[_EPOCHS] += other[_EPOCHS]
+    row[_EVENTS] += other[_EVENTS]
+    row[_CN_SUM] += other[_CN_SUM]
+    if other[_CN_MIN] < row[_CN_MIN]:
+        row[_CN_MIN] = other[_CN_MIN]
+    if other[_CN_MAX] > row[_CN_MAX]:
+        row[_CN_MAX] = other[_CN_MAX]
+    row[_DEGRADED] += other[_DEGRADED]
+    row[_INVALIDATED] += other[_INVALIDATED]
+
+
+def _summary(kind: str, row, **extra) -> dict:
+    """Summary dict in the epoch_summary layout (plus epoch_count and extra fields)."""
+    summary = {"type": kind}
+    summary.update(extra)
+    summary.update({
+        "start_time": format_timestamp_ns(row[_FIRST]),
+        "end_time": format_timestamp_ns(row[_LAST]),
+        "epoch_count": row[_EPOCHS],
+        "event_count": row[_EVENTS],
+        "metrics": {
+            "cn_avg": row[_CN_SUM] / row[_EVENTS],
+            "cn_min": float(row[_CN_MIN]),
+            "cn_max": float(row[_CN_MAX])
+        },
+        "violations": {
+            "degraded": row[_DEGRADED],
+            "invalidated": row[_INVALIDATED]
+        }
+    })
+    return summary
+
+
+class _Tier:
+    """Sorted keys and aggregate rows of one tier, with bounded retention."""
+
+    __slots__ = ("name", "retention", "keys", "rows", "first_key", "horizon")
+
+    def __init__(self, name: str, retention: int):
+        self.name = name
+        self.retention = retention
+        self.keys: List[int] = []
+        self.rows: List[list] = []
+        self.first_key: Optional[int] = None   # Oldest key ever added
+        self.horizon: Optional[int] = None     # Oldest retained key once something was evicted
+
+    def add(self, key: int, row, merge: bool = True) -> int:
+        """
+        Fold a row into the bucket at key (or insert a new entry).
+
+        Returns:
+            Number of evicted (oldest) entries
+        """
+        keys = self.keys
+        if self.first_key is None or key < self.first_key:
+            self.first_key = key
+        # Keys arrive in time order: the bucket is almost always the last one
+        if merge and keys and keys[-1] == key:
+            _merge_row(self.rows[-1], row)
+        else:
+            i = bisect_left(keys, key) if merge else bisect_right(keys, key)
+            if merge and i < len(keys) and keys[i] == key:
+                _merge_row(self.rows[i], row)
+            else:
+                keys.insert(i, key)
+                self.rows.insert(i, list(row))
+
+        evicted = len(keys) - self.retention
+        if evicted <= 0:
+            return 0
+        del keys[:evicted]
+        del self.rows[:evicted]
+        self.horizon = keys[0]
+        return evicted
+
+    def bounds(self, lo: int, hi: int) -> Tuple[int, int]:
+        """Index range of the entries with keys in [lo, hi) (O(log n))."""
+        return bisect_left(self.keys, lo), bisect_left(self.keys, hi)
+
+    def complete(self, lo: int, hi: int) -> bool:
+        """True if no entry with a key in [lo, hi) has been evicted."""
+        return self.horizon is None or hi <= self.first_key or lo >= self.horizon
+
+    def to_state(self) -> dict:
+        return {"first_key": self.first_key, "horizon": self.horizon, "keys": self.keys, "rows": self.rows}
+
+
+class EpochRollups:
+    """
+    Epoch summaries plus their hour, day and month rollups.
+
+    Usage:
+        rollups.add(summary, start_ns, end_ns, cn_sum)
+        rollups.summarize(start_ns, end_ns)         # merged cn/violation summary
+        rollups.summaries("day", start_ns, end_ns)  # one summary per day
+    """
+
+    def __init__(self, retention: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            retention: Entries kept per tier (missing tiers use DEFAULT_RETENTION)
+
+        Raises:
+            ValueError: Unknown tier or retention below 1
+        """
+        retention = dict(DEFAULT_RETENTION, **(retention or {}))
+        unknown = set(retention) - set(TIERS)
+        if unknown:
+            raise ValueError(f"Unknown rollup tiers: {sorted(unknown)}")
+        for name, size in retention.items():
+            if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+                raise ValueError(f"retention[{name!r}] must be an integer >= 1, got {size!r}")
+        self.retention = retention
+        self._tiers = [_Tier(name, retention[name]) for name in TIERS]
+        self.tiers = {tier.name: tier for tier in self._tiers}
+
+        # Retained epoch summaries (oldest first) and the global index of
+        # epochs[0], which advances as old epochs are evicted
+        self.epochs: List[dict] = []
+        self.epoch_base_seq = 0
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def add(self, summary: dict, start_ns: int, end_ns: int, cn_sum: Optional[float] = None):
+        """
+        Append an epoch summary and fold it into its hour, day and month.
+
+        Args:
+            summary: Epoch summary dict as built by _compact_logs
+            start_ns, end_ns: First and last event timestamps of the epoch
+            cn_sum: Exact sum of the epoch's rounded Cn values
+                (default: cn_avg * event_count)
+        """
+        row = _epoch_row(summary, start_ns, end_ns, cn_sum)
+        self.epochs.append(summary)
+        evicted = self._tiers[0].add(start_ns, row, merge=False)
+        if evicted:
+            del self.epochs[:evicted]
+            self.epoch_base_seq += evicted
+        for tier in self._tiers[1:]:
+            tier.add(period_start(tier.name, start_ns), row)
+
+    def summaries(self, tier: str = "hour", start_ns: Optional[int] = None,
+                  end_ns: Optional[int] = None) -> List[dict]:
+        """
+        Retained summaries of one tier: periods overlapping [start_ns, end_ns),
+        or for the epoch tier, epochs starting in it.
+
+        Hour/day/month entries carry "type": "<tier>_summary", a
+        "period_start" and an "epoch_count" on top of the epoch fields.
+
+        Raises:
+            ValueError: Unknown tier
+        """
+        if tier not in self.tiers:
+            raise ValueError(f"tier must be one of {TIERS}, got {tier!r}")
+        t = self.tiers[tier]
+        lo = period_start(tier, start_ns) if start_ns is not None and tier != "epoch" else start_ns
+        i, j = t.bounds(0 if lo is None else lo, _END_OF_TIME if end_ns is None else end_ns)
+        if tier == "epoch":
+            return self.epochs[i:j]
+        return [
+            _summary(f"{tier}_summary", row, period_start=format_timestamp_ns(key))
+            for key, row in zip(t.keys[i:j], t.rows[i:j])
+        ]
+
+    def summarize(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None,
+                  open_epoch: Optional[tuple] = None) -> Optional[dict]:
+        """
+        Merge every epoch that starts in [start_ns, end_ns) into one summary.
+
+        Optimization: The range is covered top-down by whole months, then
+        whole days and hours at its edges, then epochs at the very edges,
+        so each tier costs two bisects and the number of merged entries
+        stays small however long the range is.
+
+        If the finer tiers have evicted part of an edge, the coarser
+        period containing it is used instead and "exact" is False.
+
+        Args:
+            start_ns, end_ns: Range in epoch ns (None = unbounded)
+            open_epoch: (summary, start_ns, end_ns, cn_sum) of the epoch
+                still being filled, included if it starts in the range
+
+        Returns:
+            "range_summary" dict (epoch_summary fields plus epoch_count and
+            exact), or None if no epoch starts in the range
+        """
+        lo = 0 if start_ns is None else start_ns
+        hi = _END_OF_TIME if end_ns is None else end_ns
+        rows: List = []
+        status = self._cover(len(self._tiers) - 1, lo, hi, rows)
+        if open_epoch is not None and lo <= open_epoch[1] < hi:
+            rows.append(_epoch_row(*open_epoch))
+        if not rows:
+            return None
+
+        merged = list(rows[0])
+        for row in rows[1:]:
+            _merge_row(merged, row)
+        summary = _summary("range_summary", merged)
+        summary["exact"] = status == _EXACT
+        return summary
+
+    def _cover(self, level: int, lo: int, hi: int, rows: list) -> int:
+        """Collect rows covering epochs that start in [lo, hi); returns the coverage status."""
+        if lo >= hi:
+            return _EXACT
+        tier = self._tiers[level]
+        if level == 0:
+            i, j = tier.bounds(lo, hi)
+            rows.extend(tier.rows[i:j])
+            return _EXACT if tier.complete(lo, hi) else _PARTIAL
+
+        first = period_start(tier.name, lo)
+        if first < lo:
+            first = period_end(tier.name, first)
+        last = period_start(tier.name, hi)
+        if first >= last:
+            return self._edge(level, lo, hi, rows)
+
+        status = self._edge(level, lo, first, rows)
+        i, j = tier.bounds(first, last)
+        rows.extend(tier.rows[i:j])
+        if not tier.complete(first, last):
+            status = _PARTIAL
+        return max(status, self._edge(level, last, hi, rows))
+
+    def _edge(self, level: int, lo: int, hi: int, rows: list) -> int:
+        """Cover a partial period with finer tiers, falling back to this tier's periods."""
+        if lo >= hi:
+            return _EXACT
+        finer: List = []
+        status = self._cover(level - 1, lo, hi, finer)
+        if status != _PARTIAL:
+            rows.extend(finer)
+            return status
+        # Finer detail was evicted: widen the edge to the whole period(s)
+        tier = self._tiers[level]
+        start = period_start(tier.name, lo)
+        i, j = tier.bounds(start, hi)
+        rows.extend(tier.rows[i:j] if i < j else finer)
+        return _WIDENED if tier.complete(start, hi) else _PARTIAL
+
+    # --- Persistence (see checkpoint.py) ---
+
+    def to_state(self) -> dict:
+        """JSON-serializable state of every tier (epoch dicts are stored separately)."""
+        return {
+            "retention": self.retention,
+            "epoch_base_seq": self.epoch_base_seq,
+            "tiers": {tier.name: tier.to_state() for tier in self._tiers},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict, epochs: List[dict]) -> "EpochRollups":
+        """
+        Rebuild from to_state() output and the retained epoch summaries.
+
+        Raises:
+            ValueError: If the tiers do not match the epochs
+        """
+        rollups = cls(state["retention"])
+        rollups.epochs = list(epochs)
+        rollups.epoch_base_seq = state["epoch_base_seq"]
+        for tier in rollups._tiers:
+            data = state["tiers"][tier.name]
+            tier.first_key, tier.horizon = data["first_key"], data["horizon"]
+            tier.keys, tier.rows = list(data["keys"]), [list(row) for row in data["rows"]]
+            if len(tier.keys) != len(tier.rows):
+                raise ValueError(f"Inconsistent {tier.name} rollup")
+        if len(rollups._tiers[0].keys) != len(rollups.epochs):
+            raise ValueError("Epoch rollup does not match the epoch summaries")
+        return rollups
+
+    @classmethod
+    def from_epochs(cls, epochs: List[dict], retention: Optional[Dict[str, int]] = None) -> "EpochRollups":
+        """Rebuild every tier from epoch summaries (their ISO start/end times)."""
+        rollups = cls(retention)
+        for summary in epochs:
+            rollups.add(summary, parse_timestamp_ns(summary["start_time"]), parse_timestamp_ns(summary["end_time"]))
+        return rollups
@@ -0,0 +1,100 @@
+"""
+SAP Profiles
+SAP Pilot Kit v0.1 - Validated protocol parameter sets
+
+Un SAPProfile agrupa los parámetros del protocolo (W, σ, k, m, p) en un
+objeto inmutable y validado, de modo que cada artefacto pueda auditarse
+con un perfil estricto, estándar o permisivo.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import math
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict
+
+# Parámetros del protocolo, en el orden usado por checkpoints y WAL
+PARAM_NAMES = ("W_size", "sigma", "k_limit", "m_limit", "p_recovery")
+
+# Eventos mínimos en la ventana antes de analizar la deriva (ICEWLogger._update_state)
+MIN_WINDOW = 10
+
+
+@dataclass(frozen=True)
+class SAPProfile:
+    """
+    Immutable SAP protocol parameters.
+
+    Attributes:
+        W_size: Statistical window size (events, at least MIN_WINDOW)
+        sigma: Drift threshold, in window standard deviations
+        k_limit: Consecutive violations before DEGRADED
+        m_limit: Violations in DEGRADED before INVALIDATED
+        p_recovery: Consecutive stable events required for RECOVERY
+        name: Label only; two profiles with equal parameters compare equal
+    """
+    W_size: int = 100
+    sigma: float = 0.73
+    k_limit: int = 3
+    m_limit: int = 10
+    p_recovery: int = 50
+    name: str = field(default="custom", compare=False)
+
+    def __post_init__(self):
+        for attr in ("W_size", "k_limit", "m_limit", "p_recovery"):
+            value = getattr(self, attr)
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{attr} must be a positive integer, got {value!r}")
+        if self.W_size < MIN_WINDOW:
+            # Drift analysis needs MIN_WINDOW events: a smaller window could never degrade
+            raise ValueError(f"W_size must be >= {MIN_WINDOW}, got {self.W_size!r}")
+        if isinstance(self.sigma, bool) or not isinstance(self.sigma, (int, float)) \
+                or not math.isfinite(self.sigma) or self.sigma <= 0:
+            raise ValueError(f"sigma must be a finite number > 0, got {self.sigma!r}")
+        # Normalize so that checkpoints and WAL headers round-trip exactly
+        object.__setattr__(self, "sigma", float(self.sigma))
+
+    def params(self) -> Dict[str, float]:
+        """Protocol parameters keyed by PARAM_NAMES (without the label)."""
+        return {name: getattr(self, name) for name in PARAM_NAMES}
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SAPProfile":
+        """
+        Build a profile from stored parameters.
+
+        Returns the matching preset (with its name) when the parameters
+        equal one, so restored loggers report e.g. "strict" again.
+        """
+        profile = cls(**{name: data[name] for name in PARAM_NAMES}, name=data.get("name", "custom"))
+        for preset in PROFILES.values():
+            if preset == profile:
+                return preset
+        return profile
+
+    def evolve(self, **changes) -> "SAPProfile":
+        """Copy with some parameters changed (validated); the copy is named "custom"."""
+        changes.setdefault("name", "custom")
+        return replace(self, **changes)
+
+
+DEFAULT_PROFILE = SAPProfile(name="default")
+STRICT_PROFILE = SAPProfile(sigma=0.5, k_limit=2, m_limit=5, p_recovery=100, name="strict")
+LENIENT_PROFILE = SAPProfile(sigma=1.0, k_limit=5, m_limit=20, p_recovery=25, name="lenient")
+
+PROFILES: Dict[str, SAPProfile] = {
+    p.name: p for p in (DEFAULT_PROFILE, STRICT_PROFILE, LENIENT_PROFILE)
+}
+
+
+def get_profile(name: str) -> SAPProfile:
+    """Look up a preset profile by name."""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown SAP profile {name!r}, expected one of {tuple(PROFILES)}") from None
@@ -0,0 +1,517 @@
+"""
+SAP Governance Service
+SAP Pilot Kit v0.1 - asyncio HTTP/1.1 backend for the sap-governance-v1 proxy
+
+Servicio HTTP mínimo (solo librería estándar) que mantiene en memoria un
+ICEWLogger por artefacto y un MEBACalculator por clave, con conexiones
+persistentes (keep-alive) y respuestas JSON. Es el destino del proxy de
+Apigee `sap-governance-v1`, que reenvía la ruta sin su BasePath.
+
+Routes (JSON bodies and responses):
+    GET  /health
+    GET  /artifacts                         state of every artifact
+    POST /artifacts                         {"artifact_id", "sha256", "profile"?}
+    GET  /artifacts/{id}                    SAP state and counters
+    POST /artifacts/{id}/events             one IPHY metrics object
+    POST /artifacts/{id}/events/batch       [metrics, ...] or {"events": [...]}
+    POST /meba/{key}/interactions           [{"sentiment_score", "duration_seconds"}, ...]
+                                            or {"sentiment_score": [...], "duration_seconds": [...]}
+    GET  /meba/{key}/score                  MEBA_Cert score and components
+    GET  /metrics                           Prometheus text exposition (see instrumentation.py)
+
+The same routes are also served under /sap-governance/v1 for direct use
+without the proxy. MEBA routes need the meba-core package; without it
+they answer 501.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import numpy as np
+
+from .ice_w_logger import ICEWLogger, IPHY_KEYS
+from .instrumentation import PROMETHEUS_CONTENT_TYPE, prometheus_text
+from .sap_profile import PROFILES, SAPProfile, get_profile
+
+try:
+    from meba_core.meba_metric import MEBACalculator
+except ImportError:  # meba-core is an optional dependency of the service
+    MEBACalculator = None
+
+# BasePath of the Apigee proxy (stripped by the proxy, optional here)
+BASE_PATH = "/sap-governance/v1"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+MAX_HEADER_BYTES = 16 * 1024
+DEFAULT_MAX_BODY_BYTES = 8 * 1024 * 1024
+
+_REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 411: "Length Required",
+    413: "Payload Too Large", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error", 501: "Not Implemented",
+}
+
+# Compact separators: smaller responses, faster encoding
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+_log = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """Request error answered with an HTTP status and a JSON error body."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _reject_constant(name: str):
+    # json.loads accepts NaN/Infinity by default; they are not valid JSON and would poison Cn windows
+    raise ValueError(f"non-finite number {name} is not allowed")
+
+
+def _read_json(body: bytes):
+    if not body:
+        raise HTTPError(400, "Request body must be JSON")
+    try:
+        return json.loads(body, parse_constant=_reject_constant)
+    except ValueError as e:
+        raise HTTPError(400, f"Invalid JSON: {e}")
+
+
+def _iphy_array(events: list) -> np.ndarray:
+    """
+    Validate IPHY events into an (N, 4) float64 array.
+
+    Raises:
+        HTTPError: 400 for a missing metric, a non-numeric or non-finite
+            value (e.g. 1e999), or a value outside [0, 1]
+    """
+    try:
+        m = np.array([[event[key] for key in IPHY_KEYS] for event in events])
+    except KeyError as e:
+        raise HTTPError(400, f"Missing IPHY metric: {e}")
+    except TypeError:
+        raise HTTPError(400, "Each event must be a JSON object of IPHY metrics")
+    if m.size == 0:
+        return np.empty((0, len(IPHY_KEYS)))
+    if m.dtype.kind not in "iuf":
+        raise HTTPError(400, "IPHY metrics must be numbers")
+    m = m.astype(np.float64, copy=False)
+    if not np.isfinite(m).all():
+        raise HTTPError(400, "IPHY metrics must be finite")
+    if ((m < 0.0) | (m > 1.0)).any():
+        raise HTTPError(400, "IPHY metrics must be within [0, 1]")
+    return m
+
+
+class SAPGovernanceService:
+    """
+    In-memory ICE-W / MEBA state behind an HTTP/1.1 keep-alive server.
+
+    Requests on one connection are handled in order, and every handler
+    runs to completion without awaiting, so per-artifact decisions keep
+    their arrival order across all connections.
+
+    Usage:
+        service = SAPGovernanceService(port=8080)
+        await service.start()
+        await service.serve_forever()
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 profile: Optional[SAPProfile] = None, keepalive_timeout: float = 15.0,
+                 max_body_bytes: int = DEFAULT_MAX_BODY_BYTES, instrument: bool = False):
+        """
+        Args:
+            host: Interface to bind
+            port: TCP port (0 = pick a free port, see .port after start())
+            profile: Default SAP profile for registered artifacts
+            keepalive_timeout: Seconds an idle connection is kept open (and
+                the longest wait for the rest of a request body)
+            max_body_bytes: Largest accepted request body
+            instrument: Enable per-phase timings on every registered
+                artifact (exported by GET /metrics)
+        """
+        self.host = host
+        self.port = port
+        self.profile = profile
+        self.keepalive_timeout = keepalive_timeout
+        self.max_body_bytes = max_body_bytes
+        self.instrument = instrument
+
+        self.loggers: Dict[str, ICEWLogger] = {}
+        self.meba: Dict[str, "MEBACalculator"] = {}
+        self.requests_served = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            ("health",): {"GET": self._health},
+            ("metrics",): {"GET": self._metrics},
+            ("artifacts",): {"GET": self._list_artifacts, "POST": self._register},
+            ("artifacts", None): {"GET": self._artifact_state},
+            ("artifacts", None, "events"): {"POST": self._ingest_event},
+            ("artifacts", None, "events", "batch"): {"POST": self._ingest_batch},
+            ("meba", None, "interactions"): {"POST": self._ingest_interactions},
+            ("meba", None, "score"): {"GET": self._meba_score},
+        }
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        """Bind the listening socket."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections and close the listening socket."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # --- HTTP/1.1 ---
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """
+        Read one request.
+
+        Returns:
+            (method, target, version, headers, body), or None when the
+            client closed the connection between requests
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keepalive_timeout)
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HTTPError(400, "Incomplete request head")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request head too large")
+
+        lines = head[:-4].decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPError(400, "Malformed header line")
+            headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(411, "Chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f"Request body larger than {self.max_body_bytes} bytes")
+        # A client that stalls mid-body is dropped like an idle one
+        body = await asyncio.wait_for(reader.readexactly(length), self.keepalive_timeout) if length else b""
+        return method, target, version, headers, body
+
+    @staticmethod
+    def _response(status: int, payload, keep_alive: bool) -> bytes:
+        # Handlers return str payloads only for plain-text (Prometheus) bodies
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+        else:
+            body, content_type = _encode(payload).encode("utf-8"), "application/json"
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    # The stream position is unknown after a bad head: close
+                    writer.write(self._response(e.status, {"error": e.message}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.0":
+                    keep_alive = connection == "keep-alive"
+                else:
+                    keep_alive = connection != "close"
+
+                status, payload = self.dispatch(method, target, body)
+                self.requests_served += 1
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def dispatch(self, method: str, target: str, body: bytes = b"") -> Tuple[int, object]:
+        """
+        Route one request (no network involved; also used by tests).
+
+        Returns:
+            (status, JSON-serializable payload)
+        """
+        path = urlsplit(target).path
+        if path == BASE_PATH or path.startswith(BASE_PATH + "/"):
+            path = path[len(BASE_PATH):]
+        segments = [unquote(s) for s in path.strip("/").split("/") if s]
+        try:
+            handlers, params = self._match(segments)
+            handler = handlers.get(method)
+            if handler is None:
+                raise HTTPError(405, f"{method} not allowed on {path}")
+            return handler(*params, body=body)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except Exception:  # Keep the connection alive on handler bugs; details go to the log only
+            _log.exception("Unhandled error in %s %s", method, path)
+            return 500, {"error": "Internal server error"}
+
+    def _match(self, segments: List[str]):
+        key = tuple(segments)
+        if key in self._routes:
+            return self._routes[key], ()
+        if len(segments) >= 2:
+            pattern = (segments[0], None) + tuple(segments[2:])
+            if pattern in self._routes:
+                return self._routes[pattern], (segments[1],)
+        raise HTTPError(404, f"No route for /{'/'.join(segments)}")
+
+    # --- ICE-W handlers ---
+
+    def _logger(self, artifact_id: str) -> ICEWLogger:
+        logger = self.loggers.get(artifact_id)
+        if logger is None:
+            raise HTTPError(404, f"Unknown artifact: {artifact_id}")
+        return logger
+
+    @staticmethod
+    def _state(logger: ICEWLogger) -> dict:
+        return {
+            "artifact_id": logger.artifact_id,
+            "sha256": logger.sha256,
+            "profile": logger.profile.name,
+            "state": logger.state,
+            "is_blocked": logger.is_blocked,
+            "k": logger.k_counter,
+            "m": logger.m_counter,
+            "p": logger.p_counter,
+            "events": logger.telemetry_log.base_seq + len(logger.telemetry_log),
+        }
+
+    def _health(self, body: bytes):
+        return 200, {"status": "ok", "artifacts": len(self.loggers), "meba": MEBACalculator is not None}
+
+    def _metrics(self, body: bytes):
+        return 200, prometheus_text(self.loggers.values())
+
+    def _list_artifacts(self, body: bytes):
+        return 200, {"artifacts": [self._state(logger) for logger in self.loggers.values()]}
+
+    def _register(self, body: bytes):
+        data = _read_json(body)
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        artifact_id, sha256 = data.get("artifact_id"), data.get("sha256")
+        if not isinstance(artifact_id, str) or not artifact_id or not isinstance(sha256, str):
+            raise HTTPError(400, "artifact_id and sha256 must be non-empty strings")
+
+        profile = data.get("profile", self.profile)
+        try:
+            if isinstance(profile, str):
+                profile = get_profile(profile)
+            elif isinstance(profile, dict):
+                profile = SAPProfile.from_dict(profile)
+        except (ValueError, TypeError, KeyError) as e:
+            raise HTTPError(400, f"Invalid profile: {e}")
+
+        existing = self.loggers.get(artifact_id)
+        if existing is not None:
+            if existing.sha256 != sha256:
+                raise HTTPError(409, f"Artifact {artifact_id} is registered with a different sha256")
+            return 200, self._state(existing)
+        logger = self.loggers[artifact_id] = ICEWLogger(artifact_id, sha256, profile=profile)
+        if self.instrument:
+            logger.enable_instrumentation()
+        return 201, self._state(logger)
+
+    def _artifact_state(self, artifact_id: str, body: bytes):
+        return 200, self._state(self._logger(artifact_id))
+
+    def _ingest_event(self, artifact_id: str, body: bytes):
+        logger = self._logger(artifact_id)
+        metrics = _read_json(body)
+        if not isinstance(metrics, dict):
+            raise HTTPError(400, "Expected a JSON object of IPHY metrics")
+        _iphy_array([metrics])
+        logger._process_cn(logger.calculate_coherence(metrics))
+        return 200, {
+            "action": "BLOCK_OUTPUT" if logger.is_blocked else "ALLOW",
+            "state": logger.state,
+        }
+
+    def _ingest_batch(self, artifact_id: str, body: bytes):
+        """
+        Ingest many events in arrival order.
+
+        Optimization: Coherence is computed for the whole batch with NumPy
+        and the response carries one action code per event instead of a
+        full telemetry entry.
+        """
+        logger = self._logger(artifact_id)
+        events = _read_json(body)
+        if isinstance(events, dict):
+            events = events.get("events")
+        if not isinstance(events, list):
+            raise HTTPError(400, 'Expected a JSON array of events or {"events": [...]}')
+        cn_values = logger.calculate_coherence_batch(_iphy_array(events))
+
+        process_cn = logger._process_cn
+        blocked = []
+        for cn in cn_values.tolist():
+            process_cn(cn)
+            blocked.append(1 if logger.is_blocked else 0)
+        return 200, {
+            "processed": len(blocked),
+            "blocked": blocked,
+            "state": logger.state,
+            "is_blocked": logger.is_blocked,
+        }
+
+    # --- MEBA handlers ---
+
+    def _calculator(self, key: str, create: bool = False):
+        if MEBACalculator is None:
+            raise HTTPError(501, "MEBA endpoints require the meba-core package")
+        calc = self.meba.get(key)
+        if calc is None:
+            if not create:
+                raise HTTPError(404, f"Unknown MEBA key: {key}")
+            # Aggregates only: a long-running service must not keep every interaction
+            calc = self.meba[key] = MEBACalculator(retention="none")
+        return calc
+
+    def _ingest_interactions(self, key: str, body: bytes):
+        data = _read_json(body)
+        if isinstance(data, dict) and "interactions" in data:
+            data = data["interactions"]
+        try:
+            if isinstance(data, list):
+                sentiment = [item["sentiment_score"] for item in data]
+                duration = [item["duration_seconds"] for item in data]
+            elif isinstance(data, dict):
+                sentiment, duration = data["sentiment_score"], data["duration_seconds"]
+            else:
+                raise HTTPError(400, "Expected a JSON array of interactions or columns")
+            s = np.asarray(sentiment, dtype=np.float64)
+            d = np.asarray(duration, dtype=np.float64)
+        except KeyError as e:
+            raise HTTPError(400, f"Missing interaction field: {e}")
+        except (TypeError, ValueError) as e:
+            raise HTTPError(400, f"Invalid interactions: {e}")
+        if s.ndim != 1 or s.shape != d.shape:
+            raise HTTPError(400, "sentiment_score and duration_seconds must be equal-length arrays")
+        if not (np.isfinite(s).all() and np.isfinite(d).all()):
+            raise HTTPError(400, "Interaction values must be finite")
+        if ((s < -1.0) | (s > 1.0)).any():
+            raise HTTPError(400, "sentiment_score must be within [-1, 1]")
+        if (d < 0.0).any():
+            raise HTTPError(400, "duration_seconds must be >= 0")
+
+        # Validated before the calculator exists: a bad first request must not create the key
+        calc = self._calculator(key, create=True)
+        calc.add_interactions_array(s, d, retain=False)
+        return 200, {"key": key, "interactions": calc.interaction_count}
+
+    def _meba_score(self, key: str, body: bytes):
+        calc = self._calculator(key)
+        result = calc.calculate_score()
+        result["interactions"] = calc.interaction_count
+        return 200, result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sap-governance",
+        description="Serve ICE-W event ingestion and MEBA scoring over HTTP/1.1 (backend of sap-governance-v1).",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default",
+                        help="Default SAP profile for registered artifacts")
+    parser.add_argument("--keepalive-timeout", type=float, default=15.0,
+                        help="Seconds an idle keep-alive connection stays open (default: 15)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Record per-phase timings and counters for GET /metrics")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the `sap-governance` console script."""
+    args = build_parser().parse_args(argv)
+    service = SAPGovernanceService(args.host, args.port, profile=get_profile(args.profile),
+                                   keepalive_timeout=args.keepalive_timeout, instrument=args.instrument)
+
+    async def run():
+        await service.start()
+        print(f"sap-governance listening on http://{service.host}:{service.port}", file=sys.stderr)
+        await service.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Boiling Frog Parameter Sweep
+SAP Pilot Kit v0.1 - Parallel calibration runs of the SAP stress test
+
+Ejecuta el protocolo Boiling Frog sobre una rejilla de parámetros SAP
+(sigma, k_limit, m_limit, p_recovery, W_size) y curvas de degradación,
+repartiendo los escenarios en un pool de procesos. Sin salida por
+consola: devuelve una tabla estructurada por configuración.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .boiling_frog_tester import BASELINE_METRICS, stress_metrics
+from .ice_w_logger import ICEWLogger, IPHY_KEYS
+from .sap_profile import PARAM_NAMES, SAPProfile
+
+# Ramp shapes: ambiguity(level) = step * levels * (level / levels) ** exponent
+CURVES = {"linear": 1.0, "quadratic": 2.0, "sqrt": 0.5}
+
+SWEEP_ARTIFACT_ID = "AHI-SWEEP"
+SWEEP_SHA256 = "0" * 64
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One Boiling Frog configuration.
+
+    Defaults follow simulate_stress_test, except that the baseline runs for
+    several windows so false positives can be measured on a full window.
+    """
+    sigma: float = 0.73
+    k_limit: int = 3
+    m_limit: int = 10
+    p_recovery: int = 50
+    W_size: int = 100
+    curve: str = "linear"
+    levels: int = 30
+    step: float = 0.03            # Ambiguity per level (at the linear rate)
+    baseline_events: int = 300   # Must exceed W_size
+    baseline_noise: float = 0.0   # Std of Gaussian noise on baseline metrics
+    seed: int = 0                 # Noise seed
+
+    def __post_init__(self):
+        if self.curve not in CURVES:
+            raise ValueError(f"curve must be one of {tuple(CURVES)}, got {self.curve!r}")
+        if self.levels <= 0:
+            raise ValueError("levels must be > 0")
+        self.profile()  # Validate the protocol parameters
+        if self.baseline_events <= self.W_size:
+            raise ValueError(f"baseline_events must be > W_size ({self.W_size}), got {self.baseline_events}")
+
+    def profile(self) -> SAPProfile:
+        """SAP profile with this scenario's protocol parameters."""
+        return SAPProfile.from_dict({name: getattr(self, name) for name in PARAM_NAMES})
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """Outcome of one scenario."""
+    scenario: Scenario
+    blocked_at_level: Optional[int]      # First stress level answered with BLOCK_OUTPUT
+    first_degraded_level: Optional[int]  # First stress level that left SOVEREIGN
+    false_positive_rate: float           # Share of baseline events not SOVEREIGN once the window is full
+    final_state: str
+
+    def to_dict(self) -> Dict:
+        """Flat row: scenario parameters followed by the outcome."""
+        row = asdict(self.scenario)
+        row.update(
+            blocked_at_level=self.blocked_at_level,
+            first_degraded_level=self.first_degraded_level,
+            false_positive_rate=self.false_positive_rate,
+            final_state=self.final_state,
+        )
+        return row
+
+
+def _as_row(metrics: dict) -> List[float]:
+    return [metrics[key] for key in IPHY_KEYS]
+
+
+def scenario_metrics(scenario: Scenario):
+    """
+    IPHY metric matrices for a scenario.
+
+    Returns:
+        (baseline, ramp): arrays of shape (baseline_events, 4) and (levels, 4)
+    """
+    baseline = np.tile(np.array(_as_row(BASELINE_METRICS), dtype=np.float64), (scenario.baseline_events, 1))
+    if scenario.baseline_noise > 0 and scenario.baseline_events:
+        rng = np.random.default_rng(scenario.seed)
+        baseline = np.clip(baseline + rng.normal(0.0, scenario.baseline_noise, baseline.shape), 0.0, 1.0)
+
+    exponent = CURVES[scenario.curve]
+    top = scenario.step * scenario.levels
+
+    def ambiguity(level):
+        # The linear ramp uses level * step exactly, as simulate_stress_test does
+        if exponent == 1.0:
+            return level * scenario.step
+        return top * (level / scenario.levels) ** exponent
+
+    ramp = np.array([
+        _as_row(stress_metrics(ambiguity(level))) for level in range(1, scenario.levels + 1)
+    ], dtype=np.float64)
+    return baseline, ramp
+
+
+def run_scenario(scenario: Scenario) -> ScenarioResult:
+    """
+    Run one Boiling Frog scenario without printing or writing files.
+
+    Optimization: Coherence is computed in one vectorized batch and
+    events go through the decision-only path (no telemetry records).
+    """
+    logger = ICEWLogger(SWEEP_ARTIFACT_ID, SWEEP_SHA256, profile=scenario.profile())
+    decide = logger._decide
+    baseline, ramp = scenario_metrics(scenario)
+
+    # False positives are counted once the window is full: before that the
+    # drift check is off (MIN_WINDOW) or runs on too few events to judge
+    warmup = scenario.W_size
+    flagged = 0
+    for i, cn in enumerate(logger.calculate_coherence_batch(baseline).tolist()):
+        decide(cn)
+        if i >= warmup and logger.state != "SOVEREIGN":
+            flagged += 1
+
+    blocked_at_level = None
+    first_degraded_level = None
+    for level, cn in enumerate(logger.calculate_coherence_batch(ramp).tolist(), start=1):
+        decide(cn)
+        if first_degraded_level is None and logger.state != "SOVEREIGN":
+            first_degraded_level = level
+        if logger.is_blocked:
+            blocked_at_level = level
+            break
+
+    return ScenarioResult(
+        scenario=scenario,
+        blocked_at_level=blocked_at_level,
+        first_degraded_level=first_degraded_level,
+        false_positive_rate=flagged / (scenario.baseline_events - warmup),
+        final_state=logger.state,
+    )
+
+
+def build_grid(**axes: Iterable) -> List[Scenario]:
+    """
+    Cartesian product of Scenario fields.
+
+    Each keyword is a Scenario field; iterables are swept, scalars are fixed.
+
+    Usage:
+        build_grid(sigma=[0.5, 0.73, 1.0], k_limit=range(1, 6), curve=["linear", "sqrt"])
+    """
+    names = {f.name for f in fields(Scenario)}
+    unknown = set(axes) - names
+    if unknown:
+        raise ValueError(f"Unknown scenario fields: {sorted(unknown)}")
+    keys = list(axes)
+    values = [
+        list(v) if isinstance(v, Iterable) and not isinstance(v, str) else [v]
+        for v in axes.values()
+    ]
+    return [Scenario(**dict(zip(keys, combo))) for combo in itertools.product(*values)]
+
+
+def run_sweep(scenarios: Sequence[Scenario], processes: Optional[int] = None) -> List[ScenarioResult]:
+    """
+    Run scenarios across a process pool.
+
+    Args:
+        scenarios: Configurations to evaluate
+        processes: Worker processes (None = os.cpu_count(); 0 or 1 = in-process)
+
+    Returns:
+        One ScenarioResult per scenario, in input order
+    """
+    scenarios = list(scenarios)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 1 or len(scenarios) <= 1:
+        return [run_scenario(s) for s in scenarios]
+
+    workers = min(processes, len(scenarios))
+    # Optimization: Batch scenarios per task to amortize IPC
+    chunksize = max(1, len(scenarios) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_scenario, scenarios, chunksize=chunksize))
+
+
+def to_table(results: Sequence[ScenarioResult]) -> Dict[str, list]:
+    """Columnar table (column name -> values) of sweep results."""
+    rows = [r.to_dict() for r in results]
+    if not rows:
+        return {}
+    return {key: [row[key] for row in rows] for key in rows[0]}
@@ -0,0 +1,104 @@
+"""
+ICE-W Telemetry Export
+SAP Pilot Kit v0.1 - Streaming NDJSON sinks
+
+Escribe registros SAP-Telemetry-0.1 línea por línea (NDJSON), con
+compresión opcional de la librería estándar, para no materializar el
+log completo en memoria al exportar.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+from typing import Iterable, Optional, TextIO
+
+# Compresores disponibles en la librería estándar
+COMPRESSION_OPENERS = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "lzma": lzma.open,
+}
+
+_SUFFIX_COMPRESSION = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "lzma",
+    ".lzma": "lzma",
+}
+
+# Compact separators: one record per line, no padding
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def infer_compression(path: str) -> Optional[str]:
+    """Return the compression implied by the file suffix, or None."""
+    lowered = str(path).lower()
+    for suffix, compression in _SUFFIX_COMPRESSION.items():
+        if lowered.endswith(suffix):
+            return compression
+    return None
+
+
+def open_sink(path: str, compression: Optional[str] = "infer", append: bool = False) -> TextIO:
+    """
+    Open a UTF-8 text sink, optionally compressed.
+
+    Appending to a compressed file adds a new member/stream, which the
+    matching stdlib reader decompresses transparently. This lets auditors
+    tail a growing export without the writer ever rewriting old data.
+
+    Args:
+        path: Output file path
+        compression: "gzip", "bz2", "lzma", None, or "infer" (from suffix)
+        append: Append to an existing file instead of truncating it
+
+    Returns:
+        Writable text file object
+    """
+    if compression == "infer":
+        compression = infer_compression(path)
+
+    mode = 'at' if append else 'wt'
+    if compression is None:
+        return open(path, mode, encoding='utf-8')
+    if compression not in COMPRESSION_OPENERS:
+        raise ValueError(
+            f"Unsupported compression {compression!r}; "
+            f"expected one of {sorted(COMPRESSION_OPENERS)} or None"
+        )
+    return COMPRESSION_OPENERS[compression](path, mode, encoding='utf-8')
+
+
+def write_ndjson(records: Iterable[dict], sink: TextIO) -> int:
+    """
+    Serialize records to the sink, one JSON document per line.
+
+    Records are consumed lazily, so peak memory is a single record.
+
+    Returns:
+        Number of records written
+    """
+    write = sink.write
+    count = 0
+    for record in records:
+        write(_encode(record))
+        write('\n')
+        count += 1
+    return count
+
+
+def read_ndjson(path: str, compression: Optional[str] = "infer"):
+    """Yield records from an NDJSON export (plain or compressed)."""
+    if compression == "infer":
+        compression = infer_compression(path)
+    opener = COMPRESSION_OPENERS[compression] if compression else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
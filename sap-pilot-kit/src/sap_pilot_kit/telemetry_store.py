@@ -0,0 +1,218 @@
+"""
+ICE-W Telemetry Store
+SAP Pilot Kit v0.1 - Columnar telemetry buffer
+
+Almacena los eventos SAP-Telemetry-0.1 en columnas tipadas en lugar de
+diccionarios anidados. Los diccionarios del log se construyen de forma
+perezosa, solo cuando alguien lee una entrada.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+SCHEMA_VERSION = "SAP-Telemetry-0.1"
+
+# Códigos compactos de estado (columna int8)
+STATES = ("SOVEREIGN", "DEGRADED", "INVALIDATED")
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+
+# Bits de la columna de flags
+FLAG_THRESHOLD_CROSSED = 0x01
+FLAG_BLOCKED = 0x02
+
+EVENT_ID_BYTES = 16
+
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=1024)
+def _format_second(seconds: int) -> str:
+    """ISO-8601 date and time of a whole epoch second, without offset."""
+    return (_UNIX_EPOCH + timedelta(seconds=seconds)).isoformat()[:-6]
+
+
+def format_timestamp_ns(timestamp_ns: int) -> str:
+    """
+    Format an epoch-ns timestamp exactly like datetime.now(timezone.utc).isoformat().
+
+    Integer arithmetic only, so the microsecond field is never subject
+    to float rounding.
+
+    Optimization: Events arrive many per second, so the date/time part
+    is formatted once per second and cached; only the microseconds are
+    formatted per event.
+    """
+    seconds, micros = divmod(timestamp_ns // 1000, 1_000_000)
+    if micros:
+        return f"{_format_second(seconds)}.{micros:06d}+00:00"
+    # isoformat() omits the fraction when it is zero
+    return f"{_format_second(seconds)}+00:00"
+
+
+def parse_timestamp_ns(timestamp: str) -> int:
+    """
+    Inverse of format_timestamp_ns (microsecond precision).
+
+    Args:
+        timestamp: ISO-8601 date and time; naive values are taken as UTC
+
+    Raises:
+        ValueError: If the string is not an ISO-8601 timestamp
+    """
+    dt = datetime.fromisoformat(timestamp)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _UNIX_EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+class TelemetryBuffer:
+    """
+    Columnar, append-only buffer of SAP-Telemetry-0.1 events.
+
+    Each event costs ~54 bytes across typed arrays (cn, delta, flags,
+    state code, k/m/p counters, epoch-ns timestamp and 128-bit event id)
+    instead of a five-level nested dict with two formatted strings.
+
+    The buffer behaves as a read-only sequence of log entries: indexing,
+    slicing and iteration materialize the familiar log_entry dicts on
+    demand, so existing consumers keep working unchanged.
+    """
+
+    def __init__(self, artifact_id: str, sha256: str):
+        """
+        Args:
+            artifact_id: Artifact identifier shared by every event
+            sha256: Artifact hash shared by every event
+        """
+        self.artifact_id = artifact_id
+        self.sha256 = sha256
+
+        # Global sequence number of the first buffered event; advances on
+        # clear() so export cursors survive log compaction.
+        self.base_seq = 0
+
+        self.cn = array('d')
+        self.delta = array('d')
+        self.flags = array('B')
+        self.state = array('b')
+        self.k = array('i')
+        self.m = array('i')
+        self.p = array('i')
+        self.timestamp_ns = array('q')
+        self.event_id = bytearray()
+
+    def append(self, cn: float, delta: float, flags: int, state_code: int,
+               k: int, m: int, p: int, timestamp_ns: int, event_id: bytes):
+        """
+        Append one event (O(1) amortized, no per-event dict).
+
+        Args:
+            cn: Rounded coherence score
+            delta: Rounded drift magnitude
+            flags: FLAG_THRESHOLD_CROSSED | FLAG_BLOCKED bits
+            state_code: Index into STATES
+            k, m, p: Autarchy counters after the transition
+            timestamp_ns: Event time in nanoseconds since the Unix epoch
+            event_id: 16-byte event identifier
+        """
+        self.cn.append(cn)
+        self.delta.append(delta)
+        self.flags.append(flags)
+        self.state.append(state_code)
+        self.k.append(k)
+        self.m.append(m)
+        self.p.append(p)
+        self.timestamp_ns.append(timestamp_ns)
+        self.event_id += event_id
+
+    def clear(self):
+        """Drop all events (used by log compaction)."""
+        self.base_seq += len(self)
+        for column in (self.cn, self.delta, self.flags, self.state,
+                       self.k, self.m, self.p, self.timestamp_ns):
+            del column[:]
+        del self.event_id[:]
+
+    def __len__(self) -> int:
+        return len(self.cn)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.entry(i) for i in range(*index.indices(len(self)))]
+        return self.entry(index)
+
+    def __iter__(self):
+        return self.entries()
+
+    def entries(self, start: int = 0):
+        """Yield materialized log entries from buffer index start onwards."""
+        entry = self.entry
+        for i in range(start, len(self)):
+            yield entry(i)
+
+    def __repr__(self) -> str:
+        return f"TelemetryBuffer(artifact_id={self.artifact_id!r}, events={len(self)})"
+
+    def _normalize_index(self, index: int) -> int:
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("telemetry index out of range")
+        return index
+
+    def event_id_str(self, index: int) -> str:
+        """Canonical UUID string of the event at index."""
+        i = self._normalize_index(index) * EVENT_ID_BYTES
+        # Optimization: format the hex directly instead of building a uuid.UUID
+        h = self.event_id[i:i + EVENT_ID_BYTES].hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+    def timestamp_iso(self, index: int) -> str:
+        """ISO-8601 UTC timestamp of the event at index."""
+        return format_timestamp_ns(self.timestamp_ns[self._normalize_index(index)])
+
+    def entry(self, index: int) -> dict:
+        """
+        Materialize the SAP-Telemetry-0.1 log entry at index.
+
+        Returns:
+            A fresh dict with the same shape process_event has always returned
+        """
+        i = self._normalize_index(index)
+        flags = self.flags[i]
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "artifact": {
+                "id": self.artifact_id,
+                "hash": self.sha256
+            },
+            "event": {
+                "id": self.event_id_str(i),
+                "timestamp": self.timestamp_iso(i),
+                "state": STATES[self.state[i]]
+            },
+            "metrics": {
+                "cn": self.cn[i],
+                "delta": self.delta[i],
+                "threshold_crossed": bool(flags & FLAG_THRESHOLD_CROSSED)
+            },
+            "autarchy": {
+                "k": self.k[i],
+                "m": self.m[i],
+                "p": self.p[i],
+                "action": "BLOCK_OUTPUT" if flags & FLAG_BLOCKED else "ALLOW"
+            }
+        }
+
+    def nbytes(self) -> int:
+        """Approximate payload size of the buffered columns in bytes."""
+        columns = (self.cn, self.delta, self.flags, self.state,
+                   self.k, self.m, self.p, self.timestamp_ns)
+        return sum(c.itemsize * len(c) for c in columns) + len(self.event_id)
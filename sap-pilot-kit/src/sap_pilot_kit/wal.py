@@ -0,0 +1,288 @@
+"""
+ICE-W Write-Ahead Log
+SAP Pilot Kit v0.1 - Append-only IPHY metric log and deterministic replay
+
+Registra los vectores IPHY crudos (antes de calcular Cn) en un log
+binario de solo-anexado, de modo que cualquier decisión INVALIDATED
+pueda reproducirse offline, bit a bit, para los auditores.
+
+File layout (little-endian):
+    magic    b"ICEWWAL\\0"
+    header   u32 length + UTF-8 JSON {artifact_id, sha256, params}
+    frames   u32 payload length, u32 CRC-32 of payload, payload
+             payload = N x 4 float64 IPHY vectors (IPHY_KEYS order)
+
+A torn final frame (crash mid-write) is detected by its length/CRC and
+ignored by the reader; every complete frame before it is replayed.
+
+© 2024-2026 AHI 3.0 · AHI Governance Labs
+Registro IMPI: EXP-3495968
+License: MIT
+"""
+
+import json
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .ice_w_logger import ICEWLogger, IPHY_KEYS
+from .sap_profile import PARAM_NAMES, SAPProfile
+from .telemetry_store import STATE_CODES
+
+MAGIC = b"ICEWWAL\x00"
+_U32 = struct.Struct("<I")
+_FRAME = struct.Struct("<II")
+_ROW_BYTES = 8 * len(IPHY_KEYS)
+_ROW = struct.Struct("<" + "d" * len(IPHY_KEYS))
+
+
+class TelemetryWAL:
+    """
+    Append-only, length-prefixed binary log of raw IPHY metric vectors.
+
+    Writes go through a buffered file; fsync is batched and happens every
+    `fsync_every` frames or `fsync_interval` seconds, whichever comes first,
+    and always on sync()/close().
+    """
+
+    def __init__(self, path: str, artifact_id: str, sha256: str, params: dict,
+                 fsync_every: int = 256, fsync_interval: float = 1.0):
+        """
+        Args:
+            path: WAL file; appended to if it already exists for the same artifact
+            artifact_id: Artifact identifier recorded in the header
+            sha256: Artifact hash recorded in the header
+            params: SAP protocol parameters (PARAM_NAMES) recorded in the header
+            fsync_every: Frames between fsync calls (<= 1 syncs every frame)
+            fsync_interval: Maximum seconds between fsync calls
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.frames_written = 0
+        self.events_written = 0
+
+        header = {
+            "artifact_id": artifact_id,
+            "sha256": sha256,
+            "params": {name: params[name] for name in PARAM_NAMES},
+        }
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            existing, offset = read_header(path)
+            if existing != header:
+                raise ValueError(f"WAL {path} belongs to a different artifact or profile")
+            with open(path, "rb") as f:
+                f.seek(offset)
+                _, valid_end, truncated = _scan_frames(f.read(), 0)
+            self._file = open(path, "ab")
+            if truncated:
+                # Drop a torn tail so new frames stay reachable by readers
+                self._file.truncate(offset + valid_end)
+        else:
+            self._file = open(path, "wb")
+            raw = json.dumps(header, sort_keys=True).encode("utf-8")
+            self._file.write(MAGIC + _U32.pack(len(raw)) + raw)
+            self.sync()
+
+        self._unsynced_frames = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def for_logger(cls, path: str, logger: ICEWLogger, **kwargs) -> "TelemetryWAL":
+        """
+        Open a WAL for a logger and attach it, so every ingested event is recorded.
+
+        replay() starts from a new logger, so the logger must be one too, or,
+        when reopening a WAL that already holds events, be in exactly the
+        decision state those events lead to (e.g. replay(path).logger).
+        Reopening replays the existing WAL once to check this.
+
+        Raises:
+            ValueError: The logger's history is not covered by the WAL, or
+                the WAL belongs to a different artifact or profile
+        """
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            recorded = replay(path)
+            if recorded.events and _decision_state(logger) != _decision_state(recorded.logger):
+                raise ValueError(f"Logger state does not match the end of WAL {path}; "
+                                 "continue from replay(path).logger")
+        else:
+            recorded = None
+        if (recorded is None or not recorded.events) and not _is_fresh(logger):
+            raise ValueError("Logger has already ingested events that a WAL replay would not see; "
+                             "attach the WAL to a new logger")
+        wal = cls(path, logger.artifact_id, logger.sha256, logger.profile.params(), **kwargs)
+        logger.attach_wal(wal)
+        return wal
+
+    def _write_frame(self, payload: bytes, events: int):
+        self._file.write(_FRAME.pack(len(payload), zlib.crc32(payload)))
+        self._file.write(payload)
+        self.frames_written += 1
+        self.events_written += events
+        self._unsynced_frames += 1
+        if (self._unsynced_frames >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def append(self, metrics: dict):
+        """Append one event's IPHY vector as its own frame."""
+        self._write_frame(_ROW.pack(*[metrics[key] for key in IPHY_KEYS]), 1)
+
+    def append_array(self, metrics: np.ndarray):
+        """Append an (N, 4) batch of IPHY vectors as a single frame."""
+        if len(metrics):
+            payload = np.ascontiguousarray(metrics, dtype="<f8").tobytes()
+            self._write_frame(payload, len(metrics))
+
+    def sync(self):
+        """Flush buffers and fsync the file."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced_frames = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Sync and close the WAL."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _decision_state(logger: ICEWLogger):
+    """Everything a replay must reproduce for the next decision to match."""
+    return (list(logger.window), logger.state, logger.k_counter, logger.m_counter,
+            logger.p_counter, logger.is_blocked)
+
+
+def _is_fresh(logger: ICEWLogger) -> bool:
+    """True if the logger has not ingested any event yet."""
+    new = ICEWLogger(logger.artifact_id, logger.sha256, profile=logger.profile)
+    return (_decision_state(logger) == _decision_state(new)
+            and logger._stat_event_count == 0
+            and logger.telemetry_log.base_seq + len(logger.telemetry_log) == 0
+            and not logger.epoch_summaries)
+
+
+def read_header(path: str):
+    """
+    Read the WAL header.
+
+    Returns:
+        (header dict, byte offset of the first frame)
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + _U32.size)
+        if len(prefix) < len(MAGIC) + _U32.size or prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an ICE-W WAL")
+        (length,) = _U32.unpack(prefix[len(MAGIC):])
+        raw = f.read(length)
+        if len(raw) != length:
+            raise ValueError(f"{path} has a truncated WAL header")
+    return json.loads(raw), len(prefix) + length
+
+
+def _scan_frames(data: bytes, offset: int):
+    """
+    Walk frames from offset, validating length and CRC.
+
+    Returns:
+        (list of payload views, offset just past the last valid frame, truncated flag)
+    """
+    view = memoryview(data)
+    chunks = []
+    end = len(data)
+    while offset < end:
+        if offset + _FRAME.size > end:
+            return chunks, offset, True
+        length, crc = _FRAME.unpack_from(view, offset)
+        start = offset + _FRAME.size
+        payload = view[start:start + length]
+        if len(payload) != length or length % _ROW_BYTES or zlib.crc32(payload) != crc:
+            return chunks, offset, True
+        chunks.append(payload)
+        offset = start + length
+    return chunks, offset, False
+
+
+def read_metrics(path: str):
+    """
+    Load every complete frame of a WAL.
+
+    Returns:
+        (header dict, (N, 4) float64 array of IPHY vectors, truncated flag)
+    """
+    header, offset = read_header(path)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        chunks, _, truncated = _scan_frames(f.read(), 0)
+
+    if chunks:
+        metrics = np.frombuffer(b"".join(chunks), dtype="<f8").reshape(-1, len(IPHY_KEYS))
+    else:
+        metrics = np.empty((0, len(IPHY_KEYS)))
+    return header, metrics.astype(np.float64, copy=False), truncated
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a deterministic WAL replay."""
+    logger: ICEWLogger            # Decision state after the last replayed event
+    events: int                   # Number of events replayed
+    states: np.ndarray            # int8 state code per event (telemetry_store.STATES)
+    threshold_crossed: np.ndarray  # bool per event
+    first_invalidated: Optional[int]  # Index of the first INVALIDATED event, if any
+    truncated: bool               # A torn trailing frame was ignored
+
+
+def replay(path: str, stop_at: Optional[int] = None) -> ReplayResult:
+    """
+    Re-run drift analysis and the SAP state machine over a WAL.
+
+    Uses the same code paths as the live logger (vectorized coherence,
+    ICEWLogger._decide), so states are reproduced bit-for-bit.
+
+    Args:
+        path: WAL written by TelemetryWAL
+        stop_at: Replay only events with index < stop_at (None = all)
+
+    Returns:
+        ReplayResult with the per-event trajectory and final logger state
+    """
+    header, metrics, truncated = read_metrics(path)
+    if stop_at is not None:
+        metrics = metrics[:max(0, stop_at)]
+
+    logger = ICEWLogger(header["artifact_id"], header["sha256"],
+                        profile=SAPProfile.from_dict(header["params"]))
+
+    n = len(metrics)
+    states = np.empty(n, dtype=np.int8)
+    crossed = np.empty(n, dtype=np.bool_)
+    codes = STATE_CODES
+    decide = logger._decide
+    for i, cn in enumerate(logger.calculate_coherence_batch(metrics).tolist()):
+        crossed[i] = decide(cn)[1]
+        states[i] = codes[logger.state]
+
+    invalidated = np.flatnonzero(states == STATE_CODES["INVALIDATED"])
+    return ReplayResult(
+        logger=logger,
+        events=n,
+        states=states,
+        threshold_crossed=crossed,
+        first_invalidated=int(invalidated[0]) if len(invalidated) else None,
+        truncated=truncated,
+    )
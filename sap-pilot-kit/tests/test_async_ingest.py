@@ -0,0 +1,186 @@
+"""
+Tests for SAP Pilot Kit - asyncio ingestion front-end
+"""
+import asyncio
+import random
+
+import pytest
+
+from sap_pilot_kit.async_ingest import AsyncICEWLogger
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+
+
+STABLE = {
+    'semantic_stability': 0.98,
+    'output_stability': 0.99,
+    'constraint_compliance': 1.0,
+    'decision_entropy': 0.05
+}
+UNSTABLE = {
+    'semantic_stability': 0.1,
+    'output_stability': 0.1,
+    'constraint_compliance': 0.0,
+    'decision_entropy': 0.95
+}
+EVENTS = [STABLE] * 15 + [UNSTABLE] * 30
+
+
+def _strip(log):
+    event = {k: v for k, v in log['event'].items() if k not in ('id', 'timestamp')}
+    return {**log, 'event': event}
+
+
+class TestAsyncICEWLogger:
+    """Test suite for AsyncICEWLogger."""
+
+    def test_decisions_match_sync_logger(self):
+        """Async decisions and telemetry equal the synchronous path."""
+        sync_logger = ICEWLogger("TEST-001", "abc123")
+        expected = [sync_logger.process_event(m) for m in EVENTS]
+
+        async def run():
+            logger = ICEWLogger("TEST-001", "abc123")
+            async with AsyncICEWLogger(logger, maxsize=4) as sap:
+                decisions = [await sap.submit(m) for m in EVENTS]
+            return logger, decisions
+
+        logger, decisions = asyncio.run(run())
+
+        assert decisions == [
+            (log['autarchy']['action'], log['event']['state']) for log in expected
+        ]
+        assert [_strip(log) for log in logger.telemetry_log] == [_strip(log) for log in expected]
+
+    def test_concurrent_submitters_keep_order(self):
+        """With backpressure, records are written in decision order."""
+        async def run():
+            logger = ICEWLogger("TEST-001", "abc123")
+            sap = AsyncICEWLogger(logger, maxsize=2, overflow="block")
+            await sap.start()
+            await asyncio.gather(*(sap.submit(m) for m in EVENTS))
+            await sap.close()
+            return logger
+
+        logger = asyncio.run(run())
+
+        timestamps = list(logger.telemetry_log.timestamp_ns)
+        assert len(timestamps) == len(EVENTS)
+        assert timestamps == sorted(timestamps)
+
+    def test_staggered_submitters_keep_order(self):
+        """Submitters arriving while blocked ones are being woken do not overtake them."""
+        async def run(seed):
+            rng = random.Random(seed)
+            logger = ICEWLogger("TEST-001", "abc123")
+            sap = AsyncICEWLogger(logger, maxsize=2, overflow="block")
+            await sap.start()
+
+            async def submit_later(metrics, ticks):
+                for _ in range(ticks):
+                    await asyncio.sleep(0)
+                await sap.submit(metrics)
+            await asyncio.gather(*(submit_later(m, rng.randint(0, 5)) for m in EVENTS * 4))
+            await sap.close()
+            return logger
+
+        for seed in range(5):
+            timestamps = list(asyncio.run(run(seed)).telemetry_log.timestamp_ns)
+            assert len(timestamps) == len(EVENTS) * 4
+            assert timestamps == sorted(timestamps)
+
+    def test_drop_policy(self):
+        """Dropped telemetry is counted; decisions are still returned."""
+        async def run():
+            logger = ICEWLogger("TEST-001", "abc123")
+            sap = AsyncICEWLogger(logger, maxsize=5, overflow="drop")
+            await sap.start()
+            # No await between submits' enqueue steps that yields to the writer
+            results = await asyncio.gather(*(sap.submit(m) for m in EVENTS))
+            await sap.close()
+            return logger, sap, results
+
+        logger, sap, results = asyncio.run(run())
+
+        assert len(results) == len(EVENTS)
+        assert sap.dropped > 0
+        assert len(logger.telemetry_log) + sap.dropped == len(EVENTS)
+        assert logger.state == "INVALIDATED"
+
+    def test_dropped_events_keep_epoch_stats(self):
+        """Dropping telemetry does not drop the event from the epoch statistics."""
+        async def run():
+            logger = ICEWLogger("TEST-001", "abc123")
+            sap = AsyncICEWLogger(logger, maxsize=5, overflow="drop")
+            await sap.start()
+            await asyncio.gather(*(sap.submit(m) for m in EVENTS))
+            await sap.close()
+            return logger, sap
+
+        logger, sap = asyncio.run(run())
+
+        reference = ICEWLogger("TEST-001", "abc123")
+        for m in EVENTS:
+            reference.decide(m)
+
+        assert sap.dropped > 0
+        assert logger._stat_event_count == len(EVENTS)
+        assert logger._stat_invalidated_count == reference._stat_invalidated_count
+        assert logger._stat_cn_sum == pytest.approx(reference._stat_cn_sum)
+
+    def test_writer_survives_record_errors(self, monkeypatch):
+        """A failing record is reported by flush() and later records are still written."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        record = logger._record
+        calls = []
+
+        def flaky_record(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise RuntimeError("disk full")
+            record(*args)
+        monkeypatch.setattr(logger, "_record", flaky_record)
+
+        async def run():
+            sap = AsyncICEWLogger(logger, maxsize=100)
+            for m in EVENTS:
+                await sap.submit(m)
+            with pytest.raises(RuntimeError, match="disk full"):
+                await asyncio.wait_for(sap.flush(), timeout=5)
+            await sap.submit(STABLE)
+            await asyncio.wait_for(sap.close(), timeout=5)
+            return sap
+
+        sap = asyncio.run(run())
+
+        assert sap.failed == 1
+        assert len(logger.telemetry_log) == len(EVENTS)
+
+    def test_close_flushes(self):
+        """close() writes every queued record before returning."""
+        async def run():
+            logger = ICEWLogger("TEST-001", "abc123")
+            sap = AsyncICEWLogger(logger, maxsize=100)
+            for m in EVENTS:
+                await sap.submit(m)
+            await sap.close()
+            return logger, sap
+
+        logger, sap = asyncio.run(run())
+
+        assert len(logger.telemetry_log) == len(EVENTS)
+        assert sap.pending == 0
+
+    def test_submit_after_close(self):
+        """A closed front-end rejects new events."""
+        async def run():
+            sap = AsyncICEWLogger(ICEWLogger("TEST-001", "abc123"))
+            await sap.close()
+            await sap.submit(STABLE)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+
+    def test_invalid_policy(self):
+        """Unknown overflow policies are rejected."""
+        with pytest.raises(ValueError):
+            AsyncICEWLogger(ICEWLogger("TEST-001", "abc123"), overflow="spill")
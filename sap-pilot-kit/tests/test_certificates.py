@@ -0,0 +1,134 @@
+"""
+Tests for SAP Pilot Kit - Bulk certificate rendering
+"""
+import hashlib
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from sap_pilot_kit.certificates import (
+    MANIFEST_NAME,
+    TEMPLATE_PATH,
+    CertificateRenderer,
+    CertificateTemplate,
+    certificate_filename,
+    load_template,
+)
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+
+
+STABLE = {
+    'semantic_stability': 0.9,
+    'output_stability': 0.9,
+    'constraint_compliance': 0.9,
+    'decision_entropy': 0.1
+}
+ISSUE_DATE = "2026-01-31T12:00:00+00:00"
+
+
+def _loggers(n=5):
+    loggers = []
+    for i in range(n):
+        logger = ICEWLogger(f"ART-{i:04d}", f"{i:064x}")
+        for _ in range(i + 1):
+            logger.process_event(STABLE)
+        loggers.append(logger)
+    return loggers
+
+
+def _parse_manifest(raw: bytes):
+    return {name: digest for digest, name in (line.split("  ") for line in raw.decode().splitlines())}
+
+
+class TestCertificateTemplate:
+    """Test suite for the pre-parsed template."""
+
+    def test_render_matches_str_format(self):
+        """Pre-parsed rendering is identical to str.format on the raw template."""
+        with open(TEMPLATE_PATH, encoding="utf-8") as f:
+            text = f.read()
+        template = load_template()
+        values = {name: f"<{name.lower()}>" for name in template.fields}
+
+        assert template.render(values) == text.format(**values)
+        assert set(template.fields) >= {"CERT_ID", "DATE", "RESULT"}
+
+    def test_escapes_and_specs(self):
+        template = CertificateTemplate("{{literal}} {A} and {B!r:>6}.")
+
+        assert template.render({"A": "x", "B": "y"}) == "{{literal}} {A} and {B!r:>6}.".format(A="x", B="y")
+
+    def test_template_is_cached(self):
+        assert load_template() is load_template()
+
+    def test_missing_placeholder_value(self):
+        with pytest.raises(KeyError):
+            CertificateTemplate("{A}").render({})
+
+
+class TestCertificateRenderer:
+    """Test suite for CertificateRenderer."""
+
+    def test_render_matches_generate_certificate(self, tmp_path):
+        """The renderer produces the same file generate_certificate writes."""
+        logger = _loggers(1)[0]
+        path = tmp_path / "single.md"
+        cert = logger.generate_certificate(str(path))
+
+        rendered = CertificateRenderer().render(logger, cert["issue_date"])
+
+        assert path.read_text(encoding="utf-8") == rendered
+        assert "{" not in rendered
+
+    def test_write_batch(self, tmp_path):
+        loggers = _loggers()
+        digests = CertificateRenderer().write_batch(loggers, str(tmp_path / "certs"), issue_date=ISSUE_DATE, workers=4)
+
+        assert list(digests) == [f"ART-{i:04d}.md" for i in range(5)]
+        manifest = _parse_manifest((tmp_path / "certs" / MANIFEST_NAME).read_bytes())
+        assert manifest == digests
+        for name, digest in digests.items():
+            content = (tmp_path / "certs" / name).read_bytes()
+            assert hashlib.sha256(content).hexdigest() == digest
+        assert "**Events Processed:** 3" in (tmp_path / "certs" / "ART-0002.md").read_text()
+
+    def test_write_batch_json(self, tmp_path):
+        loggers = _loggers(3)
+        CertificateRenderer().write_batch(loggers, str(tmp_path), fmt="json", issue_date=ISSUE_DATE, workers=1)
+
+        data = json.loads((tmp_path / "ART-0001.json").read_text())
+        assert data["artifact_id"] == "ART-0001"
+        assert data["issue_date"] == ISSUE_DATE
+
+    @pytest.mark.parametrize("suffix", [".zip", ".tar", ".tar.gz", ".tar.xz"])
+    def test_write_archive(self, tmp_path, suffix):
+        """Archives hold every certificate plus a manifest of their digests."""
+        loggers = _loggers()
+        path = str(tmp_path / f"certs{suffix}")
+        digests = CertificateRenderer().write_archive(loggers, path, issue_date=ISSUE_DATE)
+
+        if suffix == ".zip":
+            with zipfile.ZipFile(path) as archive:
+                files = {name: archive.read(name) for name in archive.namelist()}
+        else:
+            with tarfile.open(path) as archive:
+                files = {m.name: archive.extractfile(m).read() for m in archive.getmembers()}
+
+        assert _parse_manifest(files.pop(MANIFEST_NAME)) == digests
+        assert {name: hashlib.sha256(content).hexdigest() for name, content in files.items()} == digests
+
+    def test_errors(self, tmp_path):
+        renderer = CertificateRenderer()
+        with pytest.raises(ValueError):
+            renderer.write_archive(_loggers(1), str(tmp_path / "certs.rar"))
+        with pytest.raises(ValueError):
+            renderer.render_batch(_loggers(1), fmt="pdf")
+        with pytest.raises(ValueError, match="Duplicate"):
+            renderer.render_batch([ICEWLogger("A/1", "x"), ICEWLogger("A:1", "y")])
+        with pytest.raises(FileNotFoundError):
+            CertificateRenderer(str(tmp_path / "missing.md"))
+
+    def test_unsafe_file_names(self):
+        assert certificate_filename("../etc/passwd") == ".._etc_passwd.md"
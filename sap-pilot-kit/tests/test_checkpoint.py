@@ -0,0 +1,160 @@
+"""
+Tests for SAP Pilot Kit - ICEWLogger checkpoint and restore
+"""
+import json
+import struct
+import zlib
+from array import array
+
+import pytest
+
+from sap_pilot_kit import checkpoint
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+
+
+STABLE = {
+    'semantic_stability': 0.98,
+    'output_stability': 0.99,
+    'constraint_compliance': 1.0,
+    'decision_entropy': 0.05
+}
+UNSTABLE = {
+    'semantic_stability': 0.1,
+    'output_stability': 0.1,
+    'constraint_compliance': 0.0,
+    'decision_entropy': 0.95
+}
+
+
+def _invalidated_logger():
+    logger = ICEWLogger("TEST-001", "abc123")
+    for _ in range(15):
+        logger.process_event(STABLE)
+    for _ in range(30):
+        logger.process_event(UNSTABLE)
+    assert logger.state == "INVALIDATED"
+    return logger
+
+
+def _strip(log):
+    event = {k: v for k, v in log['event'].items() if k not in ('id', 'timestamp')}
+    return {**log, 'event': event}
+
+
+class TestCheckpoint:
+    """Test suite for ICEWLogger snapshot/restore."""
+
+    @pytest.mark.parametrize("include_log", [True, False])
+    def test_invalidated_stays_blocked(self, include_log):
+        """A restored INVALIDATED logger keeps blocking output."""
+        logger = _invalidated_logger()
+
+        restored = ICEWLogger.restore(logger.snapshot(include_log=include_log))
+
+        assert restored.state == "INVALIDATED"
+        assert restored.is_blocked
+        assert (restored.k_counter, restored.m_counter, restored.p_counter) == \
+            (logger.k_counter, logger.m_counter, logger.p_counter)
+        assert restored.decide(STABLE)[0] == "BLOCK_OUTPUT"
+
+    def test_restored_logger_continues_identically(self):
+        """After restore, processing matches an uninterrupted logger."""
+        logger = _invalidated_logger()
+        restored = ICEWLogger.restore(logger.snapshot())
+
+        for metrics in [STABLE] * 60 + [UNSTABLE] * 5:
+            assert _strip(restored.process_event(metrics)) == _strip(logger.process_event(metrics))
+        assert restored._window_mean == logger._window_mean
+        assert restored._window_m2 == logger._window_m2
+
+    def test_full_state_round_trip(self):
+        """Telemetry, epoch summaries and cursors survive the round trip."""
+        logger = ICEWLogger("TEST-ÜNICODE", "abc123")
+        logger.max_log_size = 10
+        for _ in range(25):
+            logger.process_event(STABLE)
+        logger._export_cursor = 17
+
+        restored = ICEWLogger.restore(logger.snapshot())
+
+        assert restored.artifact_id == "TEST-ÜNICODE"
+        assert restored.max_log_size == 10
+        assert restored.epoch_summaries == logger.epoch_summaries
+        assert list(restored.telemetry_log) == list(logger.telemetry_log)
+        assert restored.telemetry_log.base_seq == logger.telemetry_log.base_seq
+        assert restored._export_cursor == 17
+        assert list(restored.window) == list(logger.window)
+        assert restored.window.maxlen == logger.W_size
+
+    def test_snapshot_without_log_continues_numbering(self):
+        """Skipping the log keeps the global event sequence consistent."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        for _ in range(7):
+            logger.process_event(STABLE)
+
+        restored = ICEWLogger.restore(logger.snapshot(include_log=False))
+
+        assert len(restored.telemetry_log) == 0
+        assert restored.telemetry_log.base_seq == 7
+
+    def test_checkpoint_file(self, tmp_path):
+        """save_checkpoint/load_checkpoint round trip through a file."""
+        logger = _invalidated_logger()
+        path = str(tmp_path / "icew.ckpt")
+
+        logger.save_checkpoint(path)
+        restored = ICEWLogger.load_checkpoint(path)
+
+        assert restored.state == "INVALIDATED"
+        assert not (tmp_path / "icew.ckpt.tmp").exists()
+
+    def test_corruption_detected(self):
+        """Flipped bits and truncation are rejected."""
+        data = bytearray(_invalidated_logger().snapshot())
+        data[20] ^= 0xFF
+
+        with pytest.raises(ValueError):
+            ICEWLogger.restore(bytes(data))
+        with pytest.raises(ValueError):
+            ICEWLogger.restore(b"ICEW")
+
+    def test_reads_version_1(self):
+        """Version 1 snapshots (raw window sums) restore with rebuilt Welford stats."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        for i in range(150):
+            logger.decide(STABLE if i % 7 else UNSTABLE)
+
+        window = array("d", logger.window)
+        summaries = json.dumps(logger.epoch_summaries).encode("utf-8")
+        payload = b"".join([
+            checkpoint._HEADER.pack(checkpoint.MAGIC, 1, 0),
+            checkpoint._pack_str(logger.artifact_id),
+            checkpoint._pack_str(logger.sha256),
+            checkpoint._CORE_V1.pack(
+                100, 0.73, 3, 10, 50, logger.max_log_size, 0, 0, logger.k_counter, logger.m_counter,
+                logger.p_counter, 50, sum(window), sum(x * x for x in window),
+                logger._stat_event_count, logger._stat_start_ns, logger._stat_end_ns,
+                logger._stat_cn_sum, logger._stat_cn_min, logger._stat_cn_max, 0, 0, 0, 0, 0,
+            ),
+            struct.pack("<I", len(window)), checkpoint._array_bytes(window),
+            struct.pack("<I", len(summaries)), summaries,
+        ])
+
+        restored = ICEWLogger.restore(payload + struct.pack("<I", zlib.crc32(payload)))
+
+        assert list(restored.window) == list(logger.window)
+        assert restored._window_mean == pytest.approx(logger._window_mean, abs=1e-15)
+        assert restored._window_m2 == pytest.approx(logger._window_m2, abs=1e-12)
+        assert restored._window_run == logger._window_run
+        for i in range(40):
+            metrics = UNSTABLE if i % 5 == 0 else STABLE
+            assert restored.decide(metrics) == logger.decide(metrics)
+
+    def test_unknown_version(self):
+        """Snapshots from an unknown format version are rejected."""
+        data = _invalidated_logger().snapshot()
+        payload = data[:4] + struct.pack("<H", 99) + data[6:-4]
+        forged = payload + struct.pack("<I", zlib.crc32(payload))
+
+        with pytest.raises(ValueError, match="version"):
+            ICEWLogger.restore(forged)
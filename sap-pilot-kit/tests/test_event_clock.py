@@ -0,0 +1,79 @@
+"""
+Tests for SAP Pilot Kit - Event clock (monotonic timestamps and sortable ids)
+"""
+import re
+import uuid
+
+from sap_pilot_kit import event_clock
+from sap_pilot_kit.event_clock import EventClock, event_id_timestamp_ms
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+
+
+STABLE = {
+    'semantic_stability': 0.98,
+    'output_stability': 0.99,
+    'constraint_compliance': 1.0,
+    'decision_entropy': 0.05
+}
+
+UUID_PATTERN = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-7[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$")
+
+
+class TestEventClock:
+    """Test suite for EventClock."""
+
+    def test_timestamps_strictly_increase(self, monkeypatch):
+        """A frozen or backwards wall clock still yields increasing timestamps."""
+        readings = iter([5_000, 5_000, 4_000, 6_000, 6_000])
+        monkeypatch.setattr(event_clock.time, "time_ns", lambda: next(readings))
+        clock = EventClock()
+
+        assert [clock.now_ns() for _ in range(5)] == [5_000, 5_001, 5_002, 6_000, 6_001]
+
+    def test_ids_are_uuid7_and_sorted(self):
+        """Ids carry the UUIDv7 version/variant bits and sort in event order."""
+        clock = EventClock()
+        ids = [clock.event_id(clock.now_ns()) for _ in range(5000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        for raw in ids[:50]:
+            parsed = uuid.UUID(bytes=raw)
+            assert parsed.version == 7
+            assert parsed.variant == uuid.RFC_4122
+
+    def test_same_slot_ordered_by_sequence(self):
+        """Events in the same 1/4096 ms slot are ordered by sequence number."""
+        clock = EventClock(node=0x3FFFFFFF)
+        first = clock.event_id(1_700_000_000_000_000_000)
+        second = clock.event_id(1_700_000_000_000_000_001)
+
+        assert first[:8] == second[:8]
+        assert first < second
+
+    def test_embedded_timestamp(self):
+        clock = EventClock()
+        timestamp_ns = 1_700_000_000_123_456_789
+
+        assert event_id_timestamp_ms(clock.event_id(timestamp_ns)) == timestamp_ns // 1_000_000
+
+    def test_clocks_get_distinct_nodes(self):
+        a, b = EventClock(node=1), EventClock(node=2)
+
+        assert a.event_id(10**18) != b.event_id(10**18)
+
+
+class TestLoggerEvents:
+    """The logger's telemetry uses the event clock without changing the format."""
+
+    def test_log_ids_and_timestamps(self):
+        logger = ICEWLogger("TEST-001", "abc123")
+        for _ in range(200):
+            logger.process_event(STABLE)
+        log = logger.telemetry_log
+
+        assert list(log.timestamp_ns) == sorted(set(log.timestamp_ns))
+        ids = [log.event_id_str(i) for i in range(len(log))]
+        assert ids == sorted(ids)
+        assert all(UUID_PATTERN.match(event_id) for event_id in ids)
+        assert log[0]['event']['id'] == ids[0]
@@ -0,0 +1,138 @@
+"""
+Tests for SAP Pilot Kit - ICE-W fleet monitor
+"""
+import numpy as np
+import pytest
+
+from sap_pilot_kit.fleet import ICEWFleet, _Shard
+from sap_pilot_kit.ice_w_logger import ICEWLogger, IPHY_KEYS
+
+
+STABLE = [0.98, 0.99, 1.0, 0.05]
+UNSTABLE = [0.1, 0.1, 0.0, 0.95]
+
+
+def _scenario(stress):
+    """15 stable events, followed by 40 unstable ones when stress is set."""
+    rows = [STABLE] * 15 + ([UNSTABLE] * 40 if stress else [STABLE] * 40)
+    return np.array(rows)
+
+
+@pytest.fixture(params=[0, 2], ids=["in-process", "pool"])
+def fleet(request):
+    with ICEWFleet(processes=request.param) as f:
+        yield f
+
+
+class TestICEWFleet:
+    """Test suite for ICEWFleet."""
+
+    def test_fleet_matches_individual_loggers(self, fleet):
+        """Sharded processing gives the same state as standalone loggers."""
+        artifacts = {f"MODEL-{i:03}": f"hash{i}" for i in range(12)}
+        fleet.register_many(artifacts)
+
+        expected = {}
+        for i, artifact_id in enumerate(artifacts):
+            batch = _scenario(stress=i % 3 == 0)
+            fleet.submit_batch(artifact_id, batch)
+            logger = ICEWLogger(artifact_id, artifacts[artifact_id])
+            logger.process_events(batch)
+            expected[artifact_id] = logger.state
+
+        assert fleet.flush() == 12 * 55
+        assert fleet.states() == expected
+
+    def test_fleet_queries(self, fleet):
+        """Invalidated artifacts and per-state counts are fleet-wide."""
+        fleet.register("GOOD", "h1")
+        fleet.register("BAD", "h2")
+        fleet.submit_batch("GOOD", _scenario(stress=False))
+        fleet.submit_batch("BAD", _scenario(stress=True))
+        fleet.flush()
+
+        assert fleet.invalidated_artifacts() == ["BAD"]
+        assert fleet.state_counts() == {"SOVEREIGN": 1, "DEGRADED": 0, "INVALIDATED": 1}
+        blocked = fleet.blocked_counts()
+        assert blocked["GOOD"] == 0
+        assert blocked["BAD"] > 0
+
+    def test_single_event_submission(self, fleet):
+        """submit() buffers single dict events in order."""
+        fleet.register("MODEL-A", "h")
+        for row in _scenario(stress=True).tolist():
+            fleet.submit("MODEL-A", dict(zip(IPHY_KEYS, row)))
+
+        assert fleet.flush() == 55
+        assert fleet.flush() == 0
+        assert fleet.states()["MODEL-A"] == "INVALIDATED"
+
+    def test_unknown_artifact(self, fleet):
+        """Events for unregistered artifacts are rejected."""
+        with pytest.raises(KeyError):
+            fleet.submit("MISSING", dict(zip(IPHY_KEYS, STABLE)))
+
+    def test_shard_error_leaves_no_stale_reply(self, fleet):
+        """A failing RPC drains every shard, so the next call gets its own reply."""
+        artifacts = {f"MODEL-{i}": f"h{i}" for i in range(6)}
+        with pytest.raises(TypeError):
+            fleet.register_many(artifacts, profile="strict")
+
+        fleet.register_many(artifacts)
+        assert fleet.states() == {artifact_id: "SOVEREIGN" for artifact_id in artifacts}
+        assert fleet.blocked_counts() == {artifact_id: 0 for artifact_id in artifacts}
+
+
+@pytest.mark.parametrize("processes", [0, 2], ids=["in-process", "pool"])
+def test_flush_isolates_batches_of_failed_shard(monkeypatch, processes):
+    """Unconfirmed batches move to `failed`; later flushes are not stuck on them."""
+    process = _Shard._process
+
+    def failing(self, batches):
+        if any(artifact_id == "BAD" for artifact_id, _ in batches):
+            raise RuntimeError("shard failure")
+        return process(self, batches)
+    monkeypatch.setattr(_Shard, "_process", failing)
+
+    with ICEWFleet(processes=processes) as fleet:
+        artifacts = ["BAD"] + [f"MODEL-{i}" for i in range(8)]
+        for artifact_id in artifacts:
+            fleet.register(artifact_id, "h")
+            fleet.submit_batch(artifact_id, _scenario(stress=False))
+        bad_shard = fleet.shard_for("BAD")
+        good = [a for a in artifacts if fleet.shard_for(a) != bad_shard]
+        assert good or processes == 0
+
+        with pytest.raises(RuntimeError):
+            fleet.flush()
+        assert sorted(fleet.failed) == sorted(a for a in artifacts if a not in good)
+        assert all(len(batches) == 1 and len(batches[0]) == 55 for batches in fleet.failed.values())
+        assert all(pending == [] for pending in fleet._pending.values())
+        assert fleet.flush() == 0
+
+        # Pool workers were forked with the failing _process; resubmit in-process only
+        monkeypatch.setattr(_Shard, "_process", process)
+        if processes == 0:
+            for artifact_id, batches in fleet.failed.items():
+                for batch in batches:
+                    fleet.submit_batch(artifact_id, batch)
+            assert fleet.flush() == 55 * len(artifacts)
+        assert fleet.states()["MODEL-0"] == "SOVEREIGN"
+
+
+@pytest.mark.parametrize("bad", [
+    {"semantic_stability": "high"}, {"semantic_stability": None}, {"decision_entropy": float("nan")},
+    {"output_stability": 1.5}, {"constraint_compliance": -0.1},
+])
+def test_invalid_events_rejected_at_submit(bad):
+    """Bad values are refused by submit() and never block later flushes."""
+    with ICEWFleet(processes=0) as fleet:
+        fleet.register("MODEL-A", "h")
+        with pytest.raises(ValueError):
+            fleet.submit("MODEL-A", {**dict(zip(IPHY_KEYS, STABLE)), **bad})
+        with pytest.raises(ValueError):
+            fleet.submit_batch("MODEL-A", [{**dict(zip(IPHY_KEYS, STABLE)), **bad}])
+
+        fleet.submit("MODEL-A", dict(zip(IPHY_KEYS, STABLE)))
+        assert fleet.flush() == 1
+        assert fleet.states() == {"MODEL-A": "SOVEREIGN"}
@@ -2,10 +2,45 @@
 Tests for SAP Pilot Kit - ICE-W Logger
 """
 import json
+import math
 import tempfile
+import timeit
 import os
 
-from sap_pilot_kit.ice_w_logger import ICEWLogger
+import numpy as np
+import pytest
+
+from sap_pilot_kit.ice_w_logger import ICEWLogger, IPHY_KEYS
+from sap_pilot_kit.sap_profile import (
+    DEFAULT_PROFILE, LENIENT_PROFILE, MIN_WINDOW, STRICT_PROFILE, SAPProfile, get_profile,
+)
+
+
+def _degradation_batch(n_stable=20, n_stress=60):
+    """Stable baseline followed by a linear ambiguity ramp."""
+    batch = []
+    for _ in range(n_stable):
+        batch.append({
+            'semantic_stability': 0.98,
+            'output_stability': 0.99,
+            'constraint_compliance': 1.0,
+            'decision_entropy': 0.05
+        })
+    for i in range(n_stress):
+        ambiguity = i * 0.02
+        batch.append({
+            'semantic_stability': max(0.4, 0.98 - ambiguity),
+            'output_stability': max(0.4, 0.99 - ambiguity * 1.1),
+            'constraint_compliance': max(0.1, 1.0 - ambiguity * 1.5),
+            'decision_entropy': min(0.9, 0.05 + ambiguity)
+        })
+    return batch
+
+
+def _without_identity(log):
+    """Drop per-event id/timestamp so entries can be compared."""
+    event = {k: v for k, v in log['event'].items() if k not in ('id', 'timestamp')}
+    return {**log, 'event': event}
 
 
 class TestICEWLogger:
@@ -249,6 +284,146 @@ class TestICEWLogger:
                 os.unlink(temp_path)
 
 
+class TestBatchIngestion:
+    """Test suite for ICEWLogger.process_events."""
+
+    def test_batch_matches_event_loop(self):
+        """Batch results must be identical to process_event in a loop."""
+        batch = _degradation_batch()
+
+        loop_logger = ICEWLogger("TEST-001", "abc123")
+        loop_logs = [loop_logger.process_event(m) for m in batch]
+
+        batch_logger = ICEWLogger("TEST-001", "abc123")
+        result = batch_logger.process_events(batch)
+
+        assert len(result) == len(batch) and result.first_seq == 0
+        assert result.states == [log["event"]["state"] for log in loop_logs]
+        assert result.actions == [log["autarchy"]["action"] for log in loop_logs]
+        assert result.blocked.dtype == bool and result.state_codes.dtype == np.int8
+        assert [_without_identity(log) for log in batch_logger.telemetry_log] == \
+            [_without_identity(log) for log in loop_logs]
+        assert batch_logger.state == loop_logger.state
+        assert batch_logger.is_blocked == loop_logger.is_blocked
+        assert list(batch_logger.window) == list(loop_logger.window)
+        assert batch_logger._window_mean == loop_logger._window_mean
+        assert batch_logger._window_m2 == loop_logger._window_m2
+
+    def test_batch_accepts_numpy_array(self):
+        """A 4-column array is equivalent to the list of dicts."""
+        batch = _degradation_batch()
+        array = np.array([[m[key] for key in IPHY_KEYS] for m in batch])
+
+        dict_logger = ICEWLogger("TEST-001", "abc123")
+        array_logger = ICEWLogger("TEST-001", "abc123")
+
+        dict_result = dict_logger.process_events(batch)
+        array_result = array_logger.process_events(array)
+
+        assert array_result.states == dict_result.states
+        assert [_without_identity(log) for log in array_logger.telemetry_log] == \
+            [_without_identity(log) for log in dict_logger.telemetry_log]
+
+    def test_coherence_batch_is_bit_exact(self):
+        """Vectorized coherence equals the scalar formula exactly."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        rng = np.random.default_rng(7)
+        array = rng.random((500, 4))
+
+        expected = [
+            logger.calculate_coherence(dict(zip(IPHY_KEYS, row))) for row in array.tolist()
+        ]
+        assert logger.calculate_coherence_batch(array).tolist() == expected
+
+    def test_batch_split_across_calls(self):
+        """Window and state carry over between consecutive batches."""
+        batch = _degradation_batch()
+
+        whole = ICEWLogger("TEST-001", "abc123")
+        whole_result = whole.process_events(batch)
+
+        split = ICEWLogger("TEST-001", "abc123")
+        first, second = split.process_events(batch[:33]), split.process_events(batch[33:])
+
+        assert second.first_seq == 33
+        assert first.states + second.states == whole_result.states
+        assert first.actions + second.actions == whole_result.actions
+        assert [_without_identity(log) for log in split.telemetry_log] == \
+            [_without_identity(log) for log in whole.telemetry_log]
+
+    def test_empty_batch(self):
+        """An empty batch is a no-op."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        result = logger.process_events([])
+        assert len(result) == 0 and result.states == []
+        assert len(logger.telemetry_log) == 0
+
+    def test_batch_faster_than_event_loop(self):
+        """The batch path must never fall behind calling process_event in a loop."""
+        batch = _degradation_batch(n_stable=2000, n_stress=2000)
+
+        def loop():
+            process = ICEWLogger("TEST-001", "abc123").process_event
+            for metrics in batch:
+                process(metrics)
+
+        def bulk():
+            ICEWLogger("TEST-001", "abc123").process_events(batch)
+
+        loop_time = min(timeit.repeat(loop, number=1, repeat=5))
+        bulk_time = min(timeit.repeat(bulk, number=1, repeat=5))
+        assert bulk_time < loop_time
+
+    def test_batch_rejects_wrong_shape(self):
+        """Arrays must have one column per IPHY metric."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        with pytest.raises(ValueError):
+            logger.process_events(np.zeros((5, 3)))
+
+
+class TestDecisionOnlyMode:
+    """Test suite for ICEWLogger.decide."""
+
+    def test_decisions_match_process_event(self):
+        """decide() follows exactly the same state trajectory."""
+        batch = _degradation_batch()
+
+        full = ICEWLogger("TEST-001", "abc123")
+        fast = ICEWLogger("TEST-001", "abc123")
+        for metrics in batch:
+            log = full.process_event(metrics)
+            assert fast.decide(metrics) == (log['autarchy']['action'], log['event']['state'])
+
+        assert (fast.k_counter, fast.m_counter, fast.p_counter) == \
+            (full.k_counter, full.m_counter, full.p_counter)
+        assert list(fast.window) == list(full.window)
+
+    def test_no_log_materialization(self):
+        """Decision-only events are not appended to the telemetry log."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        for metrics in _degradation_batch():
+            logger.decide(metrics)
+
+        assert len(logger.telemetry_log) == 0
+
+    def test_epoch_summaries_still_recorded(self):
+        """Compaction summarizes decision-only events too."""
+        batch = _degradation_batch()
+        full = ICEWLogger("TEST-001", "abc123")
+        fast = ICEWLogger("TEST-001", "abc123")
+        full.max_log_size = fast.max_log_size = 25
+
+        for metrics in batch:
+            full.process_event(metrics)
+            fast.decide(metrics)
+
+        assert len(fast.epoch_summaries) == len(full.epoch_summaries) == 3
+        for a, b in zip(fast.epoch_summaries, full.epoch_summaries):
+            assert a['event_count'] == b['event_count']
+            assert a['metrics'] == b['metrics']
+            assert a['violations'] == b['violations']
+
+
 class TestSAPParameters:
     """Test SAP protocol parameters."""
 
@@ -261,3 +436,161 @@ class TestSAPParameters:
         assert logger.k_limit == 3
         assert logger.m_limit == 10
         assert logger.p_recovery == 50
+        assert logger.profile is DEFAULT_PROFILE
+
+    def test_profile_parameters(self):
+        """The logger exposes its profile's parameters read-only."""
+        logger = ICEWLogger("TEST-001", "abc123", profile=STRICT_PROFILE)
+
+        assert (logger.sigma, logger.k_limit, logger.m_limit, logger.p_recovery) == (0.5, 2, 5, 100)
+        assert logger.window.maxlen == STRICT_PROFILE.W_size
+        with pytest.raises(AttributeError):
+            logger.sigma = 1.0
+
+    @pytest.mark.parametrize("changes", [
+        {"W_size": 0}, {"W_size": MIN_WINDOW - 1}, {"sigma": 0.0}, {"sigma": float("nan")}, {"k_limit": 2.5},
+        {"m_limit": -1}, {"p_recovery": True},
+    ])
+    def test_profile_validation(self, changes):
+        with pytest.raises(ValueError):
+            DEFAULT_PROFILE.evolve(**changes)
+
+    def test_minimum_window_can_degrade(self):
+        """The smallest accepted window still runs drift analysis."""
+        logger = ICEWLogger("TEST-001", "abc123", profile=DEFAULT_PROFILE.evolve(W_size=MIN_WINDOW))
+        logger.process_events(_degradation_batch(n_stable=MIN_WINDOW))
+
+        assert logger.state != "SOVEREIGN"
+
+    def test_profile_lookup(self):
+        assert get_profile("lenient") is LENIENT_PROFILE
+        assert SAPProfile.from_dict(STRICT_PROFILE.params()).name == "strict"
+        assert DEFAULT_PROFILE.evolve(sigma=0.9).name == "custom"
+        with pytest.raises(ValueError):
+            get_profile("paranoid")
+        with pytest.raises(TypeError):
+            ICEWLogger("TEST-001", "abc123", profile={"sigma": 0.5})
+
+    def test_stricter_profile_blocks_earlier(self):
+        batch = _degradation_batch()
+        first_block = {}
+        for profile in (STRICT_PROFILE, DEFAULT_PROFILE, LENIENT_PROFILE):
+            logger = ICEWLogger("TEST-001", "abc123", profile=profile)
+            actions = [logger.decide(metrics)[0] for metrics in batch]
+            first_block[profile.name] = actions.index("BLOCK_OUTPUT") if "BLOCK_OUTPUT" in actions else None
+
+        assert first_block["strict"] < first_block["default"]
+        assert first_block["lenient"] is None or first_block["lenient"] > first_block["default"]
+
+    @pytest.mark.parametrize("profile", [STRICT_PROFILE, DEFAULT_PROFILE, LENIENT_PROFILE])
+    def test_hot_path_matches_reference(self, profile):
+        """The tightened drift check decides exactly like a full recompute with NumPy."""
+        rng = np.random.default_rng(12)
+        cns = np.concatenate([0.95 + rng.normal(0, 0.01, 300), 0.6 + rng.normal(0, 0.05, 60),
+                              0.95 + rng.normal(0, 0.001, 400)]).tolist()
+        logger = ICEWLogger("TEST-001", "abc123", profile=profile)
+        window = []
+        k = m = p = 0
+        state = "SOVEREIGN"
+        for cn in cns:
+            crossed = False
+            if len(window) >= 10:
+                crossed = abs(cn - np.mean(window)) > profile.sigma * (np.std(window) + 1e-6)
+            if state != "INVALIDATED":
+                if crossed:
+                    k += 1
+                    if k >= profile.k_limit:
+                        state = "DEGRADED"
+                        m += 1
+                        if m >= profile.m_limit:
+                            state = "INVALIDATED"
+                else:
+                    k = max(0, k - 1)
+                    if state == "DEGRADED":
+                        m = max(0, m - 1)
+                        if m == 0:
+                            state = "SOVEREIGN"
+            elif not crossed:
+                p += 1
+                if p >= profile.p_recovery:
+                    state, k, m, p = "SOVEREIGN", 0, 0, 0
+            else:
+                p = 0
+            window = (window + [cn])[-profile.W_size:]
+
+            _, logger_crossed = logger._decide(cn)
+            assert logger_crossed == crossed
+            assert (logger.state, logger.k_counter, logger.m_counter, logger.p_counter) == (state, k, m, p)
+
+
+class TestWindowStatistics:
+    """Test suite for the O(1) sliding-window mean and variance."""
+
+    @staticmethod
+    def _assert_tracks_numpy(logger, cns, every=1):
+        for i, cn in enumerate(cns):
+            logger._decide(cn)
+            if i % every == 0 or i == len(cns) - 1:
+                window = np.fromiter(logger.window, dtype=np.float64)
+                assert abs(logger._window_mean - window.mean()) < 1e-12
+                assert abs(math.sqrt(logger._window_m2 / len(window)) - window.std()) < 1e-12
+
+    def test_long_stream_matches_numpy(self):
+        """No drift over a long stream with regime changes and no periodic recompute."""
+        rng = np.random.default_rng(3)
+        cns = np.concatenate([
+            0.95 + rng.normal(0, 0.01, 100_000),
+            rng.uniform(0.0, 1.0, 20_000),
+            0.4 + rng.normal(0, 1e-4, 20_000),
+            np.where(rng.random(5_000) < 0.5, 0.2, 0.9),
+            0.9 + rng.normal(0, 0.02, 20_000),
+        ]).tolist()
+
+        self._assert_tracks_numpy(ICEWLogger("TEST-001", "abc123"), cns, every=97)
+
+    def test_constant_window_is_exact(self):
+        """A window of one repeated value has exactly zero variance."""
+        rng = np.random.default_rng(4)
+        logger = ICEWLogger("TEST-001", "abc123")
+        cns = rng.uniform(0.0, 1.0, 5_000).tolist() + [0.3] * 150
+
+        self._assert_tracks_numpy(logger, cns, every=1)
+        assert logger._window_m2 == 0.0
+        assert logger._window_mean == 0.3
+
+    def test_growing_window_matches_numpy(self):
+        logger = ICEWLogger("TEST-001", "abc123", profile=DEFAULT_PROFILE.evolve(W_size=500))
+
+        self._assert_tracks_numpy(logger, np.random.default_rng(5).uniform(0, 1, 600).tolist())
+
+    def test_rebuild_matches_incremental(self):
+        logger = ICEWLogger("TEST-001", "abc123")
+        for cn in np.random.default_rng(6).normal(0.9, 0.05, 1_000).tolist():
+            logger._decide(cn)
+        mean, m2 = logger._window_mean, logger._window_m2
+
+        logger._rebuild_window_stats()
+
+        assert logger._window_mean == pytest.approx(mean, abs=1e-14)
+        assert logger._window_m2 == pytest.approx(m2, abs=1e-13)
+
+
+class TestCompactionStats:
+    """Epoch summary statistics cover exactly the compacted events."""
+
+    def test_summary_excludes_triggering_event(self):
+        logger = ICEWLogger("TEST-001", "abc123")
+        logger.max_log_size = 5
+
+        values = [0.9, 0.8, 0.7, 0.6, 0.5]
+        for v in values + [0.1]:
+            logger.process_event({
+                'semantic_stability': v,
+                'output_stability': v,
+                'constraint_compliance': v,
+                'decision_entropy': 1.0 - v
+            })
+
+        summary = logger.epoch_summaries[0]
+        assert summary['metrics']['cn_min'] == 0.5
+        assert summary['metrics']['cn_avg'] == pytest.approx(sum(values) / 5)
@@ -0,0 +1,189 @@
+"""
+Tests for SAP Pilot Kit - Hot-path instrumentation (phase timings, counters, Prometheus text)
+"""
+import re
+
+from sap_pilot_kit import instrumentation
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+from sap_pilot_kit.instrumentation import PHASES, WRAPPED, PhaseHistogram, prometheus_text, write_prometheus
+
+
+STABLE = {
+    'semantic_stability': 0.98,
+    'output_stability': 0.99,
+    'constraint_compliance': 1.0,
+    'decision_entropy': 0.05
+}
+UNSTABLE = {
+    'semantic_stability': 0.1,
+    'output_stability': 0.1,
+    'constraint_compliance': 0.0,
+    'decision_entropy': 0.95
+}
+EVENTS = [STABLE] * 20 + [UNSTABLE] * 30 + [STABLE] * 70
+
+SAMPLE = re.compile(r'^([a-z_]+)\{(.*)\} (\S+)$')
+
+
+def _logger(instrumented=True, max_log_size=None):
+    logger = ICEWLogger("ART-1", "abc123")
+    if max_log_size is not None:
+        logger.max_log_size = max_log_size
+    if instrumented:
+        logger.enable_instrumentation()
+    return logger
+
+
+class TestInstrumentation:
+    """Test suite for opt-in ICEWLogger instrumentation."""
+
+    def test_disabled_by_default(self):
+        """Uninstrumented loggers run the class methods and still report state gauges."""
+        logger = _logger(instrumented=False)
+        for metrics in EVENTS:
+            logger.process_event(metrics)
+
+        assert logger.instrumentation is None
+        assert not set(WRAPPED) & set(vars(logger))
+        stats = logger.stats()
+        assert stats["instrumented"] is False
+        assert stats["events"] == len(EVENTS)
+        assert stats["state"] == logger.state
+        assert "phases" not in stats and "counters" not in stats
+
+    def test_results_unchanged(self):
+        """Instrumentation only observes: telemetry and state match a plain logger."""
+        plain, timed = _logger(instrumented=False, max_log_size=32), _logger(max_log_size=32)
+        for metrics in EVENTS:
+            plain.process_event(metrics)
+            timed.process_event(metrics)
+        timed.process_events(EVENTS)
+        plain.process_events(EVENTS)
+        for metrics in EVENTS:
+            assert timed.decide(metrics) == plain.decide(metrics)
+
+        assert (timed.state, timed.k_counter, timed.m_counter, timed.p_counter) == \
+            (plain.state, plain.k_counter, plain.m_counter, plain.p_counter)
+        assert list(timed.telemetry_log.cn) == list(plain.telemetry_log.cn)
+        assert list(timed.telemetry_log.state) == list(plain.telemetry_log.state)
+        assert timed.epoch_summaries[0]["metrics"] == plain.epoch_summaries[0]["metrics"]
+
+    def test_phase_and_event_counters(self):
+        logger = _logger(max_log_size=25)
+        for metrics in EVENTS:
+            logger.process_event(metrics)
+        logger.process_events(EVENTS)
+        stats = logger.stats()
+        phases, counters = stats["phases"], stats["counters"]
+        n = 2 * len(EVENTS)
+
+        assert set(phases) == set(PHASES)
+        # Batches compute coherence in one call and have no per-event wrapper
+        assert phases["event"]["count"] == phases["coherence"]["count"] == len(EVENTS)
+        assert phases["drift"]["count"] == phases["log"]["count"] == n
+        assert 0 < phases["state"]["count"] <= n
+        assert sum(counters["events_by_state"].values()) == n
+        assert counters["events_by_state"]["DEGRADED"] > 0
+        assert counters["threshold_crossings"] > 0
+        assert counters["transitions"]["SOVEREIGN->DEGRADED"] >= 1
+
+        # Compaction runs before the 26th, 51st, ... event of each epoch
+        assert counters["compactions"] == phases["compaction"]["count"] == len(logger.epoch_summaries)
+        assert counters["compacted_events"] == sum(s["event_count"] for s in logger.epoch_summaries)
+        assert stats["events"] == n
+
+        for phase in phases.values():
+            if phase["count"]:
+                assert phase["min_ns"] <= phase["p50_ns"] <= phase["p99_ns"] <= phase["max_ns"]
+                assert sum(phase["buckets"].values()) == phase["count"]
+
+    def test_decide_path_and_blocking(self):
+        logger = _logger()
+        for metrics in [STABLE] * 20 + [UNSTABLE] * 30:
+            logger.decide(metrics)
+        stats = logger.stats()
+
+        assert stats["phases"]["event"]["count"] == 50
+        assert stats["phases"]["log"]["count"] == 0
+        assert stats["counters"]["blocked_events"] == sum(
+            n for state, n in stats["counters"]["events_by_state"].items() if state == "INVALIDATED"
+        )
+        assert stats["is_blocked"] is logger.is_blocked
+
+    def test_disable_and_reset(self):
+        logger = _logger()
+        assert logger.enable_instrumentation() is logger.instrumentation
+        logger.process_event(STABLE)
+
+        logger.instrumentation.reset()
+        assert logger.stats()["phases"]["event"]["count"] == 0
+        logger.process_event(STABLE)
+        assert logger.stats()["phases"]["event"]["count"] == 1
+        assert logger.stats()["counters"]["events_by_state"]["SOVEREIGN"] == 1
+
+        logger.disable_instrumentation()
+        assert logger.instrumentation is None
+        assert not set(WRAPPED) & set(vars(logger))
+        logger.process_event(STABLE)
+        assert logger.stats()["events"] == 3
+
+
+class TestPhaseHistogram:
+    """Test suite for PhaseHistogram."""
+
+    def test_bucket_edges(self):
+        histogram = PhaseHistogram()
+        for ns in (0, 64, 65, 128, 2 ** 40):
+            histogram.observe(ns)
+        assert histogram.counts[0] == 2   # <= 64 ns
+        assert histogram.counts[1] == 2   # (64, 128] ns
+        assert histogram.counts[-1] == 1  # +Inf
+        assert (histogram.count, histogram.min_ns, histogram.max_ns) == (5, 0, 2 ** 40)
+
+        summary = histogram.to_dict()
+        assert summary["buckets"] == {"64": 2, "128": 2, "+Inf": 1}
+        assert summary["p50_ns"] == 128
+        assert summary["p99_ns"] == 2 ** 40
+
+
+class TestPrometheusText:
+    """Test suite for the Prometheus text exposition."""
+
+    def test_exposition(self, tmp_path):
+        timed = _logger(max_log_size=40)
+        timed.artifact_id = 'ART "2"'
+        plain = _logger(instrumented=False)
+        for metrics in EVENTS:
+            timed.process_event(metrics)
+            plain.process_event(metrics)
+
+        text = prometheus_text([timed, plain])
+        assert text.endswith("\n")
+        samples = {}
+        for line in text.splitlines():
+            if line.startswith("#"):
+                assert re.match(r"^# (HELP|TYPE) sap_icew_\w+ ", line)
+                continue
+            match = SAMPLE.match(line)
+            assert match, line
+            samples.setdefault(match.group(1), []).append((match.group(2), float(match.group(3))))
+
+        assert len(samples["sap_icew_state"]) == 6
+        # Counters and histograms only for the instrumented logger
+        assert all('artifact="ART \\"2\\""' in labels for labels, _ in samples["sap_icew_events_total"])
+        assert sum(v for _, v in samples["sap_icew_events_total"]) == len(EVENTS)
+        assert samples["sap_icew_compactions_total"] == [('artifact="ART \\"2\\""', 2.0)]
+
+        for phase in PHASES:
+            buckets = [v for labels, v in samples["sap_icew_phase_duration_seconds_bucket"]
+                       if f'phase="{phase}"' in labels]
+            count = [v for labels, v in samples["sap_icew_phase_duration_seconds_count"]
+                     if f'phase="{phase}"' in labels]
+            assert len(buckets) == len(instrumentation.BUCKET_BOUNDS_NS) + 1
+            assert buckets == sorted(buckets)
+            assert buckets[-1] == count[0]
+
+        path = tmp_path / "icew.prom"
+        write_prometheus(str(path), timed)
+        assert path.read_text() == prometheus_text(timed)
+        assert prometheus_text([]) == ""
@@ -0,0 +1,314 @@
+"""
+Tests for SAP Pilot Kit - Tiered epoch rollups (hour/day/month) and range queries
+"""
+import json
+import random
+import struct
+import zlib
+from datetime import datetime, timezone
+
+import pytest
+
+from sap_pilot_kit import checkpoint, event_clock
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+from sap_pilot_kit.rollups import EpochRollups, period_end, period_start
+from sap_pilot_kit.telemetry_export import read_ndjson
+from sap_pilot_kit.telemetry_store import format_timestamp_ns, parse_timestamp_ns
+
+
+STABLE = {
+    'semantic_stability': 0.98,
+    'output_stability': 0.99,
+    'constraint_compliance': 1.0,
+    'decision_entropy': 0.05
+}
+UNSTABLE = {
+    'semantic_stability': 0.1,
+    'output_stability': 0.1,
+    'constraint_compliance': 0.0,
+    'decision_entropy': 0.95
+}
+
+MINUTE_NS = 60 * 1_000_000_000
+START_NS = parse_timestamp_ns("2025-11-28T22:13:00+00:00")
+
+
+def _ns(text):
+    return parse_timestamp_ns(text)
+
+
+def _epochs(count, seed=0):
+    """Synthetic (summary, start_ns, end_ns) epochs, 5-90 minutes apart."""
+    rng = random.Random(seed)
+    t = START_NS
+    epochs = []
+    for _ in range(count):
+        events = rng.randint(1, 500)
+        cn = [round(rng.uniform(0.2, 1.0), 4) for _ in range(3)]
+        end = t + rng.randint(1, 4) * MINUTE_NS
+        summary = {
+            "type": "epoch_summary",
+            "start_time": format_timestamp_ns(t),
+            "end_time": format_timestamp_ns(end),
+            "event_count": events,
+            "metrics": {"cn_avg": sorted(cn)[1], "cn_min": min(cn), "cn_max": max(cn)},
+            "violations": {"degraded": rng.randint(0, events), "invalidated": rng.randint(0, 3)},
+        }
+        epochs.append((summary, t, end))
+        t = end + rng.randint(5, 90) * MINUTE_NS
+    return epochs
+
+
+def _rollups(epochs, **retention):
+    rollups = EpochRollups(retention)
+    for summary, start, end in epochs:
+        rollups.add(summary, start, end)
+    return rollups
+
+
+def _brute_force(epochs, lo, hi):
+    chosen = [(s, a, b) for s, a, b in epochs if lo <= a < hi]
+    if not chosen:
+        return None
+    events = sum(s["event_count"] for s, _, _ in chosen)
+    return {
+        "start_time": format_timestamp_ns(min(a for _, a, _ in chosen)),
+        "end_time": format_timestamp_ns(max(b for _, _, b in chosen)),
+        "epoch_count": len(chosen),
+        "event_count": events,
+        "cn_avg": sum(s["metrics"]["cn_avg"] * s["event_count"] for s, _, _ in chosen) / events,
+        "cn_min": min(s["metrics"]["cn_min"] for s, _, _ in chosen),
+        "cn_max": max(s["metrics"]["cn_max"] for s, _, _ in chosen),
+        "degraded": sum(s["violations"]["degraded"] for s, _, _ in chosen),
+        "invalidated": sum(s["violations"]["invalidated"] for s, _, _ in chosen),
+    }
+
+
+def _assert_matches(summary, expected):
+    assert summary["start_time"] == expected["start_time"]
+    assert summary["end_time"] == expected["end_time"]
+    assert summary["epoch_count"] == expected["epoch_count"]
+    assert summary["event_count"] == expected["event_count"]
+    assert summary["metrics"]["cn_avg"] == pytest.approx(expected["cn_avg"], rel=1e-12)
+    assert summary["metrics"]["cn_min"] == expected["cn_min"]
+    assert summary["metrics"]["cn_max"] == expected["cn_max"]
+    assert summary["violations"] == {"degraded": expected["degraded"], "invalidated": expected["invalidated"]}
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Wall clock advancing 7 minutes per reading."""
+    now = [START_NS]
+
+    def time_ns():
+        now[0] += 7 * MINUTE_NS
+        return now[0]
+    monkeypatch.setattr(event_clock.time, "time_ns", time_ns)
+    return now
+
+
+class TestPeriods:
+    """Test suite for UTC period boundaries."""
+
+    @pytest.mark.parametrize("tier,timestamp,start,end", [
+        ("hour", "2025-11-28T22:13:05.5+00:00", "2025-11-28T22:00:00+00:00", "2025-11-28T23:00:00+00:00"),
+        ("day", "2025-12-31T23:59:59+00:00", "2025-12-31T00:00:00+00:00", "2026-01-01T00:00:00+00:00"),
+        ("month", "2025-12-31T23:59:59+00:00", "2025-12-01T00:00:00+00:00", "2026-01-01T00:00:00+00:00"),
+        ("month", "2024-02-29T12:00:00+00:00", "2024-02-01T00:00:00+00:00", "2024-03-01T00:00:00+00:00"),
+    ])
+    def test_boundaries(self, tier, timestamp, start, end):
+        key = period_start(tier, _ns(timestamp))
+        assert key == _ns(start)
+        assert period_end(tier, key) == _ns(end)
+        assert period_start(tier, key) == key
+
+    def test_timestamp_round_trip(self):
+        for ts in (0, START_NS, START_NS + 123_456_000, START_NS + 1_000):
+            assert parse_timestamp_ns(format_timestamp_ns(ts)) == ts
+        assert parse_timestamp_ns("2025-11-28T22:13:00") == START_NS
+
+
+class TestEpochRollups:
+    """Test suite for EpochRollups."""
+
+    def test_range_queries_match_brute_force(self):
+        epochs = _epochs(3000)
+        rollups = _rollups(epochs, epoch=10_000, hour=10_000, day=10_000)
+        first, last = epochs[0][1], epochs[-1][2]
+        rng = random.Random(1)
+
+        for _ in range(300):
+            lo, hi = sorted(rng.randint(first - 3 * 86400 * 10 ** 9, last + 10 ** 9) for _ in range(2))
+            summary = rollups.summarize(lo, hi)
+            expected = _brute_force(epochs, lo, hi)
+            if expected is None:
+                assert summary is None
+            else:
+                assert summary["exact"] is True
+                _assert_matches(summary, expected)
+
+        # Aligned ranges resolve to whole periods
+        _assert_matches(rollups.summarize(None, None), _brute_force(epochs, 0, 2 ** 63))
+        day = period_start("day", epochs[100][1])
+        _assert_matches(rollups.summarize(day, day + 86400 * 10 ** 9), _brute_force(epochs, day, day + 86400 * 10 ** 9))
+
+    def test_tier_summaries(self):
+        epochs = _epochs(500)
+        rollups = _rollups(epochs)
+
+        for tier in ("hour", "day", "month"):
+            summaries = rollups.summaries(tier)
+            assert sum(s["event_count"] for s in summaries) == sum(s["event_count"] for s, _, _ in epochs)
+            assert sum(s["epoch_count"] for s in summaries) == len(epochs)
+            assert all(s["type"] == f"{tier}_summary" for s in summaries)
+            for s in summaries:
+                key = _ns(s["period_start"])
+                assert key == period_start(tier, key)
+                assert key <= _ns(s["start_time"]) < period_end(tier, key)
+
+        december = rollups.summaries("month", _ns("2025-12-15T00:00:00+00:00"), _ns("2026-01-01T00:00:00+00:00"))
+        assert [s["period_start"] for s in december] == ["2025-12-01T00:00:00+00:00"]
+        assert rollups.summaries("epoch", epochs[3][1], epochs[5][1]) == [epochs[3][0], epochs[4][0]]
+        with pytest.raises(ValueError):
+            rollups.summaries("week")
+
+    def test_retention_bounds_memory(self):
+        epochs = _epochs(3000)
+        rollups = _rollups(epochs, epoch=50, hour=48, day=20)
+
+        assert len(rollups.epochs) == len(rollups.tiers["epoch"].keys) == 50
+        assert rollups.epoch_base_seq == len(epochs) - 50
+        assert rollups.epochs == [s for s, _, _ in epochs[-50:]]
+        assert len(rollups.tiers["hour"].keys) == 48
+        assert len(rollups.tiers["day"].keys) == 20
+
+        # Whole months are still exact; edges inside evicted detail fall back to coarser periods
+        everything = rollups.summarize()
+        assert everything["exact"] is True
+        _assert_matches(everything, _brute_force(epochs, 0, 2 ** 63))
+
+        # An edge in a retained day whose hours were evicted widens to that whole day
+        hours = rollups.tiers["hour"]
+        lo = next(a for _, a, _ in epochs if a >= rollups.tiers["day"].horizon + 86400 * 10 ** 9) + MINUTE_NS
+        assert lo < hours.horizon
+        hi = epochs[-1][2]
+        approx = rollups.summarize(lo, hi)
+        assert approx["exact"] is False
+        _assert_matches(approx, _brute_force(epochs, period_start("day", lo), hi))
+
+        # Recent ranges are still resolved down to single epochs
+        recent = rollups.summarize(epochs[-10][1], epochs[-2][1])
+        assert recent["exact"] is True
+        _assert_matches(recent, _brute_force(epochs, epochs[-10][1], epochs[-2][1]))
+
+    def test_invalid_retention(self):
+        with pytest.raises(ValueError):
+            EpochRollups({"week": 4})
+        with pytest.raises(ValueError):
+            EpochRollups({"hour": 0})
+
+    def test_state_round_trip(self):
+        epochs = _epochs(400)
+        rollups = _rollups(epochs, epoch=30, hour=100)
+        state = json.loads(json.dumps(rollups.to_state()))
+
+        restored = EpochRollups.from_state(state, rollups.epochs)
+
+        assert restored.summaries("hour") == rollups.summaries("hour")
+        assert restored.summarize(epochs[50][1], epochs[-5][1]) == rollups.summarize(epochs[50][1], epochs[-5][1])
+        with pytest.raises(ValueError):
+            EpochRollups.from_state(state, rollups.epochs[1:])
+
+
+class TestLoggerRollups:
+    """Rollups driven by ICEWLogger log compaction."""
+
+    def _logger(self, events=600, max_log_size=20, **retention):
+        logger = ICEWLogger("TEST-001", "abc123")
+        logger.max_log_size = max_log_size
+        if retention:
+            logger.rollups = EpochRollups(retention)
+        for i in range(events):
+            logger.process_event(UNSTABLE if i % 97 in (60, 61, 62, 63) else STABLE)
+        return logger
+
+    def test_summarize_covers_all_events(self, fake_clock):
+        logger = self._logger()
+        summary = logger.summarize()
+
+        assert summary["event_count"] == 600
+        assert summary["epoch_count"] == len(logger.epoch_summaries) + 1   # plus the open epoch
+        assert summary["start_time"] == format_timestamp_ns(START_NS + 7 * MINUTE_NS)
+        assert summary["end_time"] == format_timestamp_ns(fake_clock[0])
+        assert summary["violations"]["degraded"] == sum(
+            s["violations"]["degraded"] for s in logger.epoch_summaries
+        ) + logger._stat_degraded_count
+
+        hours = logger.rollup_summaries("hour")
+        assert sum(s["event_count"] for s in hours) == 600 - logger._stat_event_count
+        assert logger.summarize(end=logger.epoch_summaries[0]["start_time"]) is None
+
+    def test_time_arguments(self, fake_clock):
+        logger = self._logger()
+        day = "2025-11-29T00:00:00+00:00"
+        as_datetime = datetime(2025, 11, 29, tzinfo=timezone.utc)
+
+        assert logger.summarize(day, "2025-11-30") == logger.summarize(as_datetime, _ns("2025-11-30T00:00:00+00:00"))
+        assert logger.rollup_summaries("day", day, "2025-11-30")[0]["period_start"] == day
+
+    def test_bounded_epochs_and_export_cursor(self, fake_clock, tmp_path):
+        logger = self._logger(events=100, epoch=3)
+        path = tmp_path / "telemetry.ndjson"
+        logger.export_telemetry_ndjson(str(path))
+
+        # Nine more epochs; only the last three are still held in detail
+        for _ in range(180):
+            logger.process_event(STABLE)
+        assert len(logger.epoch_summaries) == 3
+        assert logger.stats()["epoch_summaries"] == 3
+        logger.export_telemetry_ndjson(str(path))
+        logger.export_telemetry_ndjson(str(path))
+
+        records = list(read_ndjson(str(path)))
+        summaries = [r for r in records if r.get("type") == "epoch_summary"]
+        assert summaries[-3:] == logger.epoch_summaries
+        assert len(summaries) == len({json.dumps(s, sort_keys=True) for s in summaries})
+        assert logger.summarize()["event_count"] == 280
+
+    def test_export_telemetry(self, fake_clock, tmp_path):
+        logger = self._logger()
+        path = tmp_path / "telemetry.json"
+        logger.export_telemetry(str(path))
+
+        data = json.loads(path.read_text())
+        assert list(data) == ["rollups", "epoch_summaries", "current_window"]
+        assert list(data["rollups"]) == ["month", "day", "hour"]
+        assert data["rollups"]["month"] == logger.rollup_summaries("month")
+
+    def test_checkpoint_round_trip(self, fake_clock):
+        logger = self._logger(epoch=5, hour=6)
+        restored = ICEWLogger.restore(logger.snapshot(include_log=False))
+
+        assert restored.epoch_summaries == logger.epoch_summaries
+        assert restored.rollups.epoch_base_seq == logger.rollups.epoch_base_seq
+        assert restored.rollups.retention == logger.rollups.retention
+        assert restored.summarize() == logger.summarize()
+        assert restored.rollup_summaries("hour") == logger.rollup_summaries("hour")
+
+    def test_reads_version_2(self, fake_clock):
+        """Version 2 snapshots carry no rollups; they are rebuilt from the epoch summaries."""
+        logger = self._logger()
+        data = logger.snapshot(include_log=False)
+        rollups = json.dumps(logger.rollups.to_state(), separators=(",", ":")).encode("utf-8")
+        suffix = struct.pack("<I", len(rollups)) + rollups
+        payload = data[:-4]
+        assert payload.endswith(suffix)
+        payload = payload[:4] + struct.pack("<H", 2) + payload[6:-len(suffix)]
+
+        restored = ICEWLogger.restore(payload + struct.pack("<I", zlib.crc32(payload)))
+
+        assert checkpoint.FORMAT_VERSION == 3
+        assert restored.epoch_summaries == logger.epoch_summaries
+        assert [s["event_count"] for s in restored.rollup_summaries("hour")] == \
+            [s["event_count"] for s in logger.rollup_summaries("hour")]
+        assert restored.summarize()["event_count"] == 600
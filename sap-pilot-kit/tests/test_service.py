@@ -0,0 +1,265 @@
+"""
+Tests for SAP Pilot Kit - HTTP governance service
+"""
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# meba-core lives next to this package in the monorepo
+_MEBA_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "meba-core", "src"))
+if os.path.isdir(_MEBA_SRC) and _MEBA_SRC not in sys.path:
+    sys.path.insert(0, _MEBA_SRC)
+
+from sap_pilot_kit import service as service_module  # noqa: E402
+from sap_pilot_kit.ice_w_logger import ICEWLogger  # noqa: E402
+from sap_pilot_kit.service import SAPGovernanceService  # noqa: E402
+
+
+STABLE = {
+    'semantic_stability': 0.98,
+    'output_stability': 0.99,
+    'constraint_compliance': 1.0,
+    'decision_entropy': 0.05
+}
+UNSTABLE = {
+    'semantic_stability': 0.1,
+    'output_stability': 0.1,
+    'constraint_compliance': 0.0,
+    'decision_entropy': 0.95
+}
+EVENTS = [STABLE] * 15 + [UNSTABLE] * 30
+
+requires_meba = pytest.mark.skipif(service_module.MEBACalculator is None, reason="meba-core not importable")
+
+
+def _call(service, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    return service.dispatch(method, path, body)
+
+
+def _registered(**kwargs):
+    service = SAPGovernanceService(**kwargs)
+    status, _ = _call(service, "POST", "/artifacts", {"artifact_id": "ART-1", "sha256": "abc123"})
+    assert status == 201
+    return service
+
+
+async def _request(reader, writer, method, path, payload=None, close=False):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+    if close:
+        head += "Connection: close\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+    status_line, *header_lines = (await reader.readuntil(b"\r\n\r\n")).decode().strip().split("\r\n")
+    headers = {k.lower(): v.strip() for k, v in (line.split(":", 1) for line in header_lines)}
+    data = json.loads(await reader.readexactly(int(headers["content-length"])))
+    return int(status_line.split()[1]), headers, data
+
+
+class TestRouting:
+    """Request handling without the network."""
+
+    def test_single_events_match_logger(self):
+        """Per-event decisions equal a local ICEWLogger fed the same events."""
+        service = _registered()
+        reference = ICEWLogger("ART-1", "abc123")
+
+        for metrics in EVENTS:
+            status, result = _call(service, "POST", "/artifacts/ART-1/events", metrics)
+            assert status == 200
+            assert (result["action"], result["state"]) == reference.decide(metrics)
+
+        status, state = _call(service, "GET", "/artifacts/ART-1")
+        assert state["state"] == "INVALIDATED" and state["is_blocked"]
+        assert state["events"] == len(EVENTS)
+
+    def test_batch_matches_single(self):
+        single, batch = _registered(), _registered()
+        actions = [_call(single, "POST", "/artifacts/ART-1/events", m)[1]["action"] for m in EVENTS]
+
+        status, result = _call(batch, "POST", "/artifacts/ART-1/events/batch", {"events": EVENTS})
+
+        assert status == 200
+        assert result["processed"] == len(EVENTS)
+        assert result["blocked"] == [int(a == "BLOCK_OUTPUT") for a in actions]
+        assert _call(batch, "GET", "/artifacts/ART-1") == _call(single, "GET", "/artifacts/ART-1")
+
+    def test_registration(self):
+        service = _registered()
+
+        assert _call(service, "POST", "/artifacts", {"artifact_id": "ART-1", "sha256": "abc123"})[0] == 200
+        assert _call(service, "POST", "/artifacts", {"artifact_id": "ART-1", "sha256": "other"})[0] == 409
+        status, state = _call(service, "POST", "/sap-governance/v1/artifacts",
+                              {"artifact_id": "ART/2", "sha256": "x", "profile": "strict"})
+        assert status == 201 and state["profile"] == "strict"
+        assert _call(service, "GET", "/artifacts/ART%2F2")[1]["artifact_id"] == "ART/2"
+        assert len(_call(service, "GET", "/artifacts")[1]["artifacts"]) == 2
+
+    @pytest.mark.parametrize("method,path,payload,status", [
+        ("GET", "/nowhere", None, 404),
+        ("GET", "/artifacts/UNKNOWN", None, 404),
+        ("DELETE", "/artifacts/ART-1", None, 405),
+        ("POST", "/artifacts/ART-1/events", {"semantic_stability": 0.9}, 400),
+        ("POST", "/artifacts/ART-1/events/batch", {"events": [[0.9, 0.9]]}, 400),
+        ("POST", "/artifacts", {"artifact_id": "X", "sha256": "y", "profile": "paranoid"}, 400),
+    ])
+    def test_errors(self, method, path, payload, status):
+        assert _call(_registered(), method, path, payload)[0] == status
+
+    def test_invalid_json(self):
+        status, result = _registered().dispatch("POST", "/artifacts/ART-1/events", b"{not json")
+
+        assert status == 400
+        assert "Invalid JSON" in result["error"]
+
+    @pytest.mark.parametrize("path,body", [
+        ("/artifacts/ART-1/events", b'{"semantic_stability": NaN, "output_stability": 0.9,'
+                                    b' "constraint_compliance": 1.0, "decision_entropy": 0.1}'),
+        ("/artifacts/ART-1/events", b'{"semantic_stability": 1e999, "output_stability": 0.9,'
+                                    b' "constraint_compliance": 1.0, "decision_entropy": 0.1}'),
+        ("/artifacts/ART-1/events", json.dumps(dict(STABLE, decision_entropy=-0.5)).encode()),
+        ("/artifacts/ART-1/events", json.dumps(dict(STABLE, output_stability="0.9")).encode()),
+        ("/artifacts/ART-1/events/batch", json.dumps([STABLE, dict(STABLE, semantic_stability=1.5)]).encode()),
+        ("/artifacts/ART-1/events/batch", b'[{"semantic_stability": Infinity, "output_stability": 0.9,'
+                                          b' "constraint_compliance": 1.0, "decision_entropy": 0.1}]'),
+    ])
+    def test_rejects_invalid_iphy_values(self, path, body):
+        """Non-finite or out-of-range metrics are rejected before they reach the logger."""
+        service = _registered()
+
+        status, result = service.dispatch("POST", path, body)
+
+        assert status == 400, result
+        assert _call(service, "GET", "/artifacts/ART-1")[1]["events"] == 0
+        for metrics in [STABLE] * 15 + [UNSTABLE] * 30:
+            _call(service, "POST", "/artifacts/ART-1/events", metrics)
+        assert _call(service, "GET", "/artifacts/ART-1")[1]["state"] == "INVALIDATED"
+
+    def test_internal_error_hides_details(self, monkeypatch):
+        service = _registered()
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("secret internal detail")
+        monkeypatch.setattr(service, "_state", broken)
+
+        status, result = _call(service, "GET", "/artifacts/ART-1")
+        assert status == 500
+        assert result == {"error": "Internal server error"}
+
+    def test_metrics(self):
+        """GET /metrics is Prometheus text; counters appear with --instrument."""
+        plain, timed = _registered(), _registered(instrument=True)
+        for service in (plain, timed):
+            _call(service, "POST", "/artifacts/ART-1/events/batch", EVENTS)
+
+        status, text = _call(plain, "GET", "/metrics")
+        assert status == 200 and isinstance(text, str)
+        assert 'sap_icew_state{artifact="ART-1",state="INVALIDATED"} 1' in text
+        assert "sap_icew_events_total" not in text
+
+        status, text = _call(timed, "GET", "/sap-governance/v1/metrics")
+        assert 'sap_icew_events_total{artifact="ART-1",state="INVALIDATED"}' in text
+        assert 'sap_icew_phase_duration_seconds_count{artifact="ART-1",phase="drift"} ' + str(len(EVENTS)) in text
+        response = SAPGovernanceService._response(200, text, keep_alive=True)
+        assert b"Content-Type: text/plain; version=0.0.4" in response
+
+    @requires_meba
+    def test_meba_score(self):
+        from meba_core.meba_metric import MEBACalculator
+
+        service = SAPGovernanceService()
+        interactions = [{"sentiment_score": s, "duration_seconds": d}
+                        for s, d in [(0.8, 10.0), (-0.5, 30.0), (0.3, 5.0), (0.0, 2.0)]]
+        assert _call(service, "POST", "/meba/team-a/interactions", interactions)[0] == 200
+        assert _call(service, "POST", "/meba/team-a/interactions",
+                     {"sentiment_score": [-0.9], "duration_seconds": [12.0]})[1]["interactions"] == 5
+
+        status, score = _call(service, "GET", "/meba/team-a/score")
+
+        reference = MEBACalculator()
+        reference.add_interactions_array([0.8, -0.5, 0.3, 0.0, -0.9], [10.0, 30.0, 5.0, 2.0, 12.0])
+        assert status == 200
+        assert score["meba_cert"] == reference.calculate_score()["meba_cert"]
+        assert _call(service, "GET", "/meba/unknown/score")[0] == 404
+
+    @requires_meba
+    def test_meba_rejects_invalid_body_without_creating_key(self):
+        service = SAPGovernanceService()
+
+        assert _call(service, "POST", "/meba/team-b/interactions", [{"sentiment_score": 0.5}])[0] == 400
+        assert _call(service, "POST", "/meba/team-b/interactions",
+                     {"sentiment_score": [0.5, 0.1], "duration_seconds": [1.0]})[0] == 400
+        assert service.dispatch("POST", "/meba/team-b/interactions",
+                                b'{"sentiment_score": [0.5], "duration_seconds": [1e999]}')[0] == 400
+        assert _call(service, "POST", "/meba/team-b/interactions",
+                     {"sentiment_score": [0.5, 0.1], "duration_seconds": [1.0, -2.0]})[0] == 400
+        assert _call(service, "POST", "/meba/team-b/interactions",
+                     [{"sentiment_score": 1.5, "duration_seconds": 1.0}])[0] == 400
+        assert _call(service, "POST", "/meba/team-b/interactions",
+                     [{"sentiment_score": -1.01, "duration_seconds": 1.0}])[0] == 400
+        assert "team-b" not in service.meba
+        assert _call(service, "GET", "/meba/team-b/score")[0] == 404
+
+
+class TestHTTP:
+    """End-to-end over a localhost socket."""
+
+    def test_keep_alive_connection(self):
+        """Many requests share one connection; Connection: close ends it."""
+        async def run():
+            async with SAPGovernanceService(port=0) as service:
+                reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+                status, headers, _ = await _request(reader, writer, "POST", "/artifacts",
+                                                    {"artifact_id": "ART-1", "sha256": "abc123"})
+                assert status == 201 and headers["connection"] == "keep-alive"
+                results = [await _request(reader, writer, "POST", "/artifacts/ART-1/events", m)
+                           for m in EVENTS]
+                status, headers, state = await _request(reader, writer, "GET", "/artifacts/ART-1", close=True)
+                assert headers["connection"] == "close"
+                assert await reader.read() == b""
+                writer.close()
+                return service.requests_served, results, state
+
+        served, results, state = asyncio.run(run())
+
+        assert served == len(EVENTS) + 2
+        assert results[-1][2] == {"action": "BLOCK_OUTPUT", "state": "INVALIDATED"}
+        assert state["events"] == len(EVENTS)
+
+    def test_pipelined_requests_and_bad_head(self):
+        async def run():
+            async with SAPGovernanceService(port=0) as service:
+                reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+                writer.write(b"GET /health HTTP/1.1\r\n\r\n" * 3)
+                statuses = [(await _read_status(reader)) for _ in range(3)]
+                writer.write(b"garbage\r\n\r\n")
+                statuses.append(await _read_status(reader))
+                assert await reader.read() == b""
+                writer.close()
+                return statuses
+
+        assert asyncio.run(run()) == [200, 200, 200, 400]
+
+    def test_stalled_body_is_dropped(self):
+        """A client that stops sending mid-body is disconnected after keepalive_timeout."""
+        async def run():
+            async with SAPGovernanceService(port=0, keepalive_timeout=0.2) as service:
+                reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+                writer.write(b"POST /artifacts HTTP/1.1\r\nContent-Length: 100\r\n\r\n{\"artifact_id\"")
+                await writer.drain()
+                closed = await asyncio.wait_for(reader.read(), timeout=5)
+                writer.close()
+                return closed, service.requests_served
+
+        assert asyncio.run(run()) == (b"", 0)
+
+
+async def _read_status(reader):
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    length = int(head.lower().split("content-length:")[1].split("\r\n")[0])
+    await reader.readexactly(length)
+    return int(head.split()[1])
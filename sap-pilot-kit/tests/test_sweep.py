@@ -0,0 +1,85 @@
+"""
+Tests for SAP Pilot Kit - Boiling Frog parameter sweep
+"""
+import pytest
+
+from sap_pilot_kit.boiling_frog_tester import BASELINE_METRICS, stress_metrics
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+from sap_pilot_kit.sweep import Scenario, build_grid, run_scenario, run_sweep, to_table
+
+
+def _reference_run(baseline_events):
+    """The simulate_stress_test run with a given baseline length, without printing."""
+    logger = ICEWLogger("REF", "0" * 64)
+    for _ in range(baseline_events):
+        logger.process_event(dict(BASELINE_METRICS))
+    first_degraded = None
+    for level in range(1, 31):
+        log = logger.process_event(stress_metrics(level * 0.03))
+        if first_degraded is None and log["event"]["state"] != "SOVEREIGN":
+            first_degraded = level
+        if log["autarchy"]["action"] == "BLOCK_OUTPUT":
+            return level, first_degraded
+    return None, first_degraded
+
+
+class TestSweep:
+    """Test suite for the Boiling Frog sweep engine."""
+
+    def test_default_scenario_matches_stress_test(self, capsys):
+        """Default parameters reproduce the simulate_stress_test ramp, silently."""
+        result = run_scenario(Scenario())
+
+        assert result.scenario.baseline_events > result.scenario.W_size
+        assert (result.blocked_at_level, result.first_degraded_level) == _reference_run(Scenario().baseline_events)
+        assert result.final_state == "INVALIDATED"
+        assert result.false_positive_rate == 0.0
+        assert capsys.readouterr().out == ""
+
+    def test_parameters_change_outcome(self):
+        """Looser limits block later (or not at all)."""
+        strict = run_scenario(Scenario(k_limit=1, m_limit=3))
+        lenient = run_scenario(Scenario(m_limit=40))
+
+        assert strict.blocked_at_level < run_scenario(Scenario()).blocked_at_level
+        assert lenient.blocked_at_level is None
+        assert lenient.first_degraded_level is not None
+
+    def test_noisy_baseline_false_positives(self):
+        """A hair-trigger sigma flags a noisy baseline; the default does not."""
+        noisy = dict(baseline_events=300, baseline_noise=0.02, seed=1)
+        touchy = run_scenario(Scenario(sigma=0.05, k_limit=1, **noisy))
+        default = run_scenario(Scenario(**noisy))
+
+        assert touchy.false_positive_rate > default.false_positive_rate
+        assert 0.0 <= default.false_positive_rate <= 1.0
+
+    def test_baseline_must_fill_the_window(self):
+        """A baseline no longer than the window cannot measure false positives."""
+        with pytest.raises(ValueError):
+            Scenario(baseline_events=10)
+        with pytest.raises(ValueError):
+            Scenario(W_size=200, baseline_events=200)
+        assert Scenario(W_size=20, baseline_events=21).baseline_events == 21
+
+    def test_build_grid(self):
+        grid = build_grid(sigma=[0.5, 0.73], k_limit=range(1, 4), curve="sqrt")
+
+        assert len(grid) == 6
+        assert {s.curve for s in grid} == {"sqrt"}
+        with pytest.raises(ValueError):
+            build_grid(sigmas=[1.0])
+        with pytest.raises(ValueError):
+            Scenario(curve="cubic")
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_sweep_table(self, processes):
+        """Pool and in-process sweeps give the same ordered table."""
+        grid = build_grid(sigma=[0.5, 0.73, 1.0], curve=["linear", "quadratic"], m_limit=[5, 10])
+        results = run_sweep(grid, processes=processes)
+        table = to_table(results)
+
+        assert [r.scenario for r in results] == grid
+        assert results == [run_scenario(s) for s in grid]
+        assert len(table["blocked_at_level"]) == len(grid)
+        assert table["sigma"][:4] == [0.5, 0.5, 0.5, 0.5]
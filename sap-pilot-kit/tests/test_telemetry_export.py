@@ -0,0 +1,127 @@
+"""
+Tests for SAP Pilot Kit - Streaming telemetry export
+"""
+import gzip
+import json
+import os
+
+import pytest
+
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+from sap_pilot_kit.telemetry_export import infer_compression, open_sink, read_ndjson
+
+
+STABLE = {
+    'semantic_stability': 0.9,
+    'output_stability': 0.9,
+    'constraint_compliance': 0.9,
+    'decision_entropy': 0.1
+}
+
+
+def _logger_with_events(n, max_log_size=None):
+    logger = ICEWLogger("TEST-001", "abc123")
+    if max_log_size is not None:
+        logger.max_log_size = max_log_size
+    for _ in range(n):
+        logger.process_event(STABLE)
+    return logger
+
+
+class TestNDJSONExport:
+    """Test suite for ICEWLogger.export_telemetry_ndjson."""
+
+    def test_full_export(self, tmp_path):
+        """Every buffered event becomes one NDJSON line."""
+        logger = _logger_with_events(5)
+        path = tmp_path / "telemetry.ndjson"
+
+        written = logger.export_telemetry_ndjson(str(path), incremental=False)
+
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert written == 5
+        assert len(lines) == 5
+        assert [json.loads(line) for line in lines] == list(logger.telemetry_log)
+
+    def test_incremental_append(self, tmp_path):
+        """Only events since the previous export are appended."""
+        logger = _logger_with_events(3)
+        path = str(tmp_path / "telemetry.ndjson")
+
+        assert logger.export_telemetry_ndjson(path) == 3
+        assert logger.export_telemetry_ndjson(path) == 0
+
+        for _ in range(4):
+            logger.process_event(STABLE)
+        assert logger.export_telemetry_ndjson(path) == 4
+
+        records = list(read_ndjson(path))
+        assert len(records) == 7
+        assert records == list(logger.telemetry_log)
+
+    def test_incremental_across_compaction(self, tmp_path):
+        """Compacted events are represented by their epoch summary."""
+        logger = _logger_with_events(4, max_log_size=5)
+        path = str(tmp_path / "telemetry.ndjson")
+        logger.export_telemetry_ndjson(path)
+
+        # 2 more events: the 6th triggers compaction of events 1-5
+        for _ in range(2):
+            logger.process_event(STABLE)
+        assert logger.export_telemetry_ndjson(path) == 2
+
+        records = list(read_ndjson(path))
+        assert records[4]['type'] == "epoch_summary"
+        assert records[4]['event_count'] == 5
+        assert records[5] == logger.telemetry_log[0]
+
+    @pytest.mark.parametrize("suffix", [".ndjson.gz", ".ndjson.bz2", ".ndjson.xz"])
+    def test_compressed_incremental(self, tmp_path, suffix):
+        """Compressed sinks support appending new members."""
+        logger = _logger_with_events(2)
+        path = str(tmp_path / ("telemetry" + suffix))
+
+        logger.export_telemetry_ndjson(path)
+        logger.process_event(STABLE)
+        logger.export_telemetry_ndjson(path)
+
+        assert list(read_ndjson(path)) == list(logger.telemetry_log)
+
+    def test_explicit_compression(self, tmp_path):
+        """An explicit compression overrides the suffix."""
+        logger = _logger_with_events(2)
+        path = str(tmp_path / "telemetry.log")
+
+        logger.export_telemetry_ndjson(path, compression="gzip", incremental=False)
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == 2
+
+    def test_unknown_compression(self, tmp_path):
+        """Unsupported codecs are rejected."""
+        with pytest.raises(ValueError):
+            open_sink(str(tmp_path / "x.ndjson"), compression="zip")
+
+    def test_infer_compression(self):
+        """File suffixes map to stdlib codecs."""
+        assert infer_compression("a.ndjson.gz") == "gzip"
+        assert infer_compression("a.ndjson.xz") == "lzma"
+        assert infer_compression("a.ndjson") is None
+
+
+class TestJSONExport:
+    """The legacy JSON export is now streamed but byte-identical."""
+
+    def test_bytes_match_json_dump(self, tmp_path):
+        logger = _logger_with_events(7, max_log_size=3)
+        path = tmp_path / "telemetry.json"
+
+        logger.export_telemetry(str(path))
+
+        expected = json.dumps({
+            "rollups": {tier: logger.rollup_summaries(tier) for tier in ("month", "day", "hour")},
+            "epoch_summaries": logger.epoch_summaries,
+            "current_window": list(logger.telemetry_log)
+        })
+        assert path.read_text() == expected
+        assert os.path.getsize(path) > 0
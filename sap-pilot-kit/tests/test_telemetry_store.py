@@ -0,0 +1,120 @@
+"""
+Tests for SAP Pilot Kit - Columnar telemetry store
+"""
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from sap_pilot_kit.ice_w_logger import ICEWLogger
+from sap_pilot_kit.telemetry_store import (
+    FLAG_BLOCKED,
+    FLAG_THRESHOLD_CROSSED,
+    STATE_CODES,
+    TelemetryBuffer,
+    format_timestamp_ns,
+)
+
+
+STABLE = {
+    'semantic_stability': 0.9,
+    'output_stability': 0.9,
+    'constraint_compliance': 0.9,
+    'decision_entropy': 0.1
+}
+
+
+class TestTelemetryBuffer:
+    """Test suite for TelemetryBuffer."""
+
+    def _buffer_with_event(self, flags=0, state="SOVEREIGN"):
+        buffer = TelemetryBuffer("TEST-001", "abc123")
+        buffer.append(0.9, 0.0123, flags, STATE_CODES[state], 1, 2, 3,
+                      1_700_000_000_123_456_789, uuid.UUID(int=42).bytes)
+        return buffer
+
+    def test_entry_shape(self):
+        """Materialized entries keep the SAP-Telemetry-0.1 shape."""
+        entry = self._buffer_with_event()[0]
+
+        assert entry['schema_version'] == "SAP-Telemetry-0.1"
+        assert entry['artifact'] == {"id": "TEST-001", "hash": "abc123"}
+        assert entry['event']['id'] == str(uuid.UUID(int=42))
+        assert entry['event']['state'] == "SOVEREIGN"
+        assert entry['metrics'] == {"cn": 0.9, "delta": 0.0123, "threshold_crossed": False}
+        assert entry['autarchy'] == {"k": 1, "m": 2, "p": 3, "action": "ALLOW"}
+
+    def test_flags(self):
+        """Flag bits map to threshold_crossed and the autarchy action."""
+        entry = self._buffer_with_event(FLAG_THRESHOLD_CROSSED | FLAG_BLOCKED, "INVALIDATED")[-1]
+
+        assert entry['metrics']['threshold_crossed'] is True
+        assert entry['autarchy']['action'] == "BLOCK_OUTPUT"
+        assert entry['event']['state'] == "INVALIDATED"
+
+    def test_timestamp_format(self):
+        """Timestamps render like datetime.isoformat() at microsecond precision."""
+        iso = format_timestamp_ns(1_700_000_000_123_456_789)
+
+        assert iso == "2023-11-14T22:13:20.123456+00:00"
+        assert datetime.fromisoformat(iso).microsecond == 123456
+        assert format_timestamp_ns(1_700_000_000_000_000_000) == "2023-11-14T22:13:20+00:00"
+
+    def test_cached_timestamp_format_matches_datetime(self):
+        """The per-second cache renders exactly like timedelta arithmetic."""
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        rng = random.Random(7)
+        values = [rng.randrange(0, 4_000_000_000 * 10**9) for _ in range(2000)]
+        values += [1_700_000_000_000_000_999, 1_700_000_000_999_999_999, 0, -1_500]
+
+        for ns in values:
+            assert format_timestamp_ns(ns) == (epoch + timedelta(microseconds=ns // 1000)).isoformat()
+
+    def test_index_errors_and_slices(self):
+        """Indexing behaves like a read-only sequence."""
+        buffer = self._buffer_with_event()
+
+        with pytest.raises(IndexError):
+            buffer[1]
+        assert len(buffer[0:5]) == 1
+        assert list(buffer) == buffer[:]
+
+    def test_clear(self):
+        """clear() drops every column."""
+        buffer = self._buffer_with_event()
+        buffer.clear()
+
+        assert len(buffer) == 0
+        assert buffer.nbytes() == 0
+
+
+class TestLoggerColumnarLog:
+    """ICEWLogger integration with the columnar store."""
+
+    def test_log_entries_match_returned_entries(self):
+        """Entries read back from the log equal what process_event returned."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        returned = [logger.process_event(STABLE) for _ in range(20)]
+
+        assert list(logger.telemetry_log) == returned
+        assert len({log['event']['id'] for log in returned}) == 20
+
+    def test_compact_footprint(self):
+        """Per-event storage stays well under 100 bytes."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        for _ in range(1000):
+            logger.process_event(STABLE)
+
+        assert logger.telemetry_log.nbytes() / len(logger.telemetry_log) < 100
+
+    def test_compaction_keeps_timestamps(self):
+        """Epoch summaries use the first and last buffered timestamps."""
+        logger = ICEWLogger("TEST-001", "abc123")
+        logger.max_log_size = 10
+        logs = [logger.process_event(STABLE) for _ in range(11)]
+
+        summary = logger.epoch_summaries[0]
+        assert summary['start_time'] == logs[0]['event']['timestamp']
+        assert summary['end_time'] == logs[9]['event']['timestamp']
+        assert len(logger.telemetry_log) == 1
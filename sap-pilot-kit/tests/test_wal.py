@@ -0,0 +1,149 @@
+"""
+Tests for SAP Pilot Kit - Write-ahead log and deterministic replay
+"""
+import numpy as np
+import pytest
+
+from sap_pilot_kit.ice_w_logger import ICEWLogger, IPHY_KEYS
+from sap_pilot_kit.telemetry_store import STATE_CODES
+from sap_pilot_kit.wal import TelemetryWAL, read_header, read_metrics, replay
+
+
+def _traffic(n=400, seed=3):
+    """Noisy stable traffic with an instability burst in the middle."""
+    rng = np.random.default_rng(seed)
+    rows = 0.95 + rng.uniform(-0.02, 0.02, size=(n, 4))
+    rows[:, 3] = 1.0 - rows[:, 3]
+    rows[n // 2:n // 2 + 40] = [0.2, 0.2, 0.1, 0.9]
+    return rows
+
+
+class TestTelemetryWAL:
+    """Test suite for TelemetryWAL and replay()."""
+
+    def test_replay_reproduces_states(self, tmp_path):
+        """Replay reproduces every live decision bit-for-bit."""
+        path = str(tmp_path / "icew.wal")
+        rows = _traffic()
+
+        logger = ICEWLogger("TEST-001", "abc123")
+        wal = TelemetryWAL.for_logger(path, logger, fsync_every=32)
+        live_states = []
+        for i, row in enumerate(rows.tolist()):
+            metrics = dict(zip(IPHY_KEYS, row))
+            if i % 3 == 0:
+                state = logger.decide(metrics)[1]
+            else:
+                state = logger.process_event(metrics)['event']['state']
+            live_states.append(STATE_CODES[state])
+        wal.close()
+
+        result = replay(path)
+
+        assert result.events == len(rows)
+        assert result.states.tolist() == live_states
+        assert result.logger.state == logger.state
+        assert list(result.logger.window) == list(logger.window)
+        assert result.first_invalidated is not None
+        assert not result.truncated
+
+    def test_stop_at_index(self, tmp_path):
+        """Replay can stop at any event index."""
+        path = str(tmp_path / "icew.wal")
+        rows = _traffic()
+        logger = ICEWLogger("TEST-001", "abc123")
+        with TelemetryWAL.for_logger(path, logger):
+            logger.process_events(rows)
+
+        stop = 230
+        partial = replay(path, stop_at=stop)
+
+        reference = ICEWLogger("TEST-001", "abc123")
+        reference.process_events(rows[:stop])
+        assert partial.events == stop
+        assert partial.logger.state == reference.state
+        assert (partial.logger.k_counter, partial.logger.m_counter) == \
+            (reference.k_counter, reference.m_counter)
+
+    def test_torn_tail_is_ignored_and_repaired(self, tmp_path):
+        """A partially written final frame is skipped and truncated on reopen."""
+        path = tmp_path / "icew.wal"
+        logger = ICEWLogger("TEST-001", "abc123")
+        with TelemetryWAL.for_logger(str(path), logger):
+            logger.process_events(_traffic(50))
+
+        with open(path, "ab") as f:
+            f.write(b"\x20\x00\x00\x00garbage")
+
+        _, metrics, truncated = read_metrics(str(path))
+        assert truncated
+        assert len(metrics) == 50
+
+        with TelemetryWAL.for_logger(str(path), logger) as wal:
+            logger.process_event(dict(zip(IPHY_KEYS, [0.9, 0.9, 0.9, 0.1])))
+            assert wal.events_written == 1
+
+        _, metrics, truncated = read_metrics(str(path))
+        assert not truncated
+        assert len(metrics) == 51
+
+    def test_header_records_protocol(self, tmp_path):
+        """The header pins the artifact and its protocol parameters."""
+        path = str(tmp_path / "icew.wal")
+        logger = ICEWLogger("TEST-001", "abc123")
+        TelemetryWAL.for_logger(path, logger).close()
+
+        header, _ = read_header(path)
+        assert header["artifact_id"] == "TEST-001"
+        assert header["params"]["sigma"] == 0.73
+
+        other = ICEWLogger("OTHER", "abc123")
+        with pytest.raises(ValueError):
+            TelemetryWAL.for_logger(path, other)
+
+    def test_refuses_logger_with_history(self, tmp_path):
+        """A WAL cannot be attached to a logger whose history it would not contain."""
+        rows = _traffic(100)
+        used = ICEWLogger("TEST-001", "abc123")
+        used.process_events(rows[:20])
+        with pytest.raises(ValueError):
+            TelemetryWAL.for_logger(str(tmp_path / "new.wal"), used)
+
+        stats_only = ICEWLogger("TEST-001", "abc123")
+        stats_only.decide(dict(zip(IPHY_KEYS, rows[0].tolist())))
+        with pytest.raises(ValueError):
+            TelemetryWAL.for_logger(str(tmp_path / "new.wal"), stats_only)
+
+        path = str(tmp_path / "icew.wal")
+        with TelemetryWAL.for_logger(path, ICEWLogger("TEST-001", "abc123")) as wal:
+            wal.append_array(rows[:50])
+        with pytest.raises(ValueError):
+            TelemetryWAL.for_logger(path, used)
+        with pytest.raises(ValueError):
+            TelemetryWAL.for_logger(path, ICEWLogger("TEST-001", "abc123"))
+
+    def test_continue_from_replay(self, tmp_path):
+        """A replayed logger can keep writing to its WAL and replay stays exact."""
+        path = str(tmp_path / "icew.wal")
+        rows = _traffic()
+        logger = ICEWLogger("TEST-001", "abc123")
+        with TelemetryWAL.for_logger(path, logger):
+            logger.process_events(rows[:150])
+
+        resumed = replay(path).logger
+        with TelemetryWAL.for_logger(path, resumed):
+            resumed.process_events(rows[150:])
+
+        reference = ICEWLogger("TEST-001", "abc123")
+        reference.process_events(rows)
+        result = replay(path)
+        assert result.events == len(rows)
+        assert result.logger.state == reference.state
+        assert list(result.logger.window) == list(reference.window)
+
+    def test_not_a_wal(self, tmp_path):
+        """Foreign files are rejected."""
+        path = tmp_path / "x.wal"
+        path.write_bytes(b"hello world, not a wal")
+        with pytest.raises(ValueError):
+            replay(str(path))